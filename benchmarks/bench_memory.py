@@ -0,0 +1,49 @@
+"""
+Compares the memory held by slots read as dicts and as compact records.
+
+Usage: python benchmarks/bench_memory.py -n 100000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from ssim.ssim import read  # noqa: E402
+
+from bench_parse_sim import sim_text  # noqa: E402
+
+
+def measure(path, **kwargs):
+    tracemalloc.start()
+    slots = read(path, **kwargs)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(slots), current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks memory use of read.")
+    parser.add_argument("-n", help="Number of flight leg records", type=int, default=100000)
+    parser.add_argument("--iata-airport", help="Read slots of this airport", type=str, default=None)
+    args = parser.parse_args()
+
+    text, n = sim_text(args.n)
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write(text)
+
+    try:
+        for name, compact in (("dicts", False), ("compact", True)):
+            count, current, peak = measure(f.name, iata_airport=args.iata_airport, compact=compact)
+            print(
+                "%-8s %8i slots %8.1f MB held %8.1f MB peak %6.0f bytes/slot"
+                % (name, count, current / 1e6, peak / 1e6, current / max(count, 1))
+            )
+    finally:
+        os.remove(f.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Compares the throughput of the fixed width and the regex SIM parsers.
+
+Usage: python benchmarks/bench_parse_sim.py -n 100000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from ssim.ssim import _parse_sim  # noqa: E402
+
+path_to_data = os.path.join(os.path.dirname(__file__), "..", "test", "data", "sim_records.yml")
+
+
+def sim_text(n):
+    with open(path_to_data) as f:
+        raw_data = yaml.safe_load(f.read())[-1]["raw_data"]
+
+    lines = raw_data.split("\n")
+    legs = [line for line in lines if line.startswith("3")]
+    header = [line for line in lines if line[:1] in ("1", "2", "0")][:10]
+
+    return "\n".join(header + [legs[i % len(legs)] for i in range(n)]), n
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks SIM record parsing.")
+    parser.add_argument("-n", help="Number of flight leg records", type=int, default=100000)
+    parser.add_argument("-r", help="Number of repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    text, n = sim_text(args.n)
+    for name, fixed_width in (("regex", False), ("fixed width", True)):
+        seconds = min(timeit.repeat(lambda: _parse_sim(text, fixed_width=fixed_width), number=1, repeat=args.r))
+        print("%-12s %10.0f records/sec" % (name, n / seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Compares the single pass SIR parser with matching each pattern over the whole message.
+
+Usage: python benchmarks/bench_parse_sir.py -n 10000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from ssim.ssim import _attach_year_sir, _parse_sir, regexes  # noqa: E402
+
+path_to_data = os.path.join(os.path.dirname(__file__), "..", "test", "data", "sir_records.yml")
+header = "SIR\n/\nW17\n03JUN\nAMS\nREYT/\n"
+
+
+def _parse_sir_finditer(text):
+    """The former parser: one finditer pass per pattern, results grouped by pattern."""
+    arr = regexes["sir"]["arr"].finditer(text)
+    dep = regexes["sir"]["dep"].finditer(text)
+    arrdep = regexes["sir"]["arrdep"].finditer(text)
+
+    season = regexes["sir"]["header"].search(text).group("season")
+
+    flight_leg_records = list(arr) + list(dep) + list(arrdep)
+    return [_attach_year_sir(x.groupdict(), int(season[1:]), season[0]) for x in flight_leg_records]
+
+
+def sir_text(n, malformed=0):
+    with open(path_to_data) as f:
+        messages = [record["raw_data"] for record in yaml.safe_load(f.read())]
+        lines = [line for message in messages for line in message.replace(header, "", 1).splitlines()]
+
+    # lines of word characters make the optional nested groups of the arrival/departure patterns backtrack
+    lines += ["HKL" + "8836" * 4 + " 17NOV 316772 0615061DPS"] * malformed
+
+    return header + "\n".join(lines[i % len(lines)] for i in range(n)) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks SIR message parsing.")
+    parser.add_argument("-n", help="Number of lines", type=int, default=10000)
+    parser.add_argument("-r", help="Number of repeats", type=int, default=3)
+    parser.add_argument("-m", help="Malformed lines per 18 well formed lines", type=int, default=0)
+    args = parser.parse_args()
+
+    text = sir_text(args.n, args.m)
+    for name, parse in (("finditer", _parse_sir_finditer), ("single pass", _parse_sir)):
+        seconds = min(timeit.repeat(lambda: parse(text), number=1, repeat=args.r))
+        print("%-12s %10.0f lines/sec" % (name, args.n / seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Compares reading a SIM file in text mode and memory-mapped: time and peak memory.
+
+Usage: python benchmarks/bench_read.py -n 100000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from ssim.ssim import read  # noqa: E402
+
+from bench_parse_sim import sim_text  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks reading a SIM file.")
+    parser.add_argument("-n", help="Number of flight leg records", type=int, default=100000)
+    args = parser.parse_args()
+
+    text, n = sim_text(args.n)
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write(text)
+
+    try:
+        for name, use_mmap in (("text", False), ("mmap", True)):
+            start = time.perf_counter()
+            read(f.name, use_mmap=use_mmap, compact=True)
+            seconds = time.perf_counter() - start
+
+            tracemalloc.start()
+            read(f.name, use_mmap=use_mmap, compact=True)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print("%-6s %10.0f records/sec %8.1f MB peak" % (name, n / seconds, peak / 1e6))
+    finally:
+        os.remove(f.name)
+
+
+if __name__ == "__main__":
+    main()
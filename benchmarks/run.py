@@ -0,0 +1,209 @@
+"""
+Benchmark suite: throughput and peak memory of reading, parsing and expanding synthetic SIM and SIR files of
+growing size, from 1k to 1M flight leg records, plus the time it takes to import the package.
+
+Every benchmark is timed (best of a number of repeats) and then run once more under tracemalloc for its peak
+memory. The CLI is run end to end in a subprocess, its peak memory is the maximum resident set size. The package
+is imported in a fresh interpreter, as short-lived jobs do, to guard startup time. Results can
+be saved as JSON and compared against a previous run to catch regressions.
+
+Usage: python benchmarks/run.py --sizes 1000,10000,100000 --json results.json --baseline previous.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from ssim.ssim import (  # noqa: E402
+    read,
+    expand_slots,
+    _decode_aircraft_configuration_string,
+    _expand,
+    _explode_aircraft_configuration_string,
+    _parse_sim,
+    _parse_sir,
+)
+from ssim.rotations import rotations  # noqa: E402
+
+from synthetic import sim_text, sir_text  # noqa: E402
+
+season = "S18"
+sir_season = "W17"
+
+# prints the maximum resident set size of running the CLI, in kilobytes on Linux
+cli_script = """
+import resource, runpy, sys
+sys.argv = ["ssim"] + sys.argv[1:]
+runpy.run_module("ssim", run_name="__main__", alter_sys=True)
+sys.stderr.write("maxrss=%i\\n" % resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+# prints the time it takes to import the package in a fresh interpreter, and the maximum resident set size
+import_script = """
+import resource, sys, time
+start = time.perf_counter()
+import ssim
+seconds = time.perf_counter() - start
+sys.stderr.write("seconds=%f maxrss=%i\\n" % (seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+"""
+
+
+def _measure(function, repeat):
+    seconds = min(timeit.repeat(function, number=1, repeat=repeat))
+
+    tracemalloc.start()
+    function()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return seconds, peak
+
+
+def _cli(sim_path, repeat):
+    seconds, peak = None, 0
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "flights.csv")
+        for i in range(repeat):
+            start = time.perf_counter()
+            completed = subprocess.run(
+                [sys.executable, "-c", cli_script, "-i", sim_path, "-o", output],
+                cwd=os.path.join(os.path.dirname(__file__), ".."),
+                stderr=subprocess.PIPE,
+                universal_newlines=True,
+                check=True,
+            )
+            elapsed = time.perf_counter() - start
+            seconds = elapsed if seconds is None else min(seconds, elapsed)
+            for line in completed.stderr.splitlines():
+                if line.startswith("maxrss="):
+                    peak = max(peak, int(line.split("=", 1)[1]) * 1024)
+
+    return seconds, peak
+
+
+def _import(repeat):
+    seconds, peak = None, 0
+    for i in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", import_script],
+            cwd=os.path.join(os.path.dirname(__file__), ".."),
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        )
+        measured = dict(field.split("=") for field in completed.stderr.split())
+        seconds = float(measured["seconds"]) if seconds is None else min(seconds, float(measured["seconds"]))
+        peak = max(peak, int(measured["maxrss"]) * 1024)
+
+    return seconds, peak
+
+
+def benchmarks(size, seed, repeat, max_rrule):
+    """Runs all benchmarks on files of size flight leg records, yielding (name, items, seconds, peak bytes)."""
+
+    sim = sim_text(size, seed=seed, season=season)
+    sir = sir_text(size, seed=seed, season=sir_season)
+
+    with tempfile.TemporaryDirectory() as directory:
+        sim_path = os.path.join(directory, "schedule.SIM")
+        sir_path = os.path.join(directory, "schedule.SIR")
+        with open(sim_path, "w") as f:
+            f.write(sim)
+        with open(sir_path, "w") as f:
+            f.write(sir)
+
+        slots = read(sim_path)
+        flights = expand_slots(slots, season=season)
+        legs = sum(flight["ad"] == "D" for flight in flights)
+        flights = len(flights)
+        acv_strings = [slot["raw"][172:192].strip() for slot in slots if slot["ad"] == "D"]
+
+        def explode():
+            _decode_aircraft_configuration_string.cache_clear()
+            for string in acv_strings:
+                _explode_aircraft_configuration_string(string)
+
+        runs = [
+            ("read sim", size, lambda: read(sim_path)),
+            ("read sir", size, lambda: read(sir_path)),
+            ("_parse_sim", size, lambda: _parse_sim(sim)),
+            ("_parse_sir", size, lambda: _parse_sir(sir)),
+            ("expand_slots", flights, lambda: expand_slots(slots, season=season)),
+            ("acv", len(acv_strings), explode),
+            ("rotations", legs, lambda: rotations(slots, season=season)),
+        ]
+        if size <= max_rrule:
+            runs.append(("_expand", flights, lambda: [_expand(slot, season=season) for slot in slots]))
+
+        for name, items, function in runs:
+            seconds, peak = _measure(function, repeat)
+            yield name, items, seconds, peak
+
+        # the CLI cannot be given a season, so its file has no 00XXX00 periods
+        with open(sim_path, "w") as f:
+            f.write(sim_text(size, seed=seed, season=season, infinity_rate=0))
+        seconds, peak = _cli(sim_path, repeat)
+        yield "cli", len(expand_slots(read(sim_path))), seconds, peak
+
+
+def suite(sizes, seed, repeat, max_rrule):
+    """Runs the import benchmark and all benchmarks per size, yielding (size, name, items, seconds, peak bytes)."""
+
+    # a fresh interpreter starts quickly or not, more repeats smooth that out
+    seconds, peak = _import(max(repeat, 5))
+    yield 0, "import", 1, seconds, peak
+
+    for size in sizes:
+        for name, items, seconds, peak in benchmarks(size, seed, repeat, max_rrule):
+            yield size, name, items, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs the benchmark suite.")
+    parser.add_argument("--sizes", help="Comma separated numbers of flight leg records", type=str, default="1000,10000")
+    parser.add_argument("--seed", help="Seed of the synthetic files", type=int, default=0)
+    parser.add_argument("-r", help="Number of repeats", type=int, default=3)
+    parser.add_argument("--max-rrule", help="Largest size to run _expand for", type=int, default=100000)
+    parser.add_argument("--json", help="Save results to this file", type=str)
+    parser.add_argument("--baseline", help="Compare throughput with results saved before", type=str)
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {(result["name"], result["size"]): result for result in json.load(f)}
+
+    # keep the output to the results
+    logging.disable(logging.INFO)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = []
+    print(
+        "%-14s %8s %12s %10s %14s %10s %8s"
+        % ("benchmark", "size", "items", "seconds", "items/sec", "peak MB", "change")
+    )
+    for size, name, items, seconds, peak in suite(sizes, args.seed, args.r, args.max_rrule):
+        throughput = items / seconds
+        change = ""
+        if (name, size) in baseline:
+            change = "%+7.1f%%" % (100.0 * (throughput / baseline[(name, size)]["throughput"] - 1))
+        print("%-14s %8i %12i %10.3f %14.0f %10.1f %8s" % (name, size, items, seconds, throughput, peak / 1e6, change))
+        results.append(
+            {"name": name, "size": size, "items": items, "seconds": seconds, "throughput": throughput, "peak": peak}
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
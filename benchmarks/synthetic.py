@@ -0,0 +1,291 @@
+"""
+Seeded generator of synthetic, valid SIM and SIR files for benchmarks.
+
+SIM files hold record types 1 to 5 padded with zero lines to blocks of five, one record type 2 per airline in
+alternating time modes (UTC and local), flight leg records with realistic aircraft configuration strings, 00XXX00
+periods and overnight legs, and the occasional record type 4. SIR messages hold arrivals, departures and
+turnarounds.
+
+Usage: python benchmarks/synthetic.py --sim 100000 -o schedule.SIM
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from ssim.seasons import season_bounds  # noqa: E402
+from ssim.ssim import _format_record  # noqa: E402
+
+stations = ["AMS", "LHR", "CDG", "FRA", "MAD", "FCO", "CPH", "OSL", "ARN", "HEL", "DUB", "LIS", "BCN", "VIE", "ZRH"]
+aircraft = [("738", 189), ("320", 174), ("321", 220), ("E90", 100), ("772", 316), ("789", 294), ("DH4", 78)]
+acv_templates = ["Y{y}", "Y{y}VV{ac}", "C{c}Y{y}VV{ac}", "J{c}Y{y}", "C{c}M{y}LL{ll}PP{pp}", "F{f}C{c}Y{y}VV{ac}H"]
+months = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
+
+
+def _date(d):
+    return "%02d%s%s" % (d.day, months[d.month - 1], d.strftime("%y"))
+
+
+def _time(minutes):
+    return "%02d%02d" % (minutes // 60 % 24, minutes % 60)
+
+
+def aircraft_configuration_string(rng):
+    """A realistic aircraft configuration string and its aircraft type."""
+
+    aircraft_type, seats = rng.choice(aircraft)
+    business = rng.randint(0, seats // 6)
+    string = rng.choice(acv_templates).format(
+        f=rng.randint(4, 12),
+        c=business,
+        y=seats - business,
+        ac=aircraft_type,
+        ll=rng.randint(1, 9),
+        pp=rng.randint(1, 4),
+    )
+
+    return string, aircraft_type
+
+
+def sim_legs(n, rng, season, airline, infinity_rate=0.05):
+    """Flight leg records (and the occasional segment data record) of an airline, as field value dicts."""
+
+    first, last = season_bounds(season)
+    days = (last - first).days
+
+    for i in range(n):
+        departure_station, arrival_station = rng.sample(stations, 2)
+        departure = rng.randint(5 * 60, 24 * 60 - 1)
+        duration = rng.randint(45, 5 * 60)
+        arrival = departure + duration
+        start = rng.randint(0, days)
+        acv, aircraft_type = aircraft_configuration_string(rng)
+
+        leg = {
+            "record_type": "3",
+            "operational_suffix": rng.choice(" " * 19 + "A"),
+            "airline_designator": airline,
+            "flight_number": str(i % 9999 + 1),
+            "itinerary_variation_identifier": "01",
+            "leg_sequence_number": "01",
+            "service_type": rng.choice("JJJJCGP"),
+            "period_of_operation_from": (
+                "00XXX00" if rng.random() < infinity_rate else _date(first + timedelta(days=start))
+            ),
+            "period_of_operation_to": (
+                "00XXX00" if rng.random() < infinity_rate else _date(first + timedelta(days=rng.randint(start, days)))
+            ),
+            "days_of_operation": "".join(str(d) if rng.random() < 0.6 else " " for d in range(1, 8)),
+            "frequency_rate": rng.choice(" " * 9 + "2"),
+            "departure_station": departure_station,
+            "scheduled_time_of_passenger_departure": _time(departure),
+            "scheduled_time_of_aircraft_departure": _time(departure),
+            "utc_local_time_variation_departure": "+0100",
+            "passenger_terminal_departure": rng.choice(["", "1", "2"]),
+            "arrival_station": arrival_station,
+            "scheduled_time_of_aircraft_arrival": _time(arrival),
+            "scheduled_time_of_passenger_arrival": _time(arrival),
+            "utc_local_time_variation_arrival": "+0200",
+            "aircraft_type": aircraft_type,
+            "passenger_reservations_booking_designator": "JCDZPYBMHKLQTVXSNO"[: rng.randint(2, 18)],
+            "aircraft_configuration_version": acv,
+            # overnight legs arrive the day after they depart
+            "date_variation": "01" if arrival >= 24 * 60 else "",
+        }
+        if leg["days_of_operation"].strip() == "":
+            leg["days_of_operation"] = "1234567"
+        if rng.random() < 0.5:
+            leg.update(
+                airline_designator_=airline,
+                flight_number_=str((i + 1) % 9999 + 1).rjust(4),
+                aircraft_rotation_layover="",
+            )
+        yield "record_3", leg
+
+        if rng.random() < 0.05:
+            yield "record_4", {
+                "record_type": "4",
+                "airline_designator": airline,
+                "flight_number": leg["flight_number"],
+                "itinerary_variation_identifier": "01",
+                "leg_sequence_number": "01",
+                "service_type": leg["service_type"],
+                "board_point_indicator": "A",
+                "off_point_indicator": "B",
+                "data_element_identifier": "010",
+                "board_point": departure_station,
+                "off_point": arrival_station,
+                "data": "KL %i" % rng.randint(1, 9999),
+            }
+
+
+def _pad(lines):
+    """Pads lines with zero records to a multiple of five, like the blocks of a SIM file."""
+    return lines + ["0" * 200] * (-len(lines) % 5)
+
+
+def sim_text(n, seed=0, season="S18", airlines=("XX", "YY", "ZZ", "U2"), infinity_rate=0.05):
+    """
+    Returns a SIM file holding n flight leg records spread over airlines.
+
+    :param n: int, number of flight leg records.
+    :param seed: int, seed of the random generator.
+    :param season: str, IATA season of the schedule.
+    :param airlines: sequence of airline designators, every airline gets its own record type 2.
+    :param infinity_rate: float, share of periods of operation starting or ending with 00XXX00.
+    :return text: str
+    """
+
+    rng = random.Random(seed)
+    first, last = season_bounds(season)
+    serial_number = 1
+
+    record_1 = {
+        "record_type": "1",
+        "title_of_contents": "AIRLINE STANDARD SCHEDULE DATA SET",
+        "number_of_seasons": "1",
+        "data_set_serial_number": "001",
+    }
+    lines = _pad([_format_record("record_1", record_1, serial_number)])
+    for i, airline in enumerate(airlines):
+        legs = n // len(airlines) + (1 if i < n % len(airlines) else 0)
+        serial_number += 1
+        block = [
+            _format_record(
+                "record_2",
+                {
+                    "record_type": "2",
+                    "time_mode": "UL"[i % 2],
+                    "airline_designator": airline,
+                    "season": season,
+                    "period_of_schedule_validity_from": _date(first),
+                    "period_of_schedule_validity_to": _date(last),
+                    "creation_date": _date(first - timedelta(days=30)),
+                    "schedule_status": "P",
+                    "creation_time": "1200",
+                },
+                serial_number,
+            )
+        ]
+        lines += _pad(block)
+
+        block = []
+        for record, values in sim_legs(legs, rng, season, airline, infinity_rate):
+            serial_number += 1
+            block.append(_format_record(record, values, serial_number))
+        serial_number += 1
+        block.append(
+            _format_record(
+                "record_5",
+                {
+                    "record_type": "5",
+                    "airline_designator": airline,
+                    "release_date": _date(first),
+                    "continuation_end_code": "E",
+                },
+                serial_number,
+            )
+        )
+        lines += _pad(block)
+
+    return "\n".join(lines) + "\n"
+
+
+def sir_text(n, seed=0, season="W17", airport="AMS"):
+    """
+    Returns a SIR message of an airport holding n flight leg records: arrivals, departures and turnarounds.
+
+    :param n: int, number of flight leg records.
+    :param seed: int, seed of the random generator.
+    :param season: str, IATA season of the message.
+    :param airport: str, clearance advice airport.
+    :return text: str
+    """
+
+    rng = random.Random(seed)
+    first, last = season_bounds(season)
+    days = (last - first).days
+    others = [station for station in stations if station != airport]
+
+    lines = ["SIR", "/", season, "03JUN", airport, "REYT/"]
+    for i in range(n):
+        start = first + timedelta(days=rng.randint(0, days))
+        end = start + timedelta(days=rng.randint(0, days - (start - first).days))
+        period = "%s%s" % (_date(start)[:5], _date(end)[:5])
+        days_of_operation = "".join(str(d) if rng.random() < 0.6 else "0" for d in range(1, 8))
+        if days_of_operation == "0000000":
+            days_of_operation = "1234567"
+        aircraft_type, seats = rng.choice(aircraft)
+        action_code = rng.choice("NNNNNCRDH")
+        airline = rng.choice(["KL", "HV", "U2", "BA"])
+        origin, destination = rng.choice(others), rng.choice(others)
+        arrival, departure = rng.randint(0, 24 * 60 - 1), rng.randint(0, 24 * 60 - 1)
+        flight = "%s%i" % (airline, i % 9999 + 1)
+        equipment = "%03i%s" % (seats, aircraft_type)
+        kind = rng.random()
+        if kind < 0.4:
+            line = "%s%s %s %s %s %s%s%s J" % (
+                action_code,
+                flight,
+                period,
+                days_of_operation,
+                equipment,
+                origin,
+                origin,
+                _time(arrival),
+            )
+        elif kind < 0.8:
+            line = "%s %s %s %s %s %s%s%s J" % (
+                action_code,
+                flight,
+                period,
+                days_of_operation,
+                equipment,
+                _time(departure),
+                destination,
+                destination,
+            )
+        else:
+            # turnaround, departing the day after arrival when it departs earlier in the day
+            overnight = "1" if departure < arrival else ""
+            departure_flight = "%s%i" % (airline, i % 9999 + 2)
+            line = "%s%s %s %s %s %s %s%s%s %s%s%s%s JJ" % (
+                action_code,
+                flight,
+                departure_flight,
+                period,
+                days_of_operation,
+                equipment,
+                origin,
+                origin,
+                _time(arrival),
+                _time(departure),
+                overnight,
+                destination,
+                destination,
+            )
+        lines.append(line)
+        if rng.random() < 0.1:
+            lines.append("/ RA.%04i /" % rng.randint(0, 9999))
+
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates a synthetic SIM or SIR file.")
+    parser.add_argument("--sim", help="Number of SIM flight leg records", type=int)
+    parser.add_argument("--sir", help="Number of SIR flight leg records", type=int)
+    parser.add_argument("--seed", help="Seed of the random generator", type=int, default=0)
+    parser.add_argument("-o", help="Output filename", type=str, required=True)
+    args = parser.parse_args()
+
+    text = sir_text(args.sir, args.seed) if args.sir else sim_text(args.sim or 1000, args.seed)
+    with open(args.o, "w") as f:
+        f.write(text)
+
+
+if __name__ == "__main__":
+    main()
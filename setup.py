@@ -1,10 +1,15 @@
+import re
 from distutils.core import setup
 
+# the version is kept in ssim/__init__.py only, the package cannot be imported before its dependencies are installed
+with open("ssim/__init__.py") as f:
+    version = re.search(r'^__version__ = "(.+)"', f.read(), re.MULTILINE).group(1)
+
 setup(
     name="ssim",
     packages=["ssim"],
     package_dir={"ssim": "ssim"},
-    version="0.3.0",
+    version=version,
     description="IATA SSIM (Standard Schedules Information Manual) file parser is a tool to read the standard IATA "
     "file format.",
     author="Rok Mihevc, Ramon Van Schaik, Howard Riddiough, Kevin Haagen",
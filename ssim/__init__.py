@@ -1 +1,50 @@
-from .ssim import read, expand_slots
+__version__ = "0.3.0"
+
+from importlib import import_module as _import_module
+import sys as _sys
+from types import ModuleType as _ModuleType
+
+from .ssim import read, iter_read, expand_slots, iter_flights
+
+# everything else is imported from its submodule the first time it is used, so that importing ssim stays cheap
+_lazy = {
+    "FlightTable": "flights",
+    "FlightView": "flights",
+    "read_many": "parallel",
+    "read_archive": "parallel",
+    "FileResult": "parallel",
+    "read_incremental": "incremental",
+    "Revision": "incremental",
+    "ScheduleIndex": "index",
+    "histogram": "aggregate",
+    "Stats": "stats",
+    "link_legs": "rotations",
+    "rotations": "rotations",
+    "turnarounds": "rotations",
+    "ScheduleState": "state",
+    "diff": "diff",
+    "iter_diff": "diff",
+    "Change": "diff",
+}
+
+
+class _Package(_ModuleType):
+    # a module __getattr__ would do, but only from python 3.7 on
+    def __getattr__(self, name):
+        if name not in _lazy:
+            raise AttributeError("module %r has no attribute %r" % (self.__name__, name))
+        value = getattr(_import_module("." + _lazy[name], self.__name__), name)
+        super().__setattr__(name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        # importing ssim.diff or ssim.rotations must not shadow the function of the same name
+        if name in _lazy and isinstance(value, _ModuleType):
+            return
+        super().__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(_lazy))
+
+
+_sys.modules[__name__].__class__ = _Package
@@ -1,26 +1,36 @@
 import csv
+import logging
 import ssim
 import argparse
+from itertools import islice
+from ssim.flights import fieldnames
 
-parser = argparse.ArgumentParser(description="Converts a slotfile to CSV.")
-parser.add_argument("-i", help="Input slotfile filename", type=str, metavar="input filename", required=True)
-parser.add_argument("-o", help="Output csv filename", type=str, metavar="output filename", required=True)
-args = parser.parse_args()
-input_file = args.i
-output_file = args.o
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Converts a slotfile to CSV.")
+    parser.add_argument("-i", help="Input slotfile filename", type=str, metavar="input filename", required=True)
+    parser.add_argument("-o", help="Output csv filename", type=str, metavar="output filename", required=True)
+    parser.add_argument(
+        "--chunk-size", help="Number of flights written at once", type=int, metavar="flights", default=10000
+    )
+    args = parser.parse_args(argv)
+    input_file = args.i
+    output_file = args.o
+    chunk_size = args.chunk_size
 
-def main():
+    logging.basicConfig(format="[%(asctime)s] %(levelname)s: %(message)s", level=logging.INFO)
 
     records = ssim.read(input_file)
-    flights = ssim.expand_slots(records)
 
-    keys = flights[0].keys()
+    # the header is fixed before any flight is expanded, so flights can be streamed to disk
+    keys = fieldnames(records)
+    flights = ssim.iter_flights(records)
 
-    with open(output_file, "w") as csvfile:
+    with open(output_file, "w", newline="") as csvfile:
         dict_writer = csv.DictWriter(csvfile, keys, restval="")
         dict_writer.writeheader()
-        dict_writer.writerows(flights)
+        for chunk in iter(lambda: list(islice(flights, chunk_size)), []):
+            dict_writer.writerows(chunk)
 
 
 if __name__ == "__main__":
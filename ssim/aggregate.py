@@ -0,0 +1,154 @@
+from datetime import date
+
+from .ssim import _operating_schedule
+
+
+def _scheduled_time(slot):
+    if "scheduled_time" in slot:
+        return slot["scheduled_time"]
+    if slot["ad"] == "D":
+        return slot.get("scheduled_time_of_aircraft_departure")
+    return slot.get("scheduled_time_of_aircraft_arrival")
+
+
+def _hour(slot):
+    """
+    Hour of the flights of a slot and the days they are moved by to count them on.
+
+    Flights of slots read with time_format="minutes" are counted by the UTC date and hour they operate at. Their
+    times are minutes since the start of the day of operation, the day before the date of overnight flights.
+
+    :param slot: dict, a slot.
+    :return hour, days: int or None, the hour, and int, the number of days flights are moved by.
+    """
+
+    scheduled_time = _scheduled_time(slot)
+    if scheduled_time is None or scheduled_time == "":
+        return None, 0
+    if isinstance(scheduled_time, int):
+        days = scheduled_time // 1440 - (1 if slot.get("overnight_indicator") else 0)
+        return scheduled_time // 60 % 24, days
+    return int(scheduled_time[:2]), 0
+
+
+def _progressions(slot, season=None, days=0):
+    """
+    Describes the flight dates of a slot as arithmetic progressions, one per weekday it operates on.
+
+    :param slot: dict, a slot.
+    :param season: indication of season, see expand_slots.
+    :param days: int, number of days to move flight dates by.
+    :return progressions: list of (first, last, stride) tuples of date ordinals, last being the last flight date.
+    """
+
+    first, last, days_of_operation, frequency_rate, overnight = _operating_schedule(slot, season=season)
+    overnight += days
+    first, last = first.toordinal(), last.toordinal()
+    # weeks are counted from the Monday of the week of the first day, as in expand_slots
+    first_monday = first - (first - 1) % 7
+    stride = 7 * frequency_rate
+
+    progressions = []
+    for weekday in set(days_of_operation or range(7)):
+        day = first_monday + weekday
+        if day < first:
+            day += stride
+        if day <= last:
+            progressions.append((day + overnight, day + (last - day) // stride * stride + overnight, stride))
+
+    return progressions
+
+
+def histogram(slots, by="hour", first=None, last=None, season=None):
+    """
+    Counts movements and seats per day, or per hour of every day, split by arrival and departure, without expanding
+    slots into flights.
+
+    Every slot operates on days forming an arithmetic progression per weekday, a week times its frequency rate
+    apart. These are added to difference arrays, one per stride and arrival/departure and hour, that are summed up
+    at the end. This takes time in proportion to the number of slots plus the number of days, rather than the
+    number of flights. Counts are the same as counting the flights returned by expand_slots. Flights of slots read
+    with time_format="minutes" are counted by the UTC date and hour they operate at, as their expanded times give.
+
+    Parameters
+    ----------.
+    :param slots: list of slots, as returned by read. Times and seats are taken from scheduled_time and seats (or
+    from the scheduled times of aircraft departure and arrival of slots of a SIM read without iata_airport).
+    :param by: "hour" to count per hour of every day, "day" to count per day.
+    :param first: date, first day to count flights of. Defaults to the first flight.
+    :param last: date, last day to count flights of. Defaults to the last flight.
+    :param season: indication of season, see expand_slots.
+
+    Returns
+    -------
+    :return rows: list of dicts with keys date ("YYYY-MM-DD"), hour (int, only if by is "hour"), ad, movements and
+    seats, ordered by date, hour and ad. Only days (and hours) with movements are given.
+    """
+
+    if by not in ("hour", "day"):
+        raise ValueError('by should be "hour" or "day" rather than %r' % by)
+
+    weights = []
+    for slot in slots:
+        hour, days = _hour(slot)
+        if by != "hour":
+            hour = None
+        seats = slot.get("seats")
+        seats = int(seats) if seats else 0
+        for progression in _progressions(slot, season, days):
+            weights.append((progression, (slot["ad"], hour), seats))
+
+    if not weights:
+        return []
+
+    window_first = first.toordinal() if first is not None else min(start for (start, end, s), key, seats in weights)
+    window_last = last.toordinal() if last is not None else max(end for (start, end, s), key, seats in weights)
+    days = window_last - window_first + 1
+    if days <= 0:
+        return []
+
+    # difference arrays, by stride and (ad, hour), of movements and seats
+    differences = {}
+    for (start, end, stride), key, seats in weights:
+        if start < window_first:
+            start += -((start - window_first) // stride) * stride
+        if end > window_last:
+            end -= (end - window_last + stride - 1) // stride * stride
+        if start > end:
+            continue
+
+        by_key = differences.setdefault(stride, {})
+        if key not in by_key:
+            by_key[key] = ([0] * (days + stride), [0] * (days + stride))
+        movements, seat_counts = by_key[key]
+        start -= window_first
+        end += stride - window_first
+        movements[start] += 1
+        movements[end] -= 1
+        seat_counts[start] += seats
+        seat_counts[end] -= seats
+
+    totals = {}
+    for stride, by_key in differences.items():
+        for key, (movements, seat_counts) in by_key.items():
+            for i in range(stride, days):
+                movements[i] += movements[i - stride]
+                seat_counts[i] += seat_counts[i - stride]
+            total_movements, total_seats = totals.setdefault(key, ([0] * days, [0] * days))
+            for i in range(days):
+                total_movements[i] += movements[i]
+                total_seats[i] += seat_counts[i]
+
+    rows = []
+    for (ad, hour), (movements, seat_counts) in totals.items():
+        for i in range(days):
+            if movements[i]:
+                row = {"date": date.fromordinal(window_first + i).isoformat()}
+                if by == "hour":
+                    row["hour"] = hour
+                row.update({"ad": ad, "movements": movements[i], "seats": seat_counts[i]})
+                rows.append(row)
+
+    rows.sort(key=lambda row: (row["date"], -1 if row.get("hour") is None else row["hour"], row["ad"]))
+
+    return rows
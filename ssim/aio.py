@@ -0,0 +1,130 @@
+import asyncio
+import fnmatch
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from .parallel import FileResult, _read_file
+from .ssim import read as _read
+
+logger = logging.getLogger(__name__)
+
+
+def _executor(executor, workers=None):
+    """
+    Returns the executor to run reads in and whether it was created here, and should be shut down here.
+
+    :param executor: "thread", "process", an Executor, or None for the default executor of the event loop.
+    :param workers: int, maximum number of workers of a created executor.
+    :return executor, owned: Executor (or None) and bool.
+    """
+
+    if executor is None or isinstance(executor, Executor):
+        return executor, False
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=workers), True
+    if executor == "process":
+        return ProcessPoolExecutor(max_workers=workers), True
+
+    raise ValueError('executor should be "thread", "process" or an Executor rather than %r' % (executor,))
+
+
+async def read(file, iata_airport=None, executor="thread", **options):
+    """
+    Reads, detects filetype, parses and processes a valid flight records file without blocking the event loop.
+
+    Parameters
+    ----------.
+    :param file: path to a slotfile.
+    :param iata_airport: 3 letter capital string indicating iata airport, see ssim.read.
+    :param executor: "thread" or "process" to read in a new thread or process, an Executor to read in, or None
+    to read in the default executor of the event loop.
+    :param options: further arguments of ssim.read, e.g. compact.
+
+    Returns
+    -------
+    :return: slots: list of dicts, as returned by ssim.read.
+    """
+
+    executor, owned = _executor(executor, workers=1)
+    try:
+        return await asyncio.get_event_loop().run_in_executor(
+            executor, partial(_read, file, iata_airport=iata_airport, **options)
+        )
+    finally:
+        if owned:
+            executor.shutdown(wait=False)
+
+
+def _list_dir(directory, pattern):
+    return sorted(
+        entry.path
+        for entry in os.scandir(directory)
+        if entry.is_file() and (pattern is None or fnmatch.fnmatch(entry.name, pattern))
+    )
+
+
+async def read_dir(
+    directory, pattern=None, executor="thread", concurrency=4, iata_airport=None, expand=False, season=None
+):
+    """
+    Reads the slotfiles in a directory without blocking the event loop, yielding the result of every file as soon
+    as it is read.
+
+    At most concurrency files are read at a time, and no more are started until finished results are consumed,
+    so memory use is bounded however large the directory is. A file that fails to be read does not stop the
+    others, its error is reported in its result. When the generator is closed or the task consuming it is
+    cancelled, files that have not started yet are not read. Reads already running in threads run to completion
+    in the background.
+
+    Parameters
+    ----------.
+    :param directory: path to a directory of slotfiles, subdirectories are not read.
+    :param pattern: str, shell-style pattern that names of files to read match, e.g. "*.SIM". Defaults to all.
+    :param executor: "thread" or "process" to read in a new pool of concurrency threads or processes, an Executor
+    to read in, or None to read in the default executor of the event loop.
+    :param concurrency: int, maximum number of files read at a time.
+    :param iata_airport: 3 letter capital string indicating iata airport, see ssim.read.
+    :param expand: if True, slots are expanded into flights in the executor.
+    :param season: indication of season, see expand_slots.
+
+    Returns
+    -------
+    :return: results: async generator of FileResult, in the order reads finish.
+    """
+
+    if concurrency < 1:
+        raise ValueError("concurrency should be at least 1 rather than %r" % (concurrency,))
+
+    paths = iter(_list_dir(directory, pattern))
+    loop = asyncio.get_event_loop()
+    executor, owned = _executor(executor, workers=concurrency)
+    running = {}
+    try:
+        while True:
+            for path in paths:
+                future = loop.run_in_executor(executor, _read_file, path, iata_airport, expand, season)
+                running[future] = path
+                if len(running) >= concurrency:
+                    break
+            if not running:
+                return
+
+            done, pending = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                path = running.pop(future)
+                # the worker itself may fail, e.g. if it gets killed or its result cannot be pickled
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = FileResult(path, None, e)
+                if result.error is not None:
+                    logger.error("Failed to read %s: %r" % (result.path, result.error))
+                yield result
+    finally:
+        # cancelling the futures of the event loop cancels the reads they wrap that have not started
+        for future in running:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=False)
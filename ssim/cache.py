@@ -0,0 +1,205 @@
+import hashlib
+import marshal
+import logging
+import os
+import tempfile
+
+from . import __version__
+from .records import SimLeg, SimAsSirLeg, SirLeg, SimSlot, SimAsSirSlot, SirSlot
+
+logger = logging.getLogger(__name__)
+
+# bump when the layout of cached slots changes without a new library version
+cache_format = 2
+cache_suffix = ".slots"
+# compact slots by the name of their leg record
+compact_slots = {
+    leg.__name__: (leg, slot) for leg, slot in ((SimLeg, SimSlot), (SimAsSirLeg, SimAsSirSlot), (SirLeg, SirSlot))
+}
+
+
+def _snapshot(slots):
+    """
+    Describes slots as plain data (tuples, lists and dicts of strings, numbers, booleans and None), to be stored
+    with marshal. Slot dicts are the position of their keys in a table of key tuples, along with their values.
+    Compact slots are the position of their leg, along with their arrival/departure indicator. Legs, raw record
+    included, are tuples of their fields, by the name of their record.
+    """
+
+    if all(isinstance(slot, dict) for slot in slots):
+        keys = {}
+        positions = [keys.setdefault(tuple(slot), len(keys)) for slot in slots]
+        return {"keys": list(keys), "positions": positions, "values": [tuple(slot.values()) for slot in slots]}
+
+    legs, rows, positions = {}, {}, []
+    for slot in slots:
+        position = legs.get(id(slot.leg))
+        if position is None:
+            position = legs[id(slot.leg)] = len(legs)
+            rows.setdefault(slot.leg.__class__.__name__, []).append((position, tuple(slot.leg)))
+        positions.append(position)
+
+    return {
+        "legs": {name: [fields for position, fields in leg_rows] for name, leg_rows in rows.items()},
+        "order": {name: [position for position, fields in leg_rows] for name, leg_rows in rows.items()},
+        "positions": positions,
+        "ads": "".join(slot.ad for slot in slots),
+    }
+
+
+def _slots(snapshot):
+    """Rebuilds the slots described by _snapshot."""
+
+    if "keys" in snapshot:
+        keys = snapshot["keys"]
+        return [
+            dict(zip(keys[position], values)) for position, values in zip(snapshot["positions"], snapshot["values"])
+        ]
+
+    legs = [None] * sum(len(order) for order in snapshot["order"].values())
+    for name, leg_rows in snapshot["legs"].items():
+        leg, slot = compact_slots[name]
+        for position, fields in zip(snapshot["order"][name], leg_rows):
+            legs[position] = (leg._make(fields), slot)
+
+    slots = []
+    for position, ad in zip(snapshot["positions"], snapshot["ads"]):
+        leg, slot = legs[position]
+        slots.append(slot(leg, ad))
+    return slots
+
+
+def cache_key(file, **options):
+    """
+    Returns the key under which slots read from a file are cached: a hash of the contents of the file, the
+    library version and the options the file is read with.
+
+    Parameters
+    ----------.
+    :param file: path to a slotfile.
+    :param options: options of read that change the slots it returns.
+    :return key: str, hex digest.
+    """
+
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(("%s:%i:%r\n" % (__version__, cache_format, sorted(options.items()))).encode())
+    with open(file, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def load(cache_dir, key):
+    """
+    Loads cached slots. A hit marks the entry as recently used. Entries are plain data, see _snapshot, so loading
+    one never runs code: a damaged or forged entry at worst gives wrong slots.
+
+    Parameters
+    ----------.
+    :param cache_dir: path to the cache directory.
+    :param key: str, see cache_key.
+    :return slots: list of slots, or None if they are not cached.
+    """
+
+    path = os.path.join(cache_dir, key + cache_suffix)
+    try:
+        with open(path, "rb") as f:
+            # loading from bytes, marshal reads a file object a few bytes at a time
+            slots = _slots(marshal.loads(f.read()))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # a damaged entry is a miss, it gets replaced once the file is parsed again
+        logger.warning("Ignoring unreadable cache entry %s: %r" % (path, e))
+        return None
+
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+    logger.info("Loaded slots from cache entry %s." % path)
+    return slots
+
+
+def store(cache_dir, key, slots, max_size=None):
+    """
+    Stores slots in the cache. The snapshot is written to a temporary file that is renamed into place, so
+    concurrent readers and writers never see a partial entry.
+
+    Parameters
+    ----------.
+    :param cache_dir: path to the cache directory, created if missing.
+    :param key: str, see cache_key.
+    :param slots: list of slots.
+    :param max_size: int, size of the cache in bytes, least recently used entries are evicted beyond it.
+    """
+
+    os.makedirs(cache_dir, exist_ok=True)
+
+    fd, temporary_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            marshal.dump(_snapshot(slots), f)
+        os.replace(temporary_path, os.path.join(cache_dir, key + cache_suffix))
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+    if max_size is not None:
+        evict(cache_dir, max_size)
+
+
+def evict(cache_dir, max_size):
+    """
+    Removes least recently used entries until the cache takes at most max_size bytes.
+
+    Parameters
+    ----------.
+    :param cache_dir: path to the cache directory.
+    :param max_size: int, size of the cache in bytes.
+    """
+
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(cache_suffix):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    size = sum(entry_size for mtime, entry_size, path in entries)
+    for mtime, entry_size, path in sorted(entries):
+        if size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # removed by another process
+            pass
+        size -= entry_size
+
+
+def cached_read(read, file, cache_dir, max_size=None, **options):
+    """
+    Reads a file through the cache: loads its slots if cached, otherwise reads and stores them.
+
+    Parameters
+    ----------.
+    :param read: function reading slots from a file, called as read(file, **options).
+    :param file: path to a slotfile.
+    :param cache_dir: path to the cache directory.
+    :param max_size: int, size of the cache in bytes.
+    :param options: options passed to read that change the slots it returns.
+    :return slots: list of slots.
+    """
+
+    key = cache_key(file, **options)
+    slots = load(cache_dir, key)
+    if slots is None:
+        slots = read(file, **options)
+        store(cache_dir, key, slots, max_size)
+
+    return slots
@@ -0,0 +1,223 @@
+import logging
+import os
+from collections import namedtuple
+from itertools import groupby
+
+from .incremental import serial_number_start, serial_number_end
+from .ssim import iter_read, expand_slots
+from .state import _content
+
+logger = logging.getLogger(__name__)
+
+Change = namedtuple("Change", ["kind", "old", "new", "removed_flights", "added_flights"])
+Change.__doc__ = """
+A slot that differs between two versions of a schedule, as given by diff.
+
+kind: "added", "removed" or "modified".
+old: slot dict of the old version, None if added.
+new: slot dict of the new version, None if removed.
+removed_flights: list of flight dicts of the old slot that are gone, None unless diff was asked for flights.
+added_flights: list of flight dicts of the new slot that are new, None unless diff was asked for flights.
+"""
+
+
+def _identity(slot):
+    """
+    Operational suffix, airline designator and flight number of a slot, in the order they are written in a flight
+    leg record. Flight numbers are zero padded so they sort as numbers.
+    """
+
+    return (
+        (slot.get("operational_suffix") or "").strip(),
+        (slot.get("airline_designator") or "").strip(),
+        (slot.get("flight_number") or "").strip().zfill(4),
+    )
+
+
+def _leg(slot):
+    """What tells apart the slots of a flight, for pairing an old slot with the new slot it was modified into."""
+    return (
+        slot["ad"],
+        slot.get("station"),
+        slot.get("departure_station"),
+        slot.get("arrival_station"),
+    )
+
+
+def _normalized(slot):
+    """
+    A slot without its record serial number, and with the whitespace in its raw record collapsed, so slots that
+    only moved in the file or were reformatted compare (and hash) the same.
+    """
+
+    raw = slot.get("raw") or ""
+    # flight leg records of SIM files, whether read as SIM or as SIR
+    if raw[:1] == "3" and len(raw) >= serial_number_end:
+        raw = raw[:serial_number_start]
+
+    return " ".join(raw.split()), frozenset(
+        (key, value) for key, value in slot.items() if key not in ("raw", "record_serial_number")
+    )
+
+
+def _iter_groups(slots, sort):
+    """
+    Groups slots that follow on each other by flight, see _identity.
+
+    :param slots: iterable of slot dicts.
+    :param sort: bool, if True, slots are sorted first (in memory).
+    :return groups: generator of (identity, list of slots) tuples, in the order of the slots.
+    """
+
+    if sort:
+        slots = sorted(slots, key=_identity)
+
+    for identity, group in groupby(slots, _identity):
+        yield identity, list(group)
+
+
+def _flights(old, new, season):
+    """Flights of the old slot that are gone and flights of the new slot that are new, as lists."""
+
+    old_flights = expand_slots([old], season=season) if old is not None else []
+    new_flights = expand_slots([new], season=season) if new is not None else []
+    if old is None or new is None or _content(old) != _content(new):
+        return old_flights, new_flights
+
+    # only the period changed, flights on days both operate on stay
+    old_dates = set(flight["date"] for flight in old_flights)
+    new_dates = set(flight["date"] for flight in new_flights)
+    return (
+        [flight for flight in old_flights if flight["date"] not in new_dates],
+        [flight for flight in new_flights if flight["date"] not in old_dates],
+    )
+
+
+def _change(kind, old, new, flights, season):
+    if not flights:
+        return Change(kind, old, new, None, None)
+    return Change(kind, old, new, *_flights(old, new, season))
+
+
+def _diff_group(old_slots, new_slots, flights, season):
+    """Changes between the old and new slots of a flight."""
+
+    unchanged = {}
+    for slot in old_slots:
+        unchanged.setdefault(_normalized(slot), []).append(slot)
+
+    changed = []
+    for slot in new_slots:
+        same = unchanged.get(_normalized(slot))
+        if same:
+            same.pop()
+        else:
+            changed.append(slot)
+
+    old_legs = {}
+    for slots in unchanged.values():
+        for slot in slots:
+            old_legs.setdefault(_leg(slot), []).append(slot)
+    for slots in old_legs.values():
+        slots.reverse()
+
+    changes = []
+    for slot in changed:
+        old = old_legs.get(_leg(slot))
+        if old:
+            changes.append(_change("modified", old.pop(), slot, flights, season))
+        else:
+            changes.append(_change("added", None, slot, flights, season))
+    for slots in old_legs.values():
+        changes.extend(_change("removed", slot, None, flights, season) for slot in reversed(slots))
+
+    return changes
+
+
+def iter_diff(old, new, iata_airport=None, flights=False, season=None, sort=False):
+    """
+    Compares two versions of a schedule slot by slot, one flight at a time.
+
+    Both versions are walked side by side, in the order of their slots, grouped by flight (operational suffix,
+    airline designator and flight number). A flight is compared as soon as it is found in both versions, so only
+    the flights found in one version but not yet in the other are held. Versions ordered alike, such as two
+    releases of a SIM file, take little memory whichever order that is. The slots of a flight should follow on
+    each other, as the flight leg records of SIM files do. Slots are looked up in a hash table of their fields
+    and raw record, leaving out the record serial number and whitespace. Of the slots of a flight that differ, an
+    old and a new slot with the same arrival/departure and stations are paired up as modified, others are added
+    or removed.
+
+    Parameters
+    ----------.
+    :param old: path to a slotfile (read with iter_read), or iterable of slots, the old version.
+    :param new: path to a slotfile, or iterable of slots, the new version.
+    :param iata_airport: 3 letter capital string indicating iata airport, see read.
+    :param flights: bool, if True, changed slots are expanded, to give the flights that are gone and that are new.
+    Unchanged slots are never expanded.
+    :param season: indication of season to expand slots with, see expand_slots.
+    :param sort: bool, if True, both versions are sorted by flight first, so the slots of a flight need not follow
+    on each other. This takes memory in proportion to the size of the versions.
+
+    Returns
+    -------
+    :return changes: generator of Change, per flight in the order it is found in both versions, followed by the
+    flights found in only one version.
+    """
+
+    groups = []
+    for version in (old, new):
+        if isinstance(version, (str, os.PathLike)):
+            version = iter_read(version, iata_airport=iata_airport)
+        groups.append(_iter_groups(version, sort))
+
+    # slots of flights found in the old (0) or new (1) version only so far, by flight
+    pending = ({}, {})
+    while groups[0] is not None or groups[1] is not None:
+        for side in (0, 1):
+            group = next(groups[side], None) if groups[side] is not None else None
+            if group is None:
+                groups[side] = None
+                continue
+
+            identity, slots = group
+            other = pending[1 - side].pop(identity, None)
+            if other is None and groups[1 - side] is not None:
+                pending[side].setdefault(identity, []).extend(slots)
+                continue
+
+            old_slots, new_slots = (slots, other or []) if side == 0 else (other or [], slots)
+            for change in _diff_group(old_slots, new_slots, flights, season):
+                yield change
+
+    for old_slots in pending[0].values():
+        for change in _diff_group(old_slots, [], flights, season):
+            yield change
+    for new_slots in pending[1].values():
+        for change in _diff_group([], new_slots, flights, season):
+            yield change
+
+
+def diff(old, new, iata_airport=None, flights=False, season=None, sort=False):
+    """
+    Compares two versions of a schedule slot by slot, see iter_diff.
+
+    Parameters
+    ----------.
+    :param old: path to a slotfile, or iterable of slots, the old version.
+    :param new: path to a slotfile, or iterable of slots, the new version.
+    :param iata_airport: 3 letter capital string indicating iata airport, see read.
+    :param flights: bool, if True, also give the flights that are gone and that are new for every change.
+    :param season: indication of season to expand slots with, see expand_slots.
+    :param sort: bool, if True, both versions are sorted by flight first.
+
+    Returns
+    -------
+    :return changes: list of Change, see iter_diff.
+    """
+
+    changes = list(iter_diff(old, new, iata_airport=iata_airport, flights=flights, season=season, sort=sort))
+    logger.info(
+        "%i slots added, %i removed and %i modified."
+        % tuple(sum(change.kind == kind for change in changes) for kind in ("added", "removed", "modified"))
+    )
+    return changes
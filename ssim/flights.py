@@ -0,0 +1,137 @@
+import csv
+from collections.abc import Mapping
+from datetime import date
+
+
+def fieldnames(slots):
+    """
+    Returns the keys flights expanded from slots can have: the keys of all slots, in order of first appearance,
+    followed by "date".
+
+    Parameters
+    ----------.
+    :param slots: iterable of slot dicts.
+    :return fieldnames: list of strings.
+    """
+
+    keys = {}
+    for slot in slots:
+        keys.update(dict.fromkeys(slot))
+    keys.pop("date", None)
+
+    return list(keys) + ["date"]
+
+
+class FlightView(Mapping):
+    """
+    Read-only view of a single flight in a FlightTable.
+
+    Behaves like the flight dict returned by expand_slots: the keys of the slot followed by "date", without
+    copying the slot.
+    """
+
+    __slots__ = ("_slot", "_date")
+
+    def __init__(self, slot, date):
+        self._slot = slot
+        self._date = date
+
+    def __getitem__(self, key):
+        if key == "date":
+            return self._date
+        return self._slot[key]
+
+    def __iter__(self):
+        for key in self._slot:
+            if key != "date":
+                yield key
+        yield "date"
+
+    def __len__(self):
+        return len(self._slot) + (0 if "date" in self._slot else 1)
+
+    def __repr__(self):
+        return "FlightView(%r)" % self.copy()
+
+    def copy(self):
+        """Returns the flight as a dict."""
+        return dict(self.items())
+
+
+class FlightTable(object):
+    """
+    Columnar representation of flights expanded from slots.
+
+    Flights are stored as two parallel columns: the position of each flight's slot in the slot table and its
+    date as a proleptic Gregorian ordinal (see datetime.date.toordinal). Memory grows with the number of slots
+    rather than with flights times fields. Rows are built on demand as FlightView objects.
+
+    Parameters
+    ----------.
+    :param slots: list, the slot table, a list of slot dicts.
+    :param slot_index: sequence of ints, index into slots for every flight.
+    :param date: sequence of ints, date ordinal for every flight.
+    """
+
+    def __init__(self, slots, slot_index, date):
+        if len(slot_index) != len(date):
+            raise ValueError("slot_index and date should have the same length: %i != %i" % (len(slot_index), len(date)))
+
+        self.slots = slots
+        self.slot_index = slot_index
+        self.date = date
+        self._isoformat = {}
+
+    def __len__(self):
+        return len(self.slot_index)
+
+    def __getitem__(self, i):
+        return FlightView(self.slots[self.slot_index[i]], self.isoformat(self.date[i]))
+
+    def __iter__(self):
+        for i, ordinal in zip(self.slot_index, self.date):
+            yield FlightView(self.slots[i], self.isoformat(ordinal))
+
+    def isoformat(self, ordinal):
+        """Formats a date ordinal as YYYY-MM-DD, caching the few hundred distinct dates of a season."""
+        ordinal = int(ordinal)
+        if ordinal not in self._isoformat:
+            self._isoformat[ordinal] = date.fromordinal(ordinal).isoformat()
+        return self._isoformat[ordinal]
+
+    def fieldnames(self):
+        """Returns the keys of all slots, in order of first appearance, followed by "date"."""
+        return fieldnames(self.slots)
+
+    def to_dicts(self):
+        """Returns a generator of flight dicts, as returned by expand_slots."""
+        for flight in self:
+            yield flight.copy()
+
+    def to_csv(self, csvfile, fieldnames=None):
+        """
+        Writes flights to an open file as CSV, one row at a time.
+
+        Parameters
+        ----------.
+        :param csvfile: file object opened for writing.
+        :param fieldnames: list of column names, defaults to fieldnames().
+        """
+
+        dict_writer = csv.DictWriter(csvfile, fieldnames or self.fieldnames(), restval="")
+        dict_writer.writeheader()
+        dict_writer.writerows(self)
+
+    def to_frame(self):
+        """
+        Returns flights as a pandas DataFrame, built by taking rows of the slot table. The date column is of type
+        datetime64.
+        """
+
+        import numpy as np
+        import pandas as pd
+
+        frame = pd.DataFrame(self.slots).take(np.asarray(self.slot_index, dtype=np.int64)).reset_index(drop=True)
+        frame["date"] = (np.asarray(self.date, dtype=np.int64) - date(1970, 1, 1).toordinal()).astype("datetime64[D]")
+
+        return frame
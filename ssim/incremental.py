@@ -0,0 +1,173 @@
+import hashlib
+import logging
+import mmap
+from collections import namedtuple
+
+from .ssim import (
+    encoding,
+    expand_slots,
+    sim_bytes_parsers,
+    _apply_time_mode,
+    _detect_file_type,
+    _iter_uniformize_sim,
+    _merge_two_dicts,
+)
+
+logger = logging.getLogger(__name__)
+
+Revision = namedtuple("Revision", ["slots", "flights", "added", "removed", "legs", "options"])
+Revision.__doc__ = """
+Outcome of reading a SIM file with read_incremental.
+
+slots: list of slot dicts, as returned by read.
+flights: list of flight dicts, as returned by expand_slots, None if not expanded.
+added: list of slots not in the previous revision.
+removed: list of slots of the previous revision no longer in the file.
+legs: dict of flight leg fingerprint to a list of (raw, slots, flights) tuples, one per line with that fingerprint.
+options: dict of the options the file was read with.
+"""
+
+# the record serial number is a line counter, it changes whenever a line is added before a leg
+serial_number_start, serial_number_end = 194, 200
+
+
+def _fingerprint(time_mode, line):
+    """Hash of a flight leg record line without its record serial number, along with the time mode it is read in."""
+    return hashlib.blake2b(time_mode + line[:serial_number_start], digest_size=16).digest()
+
+
+def _iter_flight_leg_lines(buffer):
+    """
+    Finds the flight leg records of a SIM in a bytes buffer, tracking the time mode set by record type 2.
+
+    :param buffer: bytes-like object, e.g. mmap.
+    :return lines: generator of (fingerprint, start, end, time_mode) tuples, time_mode being a str or None.
+    """
+
+    parse_record_2 = sim_bytes_parsers["2"]
+    time_mode = None
+
+    position = 0
+    size = len(buffer)
+    while position < size:
+        line_end = buffer.find(b"\n", position)
+        if line_end == -1:
+            line_end = size
+
+        record_type = buffer[position]
+        if record_type == 51 and line_end - position >= serial_number_end:  # b"3"
+            stop = position + serial_number_end
+            yield _fingerprint((time_mode or "").encode(), buffer[position:stop]), position, line_end, time_mode
+        elif record_type == 50:  # b"2"
+            record_2 = parse_record_2(buffer, position, line_end)
+            if record_2:
+                time_mode = record_2["time_mode"]
+
+        position = line_end + 1
+
+
+def _patch_serial_number(records, raw):
+    """Copies slots or flights of a line that only differs in its record serial number, with the new line."""
+
+    patched = []
+    for record in records:
+        update = {"raw": raw}
+        if "record_serial_number" in record:
+            update["record_serial_number"] = raw[serial_number_start:].strip() or None
+        patched.append(_merge_two_dicts(record, update))
+
+    return patched
+
+
+def read_incremental(file, previous=None, iata_airport=None, expand=False, season=None):
+    """
+    Reads a revision of a SIM file, reusing the slots (and flights) of the flight leg records that did not change
+    since a previous revision.
+
+    Every flight leg record is fingerprinted by a hash of its line, without the record serial number, and the time
+    mode it is read in. Only lines whose fingerprint is not in the previous revision are parsed, uniformized and
+    expanded, so a revision costs time in proportion to the number of changed lines (plus hashing every line).
+
+    Parameters
+    ----------.
+    :param file: path to a SIM file.
+    :param previous: Revision, as returned by read_incremental for a previous version of the file. If None, the
+    whole file is read.
+    :param iata_airport: 3 letter capital string indicating iata airport, see read.
+    :param expand: if True, slots are expanded into flights.
+    :param season: indication of season, see expand_slots.
+
+    Returns
+    -------
+    :return revision: Revision, the slots of the file, the slots added and removed since the previous revision.
+    """
+
+    options = {"iata_airport": iata_airport, "expand": expand, "season": season}
+    if previous is not None and previous.options != options:
+        raise ValueError("previous revision was read with %r rather than %r" % (previous.options, options))
+
+    # lines of the previous revision not (yet) found in the file, a fingerprint can occur on several lines
+    unmatched = {fingerprint: list(entries) for fingerprint, entries in (previous.legs if previous else {}).items()}
+
+    with open(file, "rb") as f:
+        # checked before mapping the file, an empty file cannot be mapped
+        if _detect_file_type(f.read(4096)) != "sim":
+            raise ValueError("Incremental reading is only supported for SIM files, %s is not one." % file)
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            lines = []
+            changed = []
+            parse_record_3 = sim_bytes_parsers["3"]
+            for fingerprint, start, end, time_mode in _iter_flight_leg_lines(buffer):
+                entries = unmatched.get(fingerprint)
+                if entries:
+                    raw, slots, flights = entries.pop()
+                    stop = start + serial_number_end
+                    new_raw = buffer[start:stop].decode(encoding)
+                    if new_raw != raw:
+                        slots = _patch_serial_number(slots, new_raw)
+                        flights = None if flights is None else _patch_serial_number(flights, new_raw)
+                    lines.append((fingerprint, new_raw, slots, flights))
+                else:
+                    flight_leg_record = _apply_time_mode(parse_record_3(buffer, start, end), time_mode)
+                    slots = list(_iter_uniformize_sim([flight_leg_record], iata_airport))
+                    lines.append((fingerprint, flight_leg_record["raw"], slots, None))
+                    changed.append(len(lines) - 1)
+
+    added = [slot for i in changed for slot in lines[i][2]]
+    removed = [slot for entries in unmatched.values() for raw, slots, flights in entries for slot in slots]
+    logger.info(
+        "Read %s: %i of %i flight leg records changed, %i slots added and %i removed."
+        % (file, len(changed), len(lines), len(added), len(removed))
+    )
+
+    if expand:
+        # expand all added slots at once, then hand the flights back to the lines they belong to
+        table = expand_slots(added, season=season, columnar=True)
+        flights_by_slot = [[] for slot in added]
+        for i, flight in zip(table.slot_index, table):
+            flights_by_slot[int(i)].append(flight.copy())
+        position = 0
+        for i in changed:
+            fingerprint, raw, slots, flights = lines[i]
+            end = position + len(slots)
+            lines[i] = (
+                fingerprint,
+                raw,
+                slots,
+                [flight for flights in flights_by_slot[position:end] for flight in flights],
+            )
+            position = end
+
+    legs = {}
+    for fingerprint, raw, slots, flights in lines:
+        legs.setdefault(fingerprint, []).append((raw, slots, flights))
+
+    return Revision(
+        slots=[slot for fingerprint, raw, slots, flights in lines for slot in slots],
+        flights=[flight for fingerprint, raw, slots, flights in lines for flight in flights] if expand else None,
+        added=added,
+        removed=removed,
+        legs=legs,
+        options=options,
+    )
@@ -0,0 +1,195 @@
+from datetime import date, datetime
+
+from .flights import FlightView
+from .ssim import _operating_schedule
+
+# below this many candidates, a hash index is scanned directly rather than querying the interval tree
+scan_threshold = 64
+
+
+def _as_ordinal(d):
+    if isinstance(d, str):
+        return datetime.strptime(d[:10], "%Y-%m-%d").toordinal()
+    if isinstance(d, datetime):
+        return d.date().toordinal()
+    return d.toordinal()
+
+
+def _station(slot):
+    if "station" in slot:
+        return slot["station"]
+    return slot.get("departure_station") if slot["ad"] == "D" else slot.get("arrival_station")
+
+
+class _IntervalTree(object):
+    """
+    Centered interval tree over closed intervals of integers, each identified by an int.
+
+    Parameters
+    ----------.
+    :param intervals: list of (start, end, i) tuples.
+    """
+
+    __slots__ = ("center", "by_start", "by_end", "left", "right", "ids")
+
+    def __init__(self, intervals):
+        starts = sorted(start for start, end, i in intervals)
+        self.center = starts[len(starts) // 2]
+
+        left, right, here = [], [], []
+        for interval in intervals:
+            if interval[1] < self.center:
+                left.append(interval)
+            elif interval[0] > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+
+        self.by_start = sorted((start, i) for start, end, i in here)
+        self.by_end = sorted(((end, i) for start, end, i in here), reverse=True)
+        self.left = _IntervalTree(left) if left else None
+        self.right = _IntervalTree(right) if right else None
+        self.ids = frozenset(i for start, end, i in intervals)
+
+    def contains(self, i):
+        """Whether the interval with id i is in the tree."""
+        return i in self.ids
+
+    def overlapping(self, first, last, found):
+        """Appends to found the ids of intervals overlapping [first, last]."""
+
+        node = self
+        while node is not None:
+            if last < node.center:
+                for start, i in node.by_start:
+                    if start > last:
+                        break
+                    found.append(i)
+                node = node.left
+            elif first > node.center:
+                for end, i in node.by_end:
+                    if end < first:
+                        break
+                    found.append(i)
+                node = node.right
+            else:
+                found.extend(i for start, i in node.by_start)
+                if node.left is not None:
+                    node.left.overlapping(first, last, found)
+                node = node.right
+
+        return found
+
+
+class ScheduleIndex(object):
+    """
+    Index over slots, answering which flights operate on a day or in a range of days without expanding all slots.
+
+    The period of operation of every slot is kept as an interval of flight dates (shifted by a day for overnight
+    flights) in an interval tree per weekday the slot operates on, along with its frequency rate. Hash indexes on
+    airline, flight number, station and arrival/departure narrow queries down further. Queries give the same
+    flights as filtering the result of expand_slots.
+
+    Parameters
+    ----------.
+    :param slots: list of slots, as returned by read.
+    :param season: indication of season, see expand_slots.
+    """
+
+    fields = {
+        "airline": lambda slot: slot.get("airline_designator"),
+        "flight_number": lambda slot: slot.get("flight_number"),
+        "station": _station,
+        "ad": lambda slot: slot["ad"],
+    }
+
+    def __init__(self, slots, season=None):
+        self.slots = list(slots)
+        self.schedules = []
+        intervals = [[] for weekday in range(7)]
+        for i, slot in enumerate(self.slots):
+            first, last, days_of_operation, frequency_rate, overnight = _operating_schedule(slot, season=season)
+            # flight dates, their weekdays and weeks are shifted along with overnight flights. Weeks are counted
+            # from the Monday of the week of the first day, as in expand_slots
+            first, last = first.toordinal() + overnight, last.toordinal() + overnight
+            first_monday = first - (first - 1 - overnight) % 7
+            self.schedules.append((first, last, frequency_rate, first_monday))
+            for weekday in set(days_of_operation or range(7)):
+                if first <= last:
+                    intervals[(weekday + overnight) % 7].append((first, last, i))
+
+        self.trees = [
+            _IntervalTree(weekday_intervals) if weekday_intervals else None for weekday_intervals in intervals
+        ]
+
+        self.hashes = {field: {} for field in self.fields}
+        for i, slot in enumerate(self.slots):
+            for field, value in self.fields.items():
+                self.hashes[field].setdefault(value(slot), set()).add(i)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def query(self, first, last=None, airline=None, flight_number=None, station=None, ad=None):
+        """
+        Returns the flights operating on a day, or in a range of days.
+
+        Parameters
+        ----------.
+        :param first: date, datetime or "YYYY-MM-DD" string, (first) day of flights.
+        :param last: date, datetime or "YYYY-MM-DD" string, last day of flights, inclusive. Defaults to first.
+        :param airline: str, airline designator.
+        :param flight_number: str, flight number.
+        :param station: str, the "station" of slots read as SIR (or from a SIM with iata_airport), otherwise the
+        departure station of departures and the arrival station of arrivals.
+        :param ad: str, "A" or "D".
+        :return flights: list of FlightView, read-only flights that compare equal to those returned by
+        expand_slots, ordered by date, then by slot.
+        """
+
+        first = _as_ordinal(first)
+        last = first if last is None else _as_ordinal(last)
+
+        filters = [
+            self.hashes[field].get(value, set())
+            for field, value in (
+                ("airline", airline),
+                ("flight_number", flight_number),
+                ("station", station),
+                ("ad", ad),
+            )
+            if value is not None
+        ]
+        filters.sort(key=len)
+        selected = filters[0].intersection(*filters[1:]) if filters else None
+
+        flights = []
+        schedules = self.schedules
+        # the days of the range falling on each weekday are a week apart
+        for weekday_first in range(first, min(first + 7, last + 1)):
+            tree = self.trees[(weekday_first - 1) % 7]
+            if tree is None:
+                continue
+            weekday_last = weekday_first + (last - weekday_first) // 7 * 7
+
+            if selected is not None and len(selected) < scan_threshold:
+                candidates = [i for i in selected if tree.contains(i)]
+            else:
+                candidates = tree.overlapping(weekday_first, weekday_last, [])
+                if selected is not None:
+                    candidates = selected.intersection(candidates)
+                if weekday_first == weekday_last:
+                    # single day, within the period of every candidate
+                    day = weekday_first
+                    flights.extend((day, i) for i in candidates if (day - schedules[i][3]) // 7 % schedules[i][2] == 0)
+                    continue
+
+            for i in candidates:
+                start, end, frequency_rate, first_monday = schedules[i]
+                for day in range(weekday_first, weekday_last + 1, 7):
+                    if start <= day <= end and (day - first_monday) // 7 % frequency_rate == 0:
+                        flights.append((day, i))
+        flights.sort()
+
+        isoformat = {day: date.fromordinal(day).isoformat() for day in set(day for day, i in flights)}
+        return [FlightView(self.slots[i], isoformat[day]) for day, i in flights]
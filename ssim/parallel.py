@@ -0,0 +1,245 @@
+import io
+import logging
+import mmap
+import os
+from collections import namedtuple
+
+from .ssim import (
+    read,
+    expand_slots,
+    encoding,
+    regexes,
+    sim_fixed_width_parsers,
+    _detect_compression,
+    _merge_two_dicts,
+    _iter_decompressed,
+    _iter_parse_sim,
+    _iter_parse_sim_buffer,
+    _iter_read_text,
+    _iter_uniformize_sim,
+)
+
+logger = logging.getLogger(__name__)
+
+FileResult = namedtuple("FileResult", ["path", "records", "error"])
+FileResult.__doc__ = """
+Outcome of reading a single file with read_many, or a single member of a zip archive with read_archive.
+
+path: path of the file, "archive:member" for a member of a zip archive.
+records: list of slot (or flight) dicts, None if reading failed.
+error: exception raised while reading the file, None if reading succeeded.
+"""
+
+
+def _read_file(path, iata_airport=None, expand=False, season=None):
+    """
+    Reads (and expands) a single file, returning any exception rather than raising it. Runs in a worker process.
+    """
+
+    try:
+        records = read(path, iata_airport=iata_airport)
+        if expand:
+            records = expand_slots(records, season=season)
+    except Exception as e:
+        return FileResult(path, None, e)
+
+    return FileResult(path, records, None)
+
+
+def read_archive(file, iata_airport=None, expand=False, season=None):
+    """
+    Reads every file in a zip archive as a slotfile of its own, one after the other.
+
+    Unlike read, which gives the slots of all members together, the slots of every member are kept apart, and a
+    member that fails to be read does not stop the others, its error is reported in its result. Any other file
+    gives a single result.
+
+    Parameters
+    ----------.
+    :param file: path to a zip archive, or to any other slotfile.
+    :param iata_airport: 3 letter capital string indicating iata airport, see read.
+    :param expand: if True, slots are expanded into flights.
+    :param season: indication of season, see expand_slots.
+
+    Returns
+    -------
+    :return: results: list of FileResult, one per member in the order of the archive, with paths "file:member".
+    """
+
+    if _detect_compression(file) != "zip":
+        return [_read_file(file, iata_airport, expand, season)]
+
+    results = []
+    for name, f in _iter_decompressed(file, "zip"):
+        try:
+            records = list(_iter_read_text(f, name, iata_airport))
+            if expand:
+                records = expand_slots(records, season=season)
+        except Exception as e:
+            logger.error("Failed to read %s: %r" % (name, e))
+            results.append(FileResult(name, None, e))
+        else:
+            results.append(FileResult(name, records, None))
+
+    return results
+
+
+def read_many(paths, workers=None, iata_airport=None, expand=False, season=None, merge=False):
+    """
+    Reads many slotfiles in parallel, each file in a worker process.
+
+    A file that fails to be read does not stop the others, its error is reported in its result.
+
+    Parameters
+    ----------.
+    :param paths: iterable of paths to slotfiles.
+    :param workers: int, number of worker processes. Defaults to the number of
+    processors. With 1, files are read in the current process.
+    :param iata_airport: 3 letter capital string indicating iata airport, see read.
+    :param expand: if True, slots are expanded into flights in the workers.
+    :param season: indication of season, see expand_slots.
+    :param merge: if True, return a single list of records tagged with the
+    file they came from, rather than a result per file.
+
+    Returns
+    -------
+    :return: results: list of FileResult, in the order of paths. If merge is
+    True, a tuple of a list of records, each with a "source_file" key, and a
+    dict of path to exception for files that failed.
+    """
+
+    paths = list(paths)
+
+    if workers == 1:
+        results = [_read_file(path, iata_airport, expand, season) for path in paths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_read_file, path, iata_airport, expand, season) for path in paths]
+            results = []
+            for path, future in zip(paths, futures):
+                # the worker itself may fail, e.g. if it gets killed or its result cannot be pickled
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(FileResult(path, None, e))
+
+    for result in results:
+        if result.error is not None:
+            logger.error("Failed to read %s: %r" % (result.path, result.error))
+
+    if merge:
+        records = [
+            _merge_two_dicts(record, {"source_file": result.path})
+            for result in results
+            if result.error is None
+            for record in result.records
+        ]
+        errors = {result.path: result.error for result in results if result.error is not None}
+        return records, errors
+
+    return results
+
+
+def _sim_chunks(file, n):
+    """
+    Splits a SIM file into at most n byte ranges holding whole lines, along with the time mode in effect at the
+    start of each range.
+
+    Parameters
+    ----------.
+    :param file: path to a SIM file.
+    :param n: int, number of chunks.
+    :return chunks: list of (start, end, time_mode) tuples.
+    """
+
+    with open(file, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+
+        boundaries = [0]
+        for i in range(1, n):
+            f.seek(max(size * i // n, boundaries[-1]))
+            f.readline()
+            if f.tell() < size and f.tell() > boundaries[-1]:
+                boundaries.append(f.tell())
+        boundaries.append(size)
+
+        # record type 2 lines are the only ones starting with "2", a scan for them is cheap
+        time_modes = []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            position = buffer.find(b"\n2")
+            while position != -1:
+                buffer.seek(position + 1)
+                record_2 = sim_fixed_width_parsers["2"](buffer.readline().decode(encoding))
+                if record_2:
+                    time_modes.append((position + 1, record_2["time_mode"]))
+                position = buffer.find(b"\n2", position + 1)
+
+    chunks = []
+    time_mode = None
+    for start, end in zip(boundaries[:-1], boundaries[1:]):
+        while time_modes and time_modes[0][0] < start:
+            time_mode = time_modes.pop(0)[1]
+        chunks.append((start, end, time_mode))
+
+    return chunks
+
+
+def _read_sim_chunk(file, start, end, time_mode, iata_airport=None, compact=False, use_mmap=False, time_format=None):
+    """
+    Parses and uniformizes the flight leg records in a byte range of a SIM file. Runs in a worker process.
+    """
+
+    if use_mmap:
+        with open(file, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                flight_leg_records = _iter_parse_sim_buffer(
+                    buffer, start, end, time_mode=time_mode, time_format=time_format
+                )
+                return list(_iter_uniformize_sim(flight_leg_records, iata_airport, compact))
+
+    with open(file, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    # same decoding and newline handling as reading the file in text mode
+    lines = io.TextIOWrapper(io.BytesIO(data), encoding=encoding)
+
+    flight_leg_records = _iter_parse_sim(lines, time_mode=time_mode, time_format=time_format)
+    return list(_iter_uniformize_sim(flight_leg_records, iata_airport, compact))
+
+
+def read_sim_chunked(file, workers, iata_airport=None, compact=False, use_mmap=False, time_format=None):
+    """
+    Reads a SIM file by splitting it into chunks of whole records that are parsed in parallel worker processes.
+
+    The time mode of record type 2 is found up front and passed to each chunk, results are merged in their
+    original order.
+
+    Parameters
+    ----------.
+    :param file: path to a slotfile.
+    :param workers: int, number of worker processes and chunks.
+    :param iata_airport: 3 letter capital string indicating iata airport, see read.
+    :param compact: bool, return compact slots, see read.
+    :param use_mmap: bool, parse the memory-mapped file, see read.
+    :param time_format: "minutes" to give scheduled times as int minutes, see read.
+    :return slots: list of dicts, as returned by read, or None if the file is not a SIM file.
+    """
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with open(file, "r", encoding=encoding) as f:
+        if not regexes["sim"]["record_1"].match(f.readline()):
+            return None
+
+    chunks = _sim_chunks(file, workers)
+    logger.info("Reading and parsing SIM file: %s in %i chunks." % (file, len(chunks)))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_read_sim_chunk, file, start, end, time_mode, iata_airport, compact, use_mmap, time_format)
+            for start, end, time_mode in chunks
+        ]
+        return [slot for future in futures for slot in future.result()]
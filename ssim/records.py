@@ -0,0 +1,352 @@
+import sys
+from collections import namedtuple
+from collections.abc import Mapping
+
+from .regexes import field_offsets
+
+SimLeg = namedtuple("SimLeg", ["raw"] + [name for name, start, end in field_offsets["sim"]["record_3"]] + ["acv"])
+SimLeg.__doc__ = """
+Flight leg record of a SIM (record type 3), shared by its arrival and departure slots. acv holds the decoded
+aircraft configuration string as a tuple of (key, value) pairs.
+"""
+
+SimAsSirLeg = namedtuple(
+    "SimAsSirLeg",
+    [
+        "raw",
+        "aircraft_type",
+        "airline_designator",
+        "flight_number",
+        "operational_suffix",
+        "service_type",
+        "days_of_operation",
+        "frequency_rate",
+        "departure_station",
+        "arrival_station",
+        "period_of_operation_from",
+        "period_of_operation_to",
+        "scheduled_time_of_aircraft_arrival",
+        "scheduled_time_of_aircraft_departure",
+        "seats",
+    ],
+)
+SimAsSirLeg.__doc__ = """
+The fields of a SIM flight leg record needed for its slots at an airport, shared by its arrival and departure
+slots.
+"""
+
+SirLeg = namedtuple(
+    "SirLeg",
+    [
+        "raw",
+        "action_code",
+        "arrival_airline_designator",
+        "arrival_flight_number",
+        "arrival_operational_suffix",
+        "departure_airline_designator",
+        "departure_flight_number",
+        "departure_operational_suffix",
+        "period_of_operation_from",
+        "period_of_operation_to",
+        "days_of_operation",
+        "seats",
+        "aircraft_type",
+        "origin_station",
+        "previous_station",
+        "scheduled_time_of_arrival_utc",
+        "scheduled_time_of_departure_utc",
+        "next_station",
+        "destination_station",
+        "arrival_service_type",
+        "departure_service_type",
+        "frequency_rate",
+        "overnight_indicator",
+        "additional_schedule_information",
+    ],
+)
+SirLeg.__doc__ = """
+Flight leg record of a SIR, shared by its arrival and departure slots. Fields a record does not have are None.
+"""
+
+
+class Slot(Mapping):
+    """
+    Compact, read-only slot: a flight leg record plus an arrival/departure indicator.
+
+    Behaves like the slot dicts returned by read and turns into one with to_dict. The fields of a slot are
+    looked up in its leg, which is shared with the other slot of the same leg rather than copied. Subclasses
+    describe, for arrivals and departures, which leg field (or function of the leg) each key maps to.
+    """
+
+    __slots__ = ("leg", "ad")
+
+    fields = {"A": (), "D": ()}
+    _lookup = {"A": {}, "D": {}}
+
+    def __init__(self, leg, ad):
+        self.leg = leg
+        self.ad = ad
+
+    def __getitem__(self, key):
+        if key == "ad":
+            return self.ad
+        field = self._lookup[self.ad][key]
+        return getattr(self.leg, field) if field.__class__ is str else field(self.leg)
+
+    def __iter__(self):
+        for key, field in self.fields[self.ad]:
+            yield key
+
+    def __len__(self):
+        return len(self.fields[self.ad])
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.to_dict())
+
+    def __reduce__(self):
+        return self.__class__, (self.leg, self.ad)
+
+    def to_dict(self):
+        """Returns the slot as a dict."""
+        return {key: self[key] for key, field in self.fields[self.ad]}
+
+    copy = to_dict
+
+
+def _field_lookup(fields):
+    return {ad: dict(fields[ad]) for ad in fields}
+
+
+class SimSlot(Slot):
+    """Slot of a SIM flight leg, as returned by read without iata_airport."""
+
+    __slots__ = ()
+
+    fields = {ad: [("ad", None)] + [(name, name) for name in SimLeg._fields[:-1]] for ad in ("A", "D")}
+    _lookup = _field_lookup(fields)
+
+    def __getitem__(self, key):
+        if key == "ad":
+            return self.ad
+        field = self._lookup[self.ad].get(key)
+        if field is not None:
+            return getattr(self.leg, field)
+        for acv_key, acv_value in self.leg.acv:
+            if acv_key == key:
+                return acv_value
+        raise KeyError(key)
+
+    def __iter__(self):
+        for key, value in self.leg.acv:
+            yield key
+        for key, field in self.fields[self.ad]:
+            yield key
+
+    def __len__(self):
+        return len(self.leg.acv) + len(self.fields[self.ad])
+
+    def to_dict(self):
+        """Returns the slot as a dict."""
+        slot = dict(self.leg.acv)
+        slot["ad"] = self.ad
+        slot.update(zip(SimLeg._fields[:-1], self.leg[:-1]))
+        return slot
+
+    copy = to_dict
+
+
+_record_3 = {name: slice(start, end) for name, start, end in field_offsets["sim"]["record_3"]}
+
+
+def _overnight(raw):
+    """
+    Whether the flight of a SIM flight leg record is likely to arrive the day after it departs.
+
+    It's very hard to see if a flight is overnight. In case time of dep is higher than time of arr, it is likely to
+    arrive overnight. The local times as written in the record are compared, so the outcome does not depend on the
+    time mode or time format the record is read with.
+    """
+
+    if raw[_record_3["arrival_station"]].strip() and raw[_record_3["departure_station"]].strip():
+        return (
+            raw[_record_3["scheduled_time_of_aircraft_arrival"]]
+            < raw[_record_3["scheduled_time_of_aircraft_departure"]]
+        )
+    return False
+
+
+def _overnight_indicator(leg):
+    return _overnight(leg.raw)
+
+
+class SimAsSirSlot(Slot):
+    """Slot of a SIM flight leg from the perspective of an airport, as returned by read with iata_airport."""
+
+    __slots__ = ()
+
+    fields = {
+        "A": [
+            ("ad", None),
+            ("action_code", lambda leg: "H"),
+            ("additional_schedule_information", lambda leg: None),
+            ("aircraft_type", "aircraft_type"),
+            ("airline_designator", "airline_designator"),
+            ("flight_number", "flight_number"),
+            ("operational_suffix", "operational_suffix"),
+            ("service_type", "service_type"),
+            ("days_of_operation", "days_of_operation"),
+            ("frequency_rate", "frequency_rate"),
+            ("seats", "seats"),
+            ("second_station", "departure_station"),
+            ("period_of_operation_from", "period_of_operation_from"),
+            ("period_of_operation_to", "period_of_operation_to"),
+            ("station", "departure_station"),
+            ("raw", "raw"),
+            ("scheduled_time", "scheduled_time_of_aircraft_arrival"),
+            ("overnight_indicator", _overnight_indicator),
+        ],
+        "D": [
+            ("ad", None),
+            ("action_code", lambda leg: "H"),
+            ("additional_schedule_information", lambda leg: None),
+            ("aircraft_type", "aircraft_type"),
+            ("days_of_operation", "days_of_operation"),
+            ("airline_designator", "airline_designator"),
+            ("flight_number", "flight_number"),
+            ("operational_suffix", "operational_suffix"),
+            ("service_type", "service_type"),
+            ("second_station", "arrival_station"),
+            ("frequency_rate", "frequency_rate"),
+            ("station", "arrival_station"),
+            ("seats", "seats"),
+            ("period_of_operation_from", "period_of_operation_from"),
+            ("period_of_operation_to", "period_of_operation_to"),
+            ("raw", "raw"),
+            ("scheduled_time", "scheduled_time_of_aircraft_departure"),
+            ("overnight_indicator", lambda leg: False),
+        ],
+    }
+    _lookup = _field_lookup(fields)
+
+
+class SirSlot(Slot):
+    """Slot of a SIR flight leg, as returned by read."""
+
+    __slots__ = ()
+
+    fields = {
+        "A": [
+            ("ad", None),
+            ("action_code", "action_code"),
+            ("additional_schedule_information", "additional_schedule_information"),
+            ("aircraft_type", "aircraft_type"),
+            ("airline_designator", "arrival_airline_designator"),
+            ("flight_number", "arrival_flight_number"),
+            ("operational_suffix", "arrival_operational_suffix"),
+            ("service_type", "arrival_service_type"),
+            ("days_of_operation", "days_of_operation"),
+            ("frequency_rate", "frequency_rate"),
+            ("seats", "seats"),
+            ("second_station", "origin_station"),
+            ("period_of_operation_from", "period_of_operation_from"),
+            ("period_of_operation_to", "period_of_operation_to"),
+            ("station", "previous_station"),
+            ("raw", "raw"),
+            ("scheduled_time", "scheduled_time_of_arrival_utc"),
+        ],
+        "D": [
+            ("ad", None),
+            ("action_code", "action_code"),
+            ("additional_schedule_information", "additional_schedule_information"),
+            ("aircraft_type", "aircraft_type"),
+            ("days_of_operation", "days_of_operation"),
+            ("airline_designator", "departure_airline_designator"),
+            ("flight_number", "departure_flight_number"),
+            ("operational_suffix", "departure_operational_suffix"),
+            ("service_type", "departure_service_type"),
+            ("second_station", "destination_station"),
+            ("frequency_rate", "frequency_rate"),
+            ("station", "next_station"),
+            ("seats", "seats"),
+            ("period_of_operation_from", "period_of_operation_from"),
+            ("period_of_operation_to", "period_of_operation_to"),
+            ("raw", "raw"),
+            ("scheduled_time", "scheduled_time_of_departure_utc"),
+        ],
+    }
+    _lookup = _field_lookup(fields)
+
+
+def _shared(value):
+    # fields hold few distinct short values (stations, aircraft types, days), have slots share a single copy
+    return sys.intern(value) if value.__class__ is str and len(value) <= 8 else value
+
+
+def sim_slots(record, acv):
+    """
+    Compact counterpart of _uniformize_sim.
+
+    Parameters
+    ----------.
+    :param record: dict, flight leg record of a SIM.
+    :param acv: tuple of (key, value) pairs, decoded aircraft configuration string.
+    :return slots: list of SimSlot, departure first.
+    """
+
+    leg = SimLeg._make([_shared(record[name]) for name in SimLeg._fields[:-1]] + [acv])
+    slots = []
+    if leg.scheduled_time_of_aircraft_departure:
+        slots.append(SimSlot(leg, "D"))
+    if leg.scheduled_time_of_aircraft_arrival:
+        slots.append(SimSlot(leg, "A"))
+    return slots
+
+
+def sim_as_sir_slots(record, acv, iata_airport):
+    """
+    Compact counterpart of _uniformize_sim_as_sir.
+
+    Parameters
+    ----------.
+    :param record: dict, flight leg record of a SIM.
+    :param acv: tuple of (key, value) pairs, decoded aircraft configuration string.
+    :param iata_airport: str, three letters, indicating name of airport.
+    :return slots: list of SimAsSirSlot, arrival first.
+    """
+
+    seats = None
+    for key, value in acv:
+        if key == "seats":
+            seats = value
+
+    leg = SimAsSirLeg._make([_shared(record[name]) for name in SimAsSirLeg._fields[:-1]] + [seats])
+    slots = []
+    if leg.arrival_station == iata_airport:
+        slots.append(SimAsSirSlot(leg, "A"))
+    if leg.departure_station == iata_airport:
+        slots.append(SimAsSirSlot(leg, "D"))
+    return slots
+
+
+def sir_slots(record):
+    """
+    Compact counterpart of _uniformize_sir.
+
+    Parameters
+    ----------.
+    :param record: dict, flight leg record of a SIR.
+    :return slots: list of SirSlot, arrival first.
+    """
+
+    seats = record["seats"]
+    fields = dict.fromkeys(SirLeg._fields)
+    fields.update(record)
+    fields["seats"] = int(seats) if seats is not None and seats.isdigit() else seats
+    leg = SirLeg._make([_shared(fields[name]) for name in SirLeg._fields])
+
+    slots = []
+    if "arrival_airline_designator" in record:
+        slots.append(SirSlot(leg, "A"))
+    if "departure_airline_designator" in record:
+        slots.append(SirSlot(leg, "D"))
+    return slots
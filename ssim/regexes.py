@@ -2,6 +2,7 @@
 # For SIM specifications see: see chapter 7.5 of Standard Schedules Information Manual (2011)
 
 import re
+from collections.abc import Mapping
 
 record_1 = (
     "(?P<record_type>1)"
@@ -205,19 +206,85 @@ sir_header = (
 
 additional_information = "(\n/\s(?P<additional_schedule_information>.*)\s/){0,1}"
 
+
+class _LazyMapping(Mapping):
+    """
+    Read-only mapping of which every value is built by calling factory with its key, the first time it is looked up.
+    Keeps importing the package cheap, e.g. regexes are only compiled once they are used.
+
+    Parameters
+    ----------.
+    :param factory: function taking a key and returning its value.
+    :param keys: iterable of keys, in order.
+    """
+
+    __slots__ = ("factory", "keys_", "values_")
+
+    def __init__(self, factory, keys):
+        self.factory = factory
+        self.keys_ = tuple(keys)
+        self.values_ = {}
+
+    def __getitem__(self, key):
+        try:
+            return self.values_[key]
+        except KeyError:
+            if key not in self.keys_:
+                raise
+        value = self.values_[key] = self.factory(key)
+        return value
+
+    def __contains__(self, key):
+        return key in self.keys_
+
+    def __iter__(self):
+        return iter(self.keys_)
+
+    def __len__(self):
+        return len(self.keys_)
+
+
+def _field_offsets(record):
+    """
+    Derives (name, start, end) offsets from the named groups of a fixed width record pattern.
+    Groups are either a literal record type digit or a run of any characters of fixed length.
+    """
+
+    offsets = []
+    start = 0
+    for name, width in re.findall(r"\(\?P<(\w+)>(?:\.\{(\d+)\}|\d)\)", record):
+        end = start + (int(width) if width else 1)
+        offsets.append((name, start, end))
+        start = end
+
+    return offsets
+
+
+records = {
+    "record_1": record_1,
+    "record_2": record_2,
+    "record_3": record_3,
+    "record_4": record_4,
+    "record_5": record_5,
+}
+
+field_offsets = {"sim": _LazyMapping(lambda name: _field_offsets(records[name]), records)}
+
 t = "(?P<raw>{})"
-regexes = {
+patterns = {
     "sir": {
-        "arr": re.compile(t.format(arr + additional_information)),
-        "dep": re.compile(t.format(dep + additional_information)),
-        "arrdep": re.compile(t.format(arrdep + additional_information)),
-        "header": re.compile(t.format(sir_header)),
-    },
-    "sim": {
-        "record_1": re.compile(t.format(record_1)),
-        "record_2": re.compile(t.format(record_2)),
-        "record_3": re.compile(t.format(record_3)),
-        "record_4": re.compile(t.format(record_4)),
-        "record_5": re.compile(t.format(record_5)),
+        "arr": t.format(arr + additional_information),
+        "dep": t.format(dep + additional_information),
+        "arrdep": t.format(arrdep + additional_information),
+        "header": t.format(sir_header),
     },
+    "sim": {name: t.format(record) for name, record in records.items()},
 }
+
+
+def _compiled(patterns):
+    """Regexes of patterns, each compiled on first use."""
+    return _LazyMapping(lambda name: re.compile(patterns[name]), patterns)
+
+
+regexes = {file_type: _compiled(file_type_patterns) for file_type, file_type_patterns in patterns.items()}
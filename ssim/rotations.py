@@ -0,0 +1,208 @@
+from datetime import date, datetime
+
+from .ssim import iter_flights, _field_slice, _check_time_format
+
+epoch = date(1970, 1, 1).toordinal()
+
+
+def _days(variation):
+    """Days a date variation (or layover) character stands for: blank is the same day, "A" the day before."""
+
+    variation = variation.strip()
+    if not variation:
+        return 0
+    return -1 if variation == "A" else int(variation)
+
+
+def _ordinal(day):
+    return datetime.strptime(day, "%Y-%m-%d").toordinal()
+
+
+def _minutes(time):
+    """UTC minutes since the start of the day of a scheduled time, read as "HHMM", "HHMM+0100" or int minutes."""
+
+    if type(time) is int:
+        return time
+
+    minutes = int(time[:2]) * 60 + int(time[2:4])
+    if len(time) >= 9:
+        offset = int(time[5:7]) * 60 + int(time[7:9])
+        minutes += offset if time[4] == "-" else -offset
+
+    return minutes
+
+
+def _legs(records, season=None, time_format=None):
+    """Departures of flights, or of slots expanded into flights: every leg on every day it operates."""
+
+    _check_time_format(time_format)
+    records = list(records)
+    if records and ("departure_station" not in records[0] or "raw" not in records[0]):
+        raise ValueError("rotations need slots or flights of a SIM read without iata_airport")
+
+    legs = [record for record in records if record["ad"] == "D"]
+    if legs and "date" not in legs[0]:
+        legs = list(iter_flights(legs, season=season, time_format=time_format))
+
+    return legs
+
+
+def link_legs(records, season=None, time_format=None):
+    """
+    Links every flight leg to the onward leg the aircraft flies next, as given by the onward airline designator,
+    flight number, operational suffix and aircraft rotation layover of SIM record type 3.
+
+    Legs are looked up in a hash index on airline designator, flight number, operational suffix, departure
+    station and departure date, so linking takes time in proportion to the number of legs. The departure date of
+    a leg is its flight date shifted by its departure date variation. Its onward leg departs from its arrival
+    station, on its arrival date (shifted by its arrival date variation) plus the layover.
+
+    Parameters
+    ----------.
+    :param records: slots of a SIM read without iata_airport (expanded into flights here), or flights expanded
+    from them. Scheduled times can be strings or minutes, see read and expand_slots.
+    :param season: indication of season to expand slots with, see expand_slots.
+    :param time_format: None or "minutes", the time format flights are (or slots are to be) expanded with, see
+    expand_slots.
+
+    Returns
+    -------
+    :return legs, onward: list of flight dicts, the departure of every leg on every day, and a list of the
+    position in legs of the onward leg of every leg, None if it has none.
+    """
+
+    legs = _legs(records, season, time_format)
+
+    dates = {}
+    arrival_days = []
+    index = {}
+    for i, leg in enumerate(legs):
+        day = dates.get(leg["date"])
+        if day is None:
+            day = dates[leg["date"]] = _ordinal(leg["date"])
+        date_variation = leg["raw"][_field_slice("record_3", "date_variation")]
+        departure_day = day + _days(date_variation[0])
+        arrival_days.append(day + _days(date_variation[1]))
+
+        key = (
+            leg["airline_designator"],
+            leg["flight_number"],
+            leg["operational_suffix"],
+            leg["departure_station"],
+            departure_day,
+        )
+        # a leg operating twice a day under the same key cannot be told apart, the first is linked
+        index.setdefault(key, i)
+
+    onward = []
+    for i, leg in enumerate(legs):
+        if not leg.get("flight_number_"):
+            onward.append(None)
+            continue
+        layover = leg["raw"][_field_slice("record_3", "aircraft_rotation_layover")]
+        key = (
+            leg["airline_designator_"] or leg["airline_designator"],
+            leg["flight_number_"],
+            leg["operational_suffix_"],
+            leg["arrival_station"],
+            arrival_days[i] + _days(layover),
+        )
+        onward.append(index.get(key))
+
+    return legs, onward
+
+
+def rotations(records, season=None, time_format=None):
+    """
+    Chains flight legs into aircraft rotations, see link_legs.
+
+    Parameters
+    ----------.
+    :param records: slots of a SIM read without iata_airport, or flights expanded from them, see link_legs.
+    :param season: indication of season to expand slots with, see expand_slots.
+    :param time_format: None or "minutes", the time format of the flights, see link_legs.
+
+    Returns
+    -------
+    :return rotations: list of lists of flight dicts, the legs an aircraft flies one after the other. Every leg is
+    in exactly one rotation. Rotations are ordered by their first leg, in the order of the legs.
+    """
+
+    legs, onward = link_legs(records, season, time_format)
+
+    has_inbound = [False] * len(legs)
+    for j in onward:
+        if j is not None:
+            has_inbound[j] = True
+
+    chains = []
+    visited = [False] * len(legs)
+    # rotations start at legs without an inbound leg, legs left over fly in closed loops
+    for starts in ((i for i in range(len(legs)) if not has_inbound[i]), range(len(legs))):
+        for i in starts:
+            if visited[i]:
+                continue
+            chain = []
+            while i is not None and not visited[i]:
+                visited[i] = True
+                chain.append(i)
+                i = onward[i]
+            chains.append(chain)
+
+    chains.sort(key=lambda chain: chain[0])
+    return [[legs[i] for i in chain] for chain in chains]
+
+
+def _scheduled_minutes(leg, key, position, time_format=None):
+    """
+    Minutes since the start of the proleptic Gregorian calendar of a scheduled time of a leg. Times read as
+    strings are shifted by the date variation of the departure (position 0) or arrival (position 1), times read
+    as minutes have it applied already and times expanded with time_format "minutes" are counted from the epoch.
+    """
+
+    time = leg[key]
+    if time_format == "minutes":
+        return epoch * 1440 + time
+
+    day = _ordinal(leg["date"])
+    if type(time) is not int:
+        day += _days(leg["raw"][_field_slice("record_3", "date_variation")][position])
+
+    return day * 1440 + _minutes(time)
+
+
+def turnarounds(records, iata_airport, season=None, time_format=None):
+    """
+    Pairs the arrivals at an airport with the onward departures of the same aircraft, see link_legs.
+
+    Parameters
+    ----------.
+    :param records: slots of a SIM read without iata_airport, or flights expanded from them, see link_legs.
+    :param iata_airport: str, three letters, indicating name of airport.
+    :param season: indication of season to expand slots with, see expand_slots.
+    :param time_format: None or "minutes", the time format of the flights, see link_legs.
+
+    Returns
+    -------
+    :return turnarounds: list of dicts with keys arrival and departure (flight dicts of the inbound and onward
+    leg) and ground_time (int, minutes from the scheduled arrival to the scheduled departure of the aircraft), in
+    the order of the arrivals.
+    """
+
+    legs, onward = link_legs(records, season, time_format)
+
+    turnarounds = []
+    for i, j in enumerate(onward):
+        if j is None or legs[i]["arrival_station"] != iata_airport:
+            continue
+        arrival, departure = legs[i], legs[j]
+        turnarounds.append(
+            {
+                "arrival": arrival,
+                "departure": departure,
+                "ground_time": _scheduled_minutes(departure, "scheduled_time_of_aircraft_departure", 0, time_format)
+                - _scheduled_minutes(arrival, "scheduled_time_of_aircraft_arrival", 1, time_format),
+            }
+        )
+
+    return turnarounds
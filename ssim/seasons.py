@@ -0,0 +1,124 @@
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+year_adjustment = {
+    "S": {
+        "JAN": 1,
+        "FEB": 1,
+        "MAR": 0,
+        "APR": 0,
+        "MAY": 0,
+        "JUN": 0,
+        "JUL": 0,
+        "AUG": 0,
+        "SEP": 0,
+        "OCT": 0,
+        "NOV": 0,
+        "DEC": 0,
+    },
+    "W": {
+        "JAN": 1,
+        "FEB": 1,
+        "MAR": 1,
+        "APR": 1,
+        "MAY": 1,
+        "JUN": 1,
+        "JUL": 1,
+        "AUG": 1,
+        "SEP": 1,
+        "OCT": 0,
+        "NOV": 0,
+        "DEC": 0,
+    },
+}
+
+months = ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC")
+
+
+@lru_cache(maxsize=None)
+def season_bounds(season):
+    # type: (str) -> (date, date)
+    """
+    Get first and last day of an IATA season. Computed once per season.
+
+    Parameters
+    ----------.
+    season: string, indicating IATA season  (W17, S23). Note that W17 starts
+    in October 2017
+
+    Returns
+    -------
+    tuple of dates, indicating first and last day of season
+    """
+
+    if season[0] == "W":
+        march_year = 2000 + int(season[1:3]) + 1
+        march_extra_day = 0
+        october_extra_day = 1
+    elif season[0] == "S":
+        march_year = 2000 + int(season[1:3])
+        march_extra_day = 1
+        october_extra_day = 0
+    else:
+        raise ValueError('Season should be like "S17" or "W12" rather than ' + season)
+    october_year = 2000 + int(season[1:3])
+
+    october_day = date(october_year, 10, 29)
+    while october_day.isoweekday() != (6 + october_extra_day):
+        october_day -= timedelta(days=1)
+
+    march_day = date(march_year, 3, 30)
+    while march_day.isoweekday() != (6 + march_extra_day):
+        march_day -= timedelta(days=1)
+
+    if season[0] == "W":
+        return october_day, march_day
+    else:
+        return march_day, october_day
+
+
+@lru_cache(maxsize=4096)
+def parse_date(text, date_format="%d%b%y"):
+    """
+    Parses a date such as a period of operation (DDMONYY). Cached, since a schedule only holds a few hundred
+    distinct dates.
+
+    Parameters
+    ----------.
+    :param text: string, the date.
+    :param date_format: string, format as understood by datetime.strptime.
+    :return date: datetime
+    """
+
+    return datetime.strptime(text, date_format)
+
+
+def format_date(day):
+    """
+    Formats a date as a period of operation (DDMONYY), the way parse_date reads it. Month names are written in
+    English whatever the locale, as schedules are.
+
+    Parameters
+    ----------.
+    :param day: date or datetime.
+    :return text: string, the date.
+    """
+
+    return "%02d%s%02d" % (day.day, months[day.month - 1], day.year % 100)
+
+
+@lru_cache(maxsize=4096)
+def attach_year(day_month, year, season):
+    """
+    Adds the year to a date from a SIR message (DDMON), adjusted for the season: in the Winter 17 season
+    02FEB is 02FEB18.
+
+    Parameters
+    ----------.
+    :param day_month: string, date without year (DDMON).
+    :param year: int, year of the season, e.g. 17.
+    :param season: string, "S" or "W".
+    :return date: string, date with year (DDMONYY).
+    """
+
+    return day_month + str(year + year_adjustment[season][day_month[2:]])
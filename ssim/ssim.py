@@ -4,100 +4,45 @@
 # TODO: fix bad midnight
 # TODO: read_csv
 
+import io
 import logging
+import mmap
 import re
-from datetime import datetime, timedelta, date
-from dateutil.rrule import rrule, WEEKLY
-import sys
+from array import array
+from functools import lru_cache, partial
+from operator import itemgetter
+from datetime import timedelta, date
 import os
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".")))
-from regexes import regexes
-
-logging.basicConfig(format="[%(asctime)s] %(levelname)s: %(message)s", level=logging.DEBUG)
-
-year_adjustment = {
-    "S": {
-        "JAN": 1,
-        "FEB": 1,
-        "MAR": 0,
-        "APR": 0,
-        "MAY": 0,
-        "JUN": 0,
-        "JUL": 0,
-        "AUG": 0,
-        "SEP": 0,
-        "OCT": 0,
-        "NOV": 0,
-        "DEC": 0,
-    },
-    "W": {
-        "JAN": 1,
-        "FEB": 1,
-        "MAR": 1,
-        "APR": 1,
-        "MAY": 1,
-        "JUN": 1,
-        "JUL": 1,
-        "AUG": 1,
-        "SEP": 1,
-        "OCT": 0,
-        "NOV": 0,
-        "DEC": 0,
-    },
-}
+from .regexes import regexes, field_offsets, _LazyMapping
+from .records import sim_slots, sim_as_sir_slots, sir_slots, _overnight
+from .stats import no_stats
+from .seasons import year_adjustment, season_bounds, parse_date, attach_year  # noqa: F401
+
+logger = logging.getLogger(__name__)
 
 infinity_indicators = ["00XXX00"]  # indicates that something should run until start/end of season
+# slotfiles are read as latin-1 whatever the locale: every byte is one character, so text and memory-mapped reads
+# see the same fields at the same offsets, and no file fails to decode
+encoding = "latin-1"
 
 
 def find_season_dates(season):
-    # type: (str) -> (str, str)
+    # type: (str) -> (date, date)
     """
-    Get first and last dat eof Iata Season
+    Get first and last day of Iata Season
 
     Parameters
     ----------.
-    season: string, indicating IATA season  (W17, S23). Note that W17 starts 
-    in October 2016
+    season: string, indicating IATA season  (W17, S23). Note that W17 starts
+    in October 2017
 
     Returns
     -------
     tuple of dates, indicating first and last day of season
     """
 
-    if season[0] == "W":
-        march_year = 2000 + int(season[1:3]) + 1
-        march_extra_day = 0
-        october_extra_day = 1
-    elif season[0] == "S":
-        march_year = 2000 + int(season[1:3])
-        march_extra_day = 1
-        october_extra_day = 0
-    else:
-        raise ValueError('Season should be like "S17" or "W12" rather than ' + season)
-    october_year = 2000 + int(season[1:3])
-
-    october_day = date(october_year, 10, 29)
-    while october_day.isoweekday() != (6 + october_extra_day):
-        october_day -= timedelta(days=1)
-
-    march_day = date(march_year, 3, 30)
-    while march_day.isoweekday() != (6 + march_extra_day):
-        march_day -= timedelta(days=1)
-
-    if season[0] == "W":
-        first_day = october_day
-        last_day = march_day
-    else:
-        first_day = march_day
-        last_day = october_day
-
-    season_dates = []
-    while first_day <= last_day:
-        season_dates.append(first_day)
-        first_day += timedelta(days=1)
-
-    return season_dates[0], season_dates[-1]
+    return season_bounds(season)
 
 
 def _flatten(l):
@@ -119,25 +64,42 @@ def _strip_dict_values(d):
     return d
 
 
-def _expand(record, date_format="%d%b%y", season=None):
+@lru_cache(maxsize=None)
+def _numpy():
+    """Imports numpy on first use, returns None if it is not installed: it is optional, see expand_slots."""
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+
+    return numpy
+
+
+def _operating_schedule(record, date_format="%d%b%y", season=None):
     """
-    Expands records into individual flights.
+    Describes when a record operates.
 
     Parameters
     ----------.
     record: dict, description of a record.
     date_format: string
+    season: string, IATA season, required if the record contains 00XXX00.
 
     Returns
     -------
-    records: list of dicts, representing flights described by the record.
+    first: date or datetime, first day of the period of operation.
+    last: date or datetime, last day of the period of operation.
+    days_of_operation: list of weekdays (0 is Monday). Empty means every day.
+    frequency_rate: int, operates every n-th week.
+    overnight: int, number of days flights are shifted by (1 for overnight flights).
     """
 
     if "days_of_operation" in record and record["days_of_operation"] is not None:
-        days_of_operation = re.sub("\s|0", "", record["days_of_operation"])
+        days_of_operation = re.sub("\\s|0", "", record["days_of_operation"])
         days_of_operation = [int(weekday) - 1 for weekday in days_of_operation]
     else:
-        days_of_operation = range(0, 7)
+        days_of_operation = list(range(0, 7))
 
     if "frequency_rate" in record and record["frequency_rate"] is not None:
         frequency_rate = record["frequency_rate"].strip()
@@ -161,7 +123,7 @@ def _expand(record, date_format="%d%b%y", season=None):
                 + record["raw"]
             )
     else:
-        period_of_operation_from = datetime.strptime(period_of_operation_from, date_format)
+        period_of_operation_from = parse_date(period_of_operation_from, date_format)
 
     period_of_operation_to = record["period_of_operation_to"]
     if period_of_operation_to in infinity_indicators:
@@ -175,110 +137,438 @@ def _expand(record, date_format="%d%b%y", season=None):
                 + record["raw"]
             )
     else:
-        period_of_operation_to = datetime.strptime(period_of_operation_to, date_format)
-
-    dates = rrule(
-        freq=WEEKLY,
-        interval=frequency_rate,
-        dtstart=period_of_operation_from,
-        until=period_of_operation_to,
-        byweekday=days_of_operation,
-    )
+        period_of_operation_to = parse_date(period_of_operation_to, date_format)
 
     # if flight is overnight, add one day
     if "overnight_indicator" in record.keys() and record["overnight_indicator"]:
-        td = timedelta(days=1)
+        overnight = 1
     else:
-        td = timedelta(days=0)
+        overnight = 0
 
-    records = [_merge_two_dicts(record, {"date": (x + td).strftime("%Y-%m-%d")}) for x in dates]
+    return period_of_operation_from, period_of_operation_to, days_of_operation, frequency_rate, overnight
 
-    return records
 
+def _minute_fields(slot):
+    """Keys of the scheduled times of a slot read with time_format="minutes"."""
+    return [key for key in time_fields if type(slot.get(key)) is int]
 
-def _parse_sim(text):
+
+def _flight_minutes(slot, keys, day):
     """
-    Parses a SIM message and returns it as a list of dicts describing flight leg records.
+    Scheduled times of the flight of a slot dated on a day (counted from the epoch), as minutes since the epoch.
+    Times of slots count from the day of operation, the day before the date of overnight flights.
+    """
+
+    if slot.get("overnight_indicator"):
+        day -= 1
+    return {key: day * 1440 + slot[key] for key in keys}
+
+
+def _expand(record, date_format="%d%b%y", season=None, time_format=None):
+    """
+    Expands records into individual flights.
 
     Parameters
     ----------.
-    :type text: string
+    record: dict, description of a record.
+    date_format: string
+    time_format: "minutes" to give scheduled times as minutes since the epoch, see expand_slots.
 
     Returns
     -------
-    text: list of dicts, describing rows of a slotfile.
-    header: dict, describing the header of the slotfile.
-    footer: dict, describing the footer of the slotfile.
+    records: list of dicts, representing flights described by the record.
     """
 
-    # record_1 = regexes['sim']['record_1'].search(text).groupdict()
-    record_2 = regexes["sim"]["record_2"].search(text).groupdict()
-    record_3 = regexes["sim"]["record_3"].finditer(text)
-    # record_4 = regexes['sim']['record_4'].finditer(text)
-    # record_5 = regexes['sim']['record_5'].search(text).groupdict()
+    from dateutil.rrule import rrule, WEEKLY
 
-    flight_leg_records = list(map(lambda x: x.groupdict(), record_3))
-    flight_leg_records = [_strip_dict_values(x) for x in flight_leg_records]
+    first, last, days_of_operation, frequency_rate, overnight = _operating_schedule(record, date_format, season)
 
-    if record_2["time_mode"] == "U":
-        [
-            x.update({"scheduled_time_of_aircraft_arrival": x["scheduled_time_of_aircraft_arrival"] + "+0000"})
-            for x in flight_leg_records
-        ]
-        [
-            x.update({"scheduled_time_of_passenger_arrival": x["scheduled_time_of_passenger_arrival"] + "+0000"})
-            for x in flight_leg_records
-        ]
-        [
-            x.update({"scheduled_time_of_aircraft_departure": x["scheduled_time_of_aircraft_departure"] + "+0000"})
-            for x in flight_leg_records
-        ]
-        [
-            x.update({"scheduled_time_of_passenger_departure": x["scheduled_time_of_passenger_departure"] + "+0000"})
-            for x in flight_leg_records
-        ]
+    dates = rrule(freq=WEEKLY, interval=frequency_rate, dtstart=first, until=last, byweekday=days_of_operation)
 
-    elif record_2["time_mode"] == "L":
-        [
-            x.update(
-                {
-                    "scheduled_time_of_aircraft_arrival": x["scheduled_time_of_aircraft_arrival"]
-                    + x["utc_local_time_variation_arrival"]
-                }
-            )
-            for x in flight_leg_records
-        ]
-        [
-            x.update(
-                {
-                    "scheduled_time_of_passenger_arrival": x["scheduled_time_of_passenger_arrival"]
-                    + x["utc_local_time_variation_arrival"]
-                }
-            )
-            for x in flight_leg_records
-        ]
-        [
-            x.update(
-                {
-                    "scheduled_time_of_aircraft_departure": x["scheduled_time_of_aircraft_departure"]
-                    + x["utc_local_time_variation_departure"]
-                }
-            )
-            for x in flight_leg_records
-        ]
-        [
-            x.update(
-                {
-                    "scheduled_time_of_passenger_departure": x["scheduled_time_of_passenger_departure"]
-                    + x["utc_local_time_variation_departure"]
-                }
+    td = timedelta(days=overnight)
+
+    if time_format == "minutes":
+        keys = _minute_fields(record)
+        epoch = date(1970, 1, 1).toordinal()
+        return [
+            _merge_two_dicts(
+                record,
+                dict(_flight_minutes(record, keys, (x + td).toordinal() - epoch), date=(x + td).strftime("%Y-%m-%d")),
             )
-            for x in flight_leg_records
+            for x in dates
         ]
 
-    # segment_data_records = list(map(lambda x: x.groupdict(), record_4))
+    records = [_merge_two_dicts(record, {"date": (x + td).strftime("%Y-%m-%d")}) for x in dates]
 
-    return flight_leg_records
+    return records
+
+
+def _expand_numpy(records, date_format="%d%b%y", season=None, chunk_size=4096):
+    """
+    Expands records into the days their flights operate on, all records at once.
+
+    Gives the same dates as _expand: days are generated for the whole period of every record, then filtered on
+    the weekday mask and on the week stride given by the frequency rate, counted from the week (starting on
+    Monday) of the first day of the period.
+
+    Parameters
+    ----------.
+    records: list of dicts, descriptions of records.
+    date_format: string
+    chunk_size: int, number of records processed together, bounds the size of intermediate arrays.
+
+    Returns
+    -------
+    slot_index: numpy array, index of the record of each flight.
+    dates: numpy datetime64[D] array, date of each flight.
+    """
+
+    np = _numpy()
+    epoch = date(1970, 1, 1).toordinal()
+    slot_indexes = [np.zeros(0, dtype=np.int64)]
+    dates = [np.zeros(0, dtype=np.int64)]
+
+    for offset in range(0, len(records), chunk_size):
+        chunk = records[offset:][:chunk_size]
+        schedules = [_operating_schedule(record, date_format, season) for record in chunk]
+
+        first = np.array([schedule[0].toordinal() for schedule in schedules], dtype=np.int64)
+        last = np.array([schedule[1].toordinal() for schedule in schedules], dtype=np.int64)
+        weekday_mask = np.array([sum(1 << day for day in set(schedule[2])) or 127 for schedule in schedules])
+        frequency_rate = np.array([schedule[3] for schedule in schedules], dtype=np.int64)
+        overnight = np.array([schedule[4] for schedule in schedules], dtype=np.int64)
+
+        # every day of every period, as ordinals (1 is Monday 0001-01-01)
+        lengths = np.maximum(last - first + 1, 0)
+        slot_index = np.repeat(np.arange(len(schedules)), lengths)
+        day = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths) + first[slot_index]
+
+        weekday = (day - 1) % 7
+        first_monday = first - (first - 1) % 7
+        week = (day - first_monday[slot_index]) // 7
+        operates = ((weekday_mask[slot_index] >> weekday) & 1).astype(bool) & (week % frequency_rate[slot_index] == 0)
+
+        slot_index = slot_index[operates]
+        slot_indexes.append(slot_index + offset)
+        dates.append(day[operates] + overnight[slot_index] - epoch)
+
+    return np.concatenate(slot_indexes), np.concatenate(dates).astype("datetime64[D]")
+
+
+# scheduled times of flight leg records, and the UTC offset and date variation (position in the field) they are in
+sim_scheduled_times = (
+    ("scheduled_time_of_aircraft_arrival", "utc_local_time_variation_arrival", 1),
+    ("scheduled_time_of_passenger_arrival", "utc_local_time_variation_arrival", 1),
+    ("scheduled_time_of_aircraft_departure", "utc_local_time_variation_departure", 0),
+    ("scheduled_time_of_passenger_departure", "utc_local_time_variation_departure", 0),
+)
+
+# scheduled times of slots and flights, as minutes in time_format="minutes"
+time_fields = (
+    "scheduled_time_of_aircraft_arrival",
+    "scheduled_time_of_passenger_arrival",
+    "scheduled_time_of_aircraft_departure",
+    "scheduled_time_of_passenger_departure",
+    "scheduled_time",
+)
+
+time_formats = (None, "minutes")
+
+
+def _check_time_format(time_format):
+    if time_format not in time_formats:
+        raise ValueError('time_format should be None or "minutes" rather than %r' % (time_format,))
+
+
+@lru_cache(maxsize=None)
+def _field_slice(record, name):
+    """Slice of a field in a fixed width SIM record, see regexes.field_offsets."""
+
+    for field, start, end in field_offsets["sim"][record]:
+        if field == name:
+            return slice(start, end)
+
+
+def _format_record(record, values, serial_number):
+    """
+    Lays out a fixed width SIM record from field values, see regexes.field_offsets. Fields without a value are
+    blank, flight numbers are right aligned.
+    """
+
+    line = [" "] * 200
+    for name, start, end in field_offsets["sim"][record]:
+        value = values.get(name, "")
+        if name == "record_serial_number":
+            value = "%06i" % serial_number
+        if name == "flight_number":
+            value = value.rjust(end - start)
+        line[start:end] = value.ljust(end - start)[: end - start]
+
+    return "".join(line)
+
+
+def _as_minutes(record, time_mode):
+    """
+    Replaces the scheduled times of a flight leg record by minutes in UTC since the start of its day of operation,
+    applying the UTC offset and date variation of the departure or arrival. Times of records read before any
+    record type 2 are taken to be local.
+
+    Parameters
+    ----------.
+    :param record: dict, flight leg record, modified in place.
+    :param time_mode: str, "U" for UTC or "L" for local time, as found in record type 2.
+    :return record: dict, the same flight leg record.
+    """
+
+    # the date variation of departure and arrival are one character each, blank for the same day
+    date_variation = record["raw"][_field_slice("record_3", "date_variation")]
+
+    for key, variation_key, position in sim_scheduled_times:
+        time = record[key]
+        if time is None:
+            continue
+        minutes = int(time[:2]) * 60 + int(time[2:4])
+
+        variation = None if time_mode == "U" else record[variation_key]
+        if variation:
+            offset = int(variation[1:3]) * 60 + int(variation[3:5])
+            minutes += offset if variation[0] == "-" else -offset
+
+        days = date_variation[position].strip()
+        if days:
+            minutes += -1440 if days == "A" else 1440 * int(days)
+
+        record[key] = minutes
+
+    return record
+
+
+def _apply_time_mode(record, time_mode, time_format=None):
+    """
+    Appends the UTC offset implied by the time mode of record type 2 to the scheduled times of a flight leg record.
+
+    Parameters
+    ----------.
+    :param record: dict, flight leg record, modified in place.
+    :param time_mode: str, "U" for UTC or "L" for local time, as found in record type 2.
+    :param time_format: "minutes" to give times as int minutes rather than strings, see _as_minutes.
+    :return record: dict, the same flight leg record.
+    """
+
+    if time_format == "minutes":
+        return _as_minutes(record, time_mode)
+
+    if time_mode == "U":
+        arrival_variation = departure_variation = "+0000"
+    elif time_mode == "L":
+        arrival_variation = record["utc_local_time_variation_arrival"]
+        departure_variation = record["utc_local_time_variation_departure"]
+    else:
+        return record
+
+    for key, variation in (
+        ("scheduled_time_of_aircraft_arrival", arrival_variation),
+        ("scheduled_time_of_passenger_arrival", arrival_variation),
+        ("scheduled_time_of_aircraft_departure", departure_variation),
+        ("scheduled_time_of_passenger_departure", departure_variation),
+    ):
+        if record[key] is not None and variation is not None:
+            record[key] = record[key] + variation
+
+    return record
+
+
+def _fixed_width_parser(offsets):
+    """
+    Builds a parser for a fixed width record out of a table of field offsets.
+
+    The returned function slices all fields out of a line in a single step and strips them, mapping empty
+    fields to None. It returns the same dict as matching the corresponding regex and stripping its groups,
+    or None if the line is too short to hold the record.
+
+    Parameters
+    ----------.
+    :param offsets: list of (name, start, end) tuples, see regexes.field_offsets.
+    :return parse: function taking a line and returning a dict.
+    """
+
+    length = offsets[-1][2]
+    names = ("raw",) + tuple(name for name, start, end in offsets)
+    slice_fields = itemgetter(slice(0, length), *[slice(start, end) for name, start, end in offsets])
+
+    def parse(line):
+        if len(line) < length or line.find("\n", 0, length) != -1:
+            return None
+        return dict(zip(names, [value.strip() or None for value in slice_fields(line)]))
+
+    return parse
+
+
+def _regex_parser(regex):
+    """
+    Builds a parser for a fixed width record out of a compiled regex. Kept as a reference for the fixed width
+    parsers.
+
+    Parameters
+    ----------.
+    :param regex: compiled regex, see regexes.regexes.
+    :return parse: function taking a line and returning a dict.
+    """
+
+    def parse(line):
+        match = regex.match(line)
+        if match is None:
+            return None
+        return _strip_dict_values(match.groupdict())
+
+    return parse
+
+
+# parsers by record type, built on first use
+sim_fixed_width_parsers = _LazyMapping(
+    lambda record_type: _fixed_width_parser(field_offsets["sim"]["record_" + record_type]), "12345"
+)
+sim_regex_parsers = _LazyMapping(lambda record_type: _regex_parser(regexes["sim"]["record_" + record_type]), "12345")
+
+
+def _fixed_width_bytes_parser(offsets, encoding=encoding):
+    """
+    Builds a parser for a fixed width record held in a bytes buffer, such as a memory-mapped file. Like
+    _fixed_width_parser, but only the bytes of the record are copied out of the buffer and fields are decoded
+    one by one, after stripping.
+
+    Parameters
+    ----------.
+    :param offsets: list of (name, start, end) tuples, see regexes.field_offsets.
+    :param encoding: str, encoding of the buffer. Offsets are in bytes.
+    :return parse: function taking a buffer and the start and end of a line in it, and returning a dict.
+    """
+
+    length = offsets[-1][2]
+    names = ("raw",) + tuple(name for name, start, end in offsets)
+    slice_fields = itemgetter(slice(0, length), *[slice(start, end) for name, start, end in offsets])
+
+    def parse(buffer, start, end):
+        if end - start < length:
+            return None
+        stop = start + length
+        return dict(zip(names, [value.strip().decode(encoding) or None for value in slice_fields(buffer[start:stop])]))
+
+    return parse
+
+
+sim_bytes_parsers = _LazyMapping(
+    lambda record_type: _fixed_width_bytes_parser(field_offsets["sim"]["record_" + record_type]), "12345"
+)
+
+
+def _iter_parse_sim_buffer(buffer, start=0, end=None, time_mode=None, stats=no_stats, time_format=None):
+    """
+    Parses the lines of a SIM message held in a bytes buffer, such as a memory-mapped file, one at a time.
+
+    Lines are found and their record type checked on the buffer, only flight leg records and record type 2 are
+    copied out of it and decoded.
+
+    Parameters
+    ----------.
+    :param buffer: bytes-like object supporting find and slicing, e.g. mmap.
+    :param start: int, position of the first line to parse.
+    :param end: int, position after the last line to parse, defaults to the end of the buffer.
+    :param time_mode: str, time mode in effect before the first record type 2, when lines start mid-file.
+    :param stats: Stats, records parsing and counts skipped and unmatched lines, see ssim.stats.
+    :param time_format: "minutes" to give scheduled times as int minutes, see _as_minutes.
+
+    Returns
+    -------
+    flight_leg_records: generator of dicts describing flight leg records.
+    """
+
+    parse_record_2 = stats.timed("regex_matching", sim_bytes_parsers["2"])
+    parse_record_3 = stats.timed("regex_matching", sim_bytes_parsers["3"])
+    end = len(buffer) if end is None else end
+
+    position = start
+    while position < end:
+        line_end = buffer.find(b"\n", position, end)
+        if line_end == -1:
+            line_end = end
+
+        record_type = buffer[position]
+        if record_type == 51:  # b"3"
+            flight_leg_record = parse_record_3(buffer, position, line_end)
+            if flight_leg_record:
+                yield _apply_time_mode(flight_leg_record, time_mode, time_format)
+            else:
+                stats.count("unmatched_lines")
+        elif record_type == 50:  # b"2"
+            record_2 = parse_record_2(buffer, position, line_end)
+            if record_2:
+                time_mode = record_2["time_mode"]
+            else:
+                stats.count("unmatched_lines")
+        else:
+            stats.count("skipped_lines")
+
+        position = line_end + 1
+
+
+def _iter_parse_sim(lines, fixed_width=True, time_mode=None, stats=no_stats, time_format=None):
+    """
+    Parses the lines of a SIM message one at a time.
+
+    Every record type 2 sets the time mode for the flight leg records that follow it, so files holding
+    several airlines are handled as well.
+
+    Parameters
+    ----------.
+    :param lines: iterable of strings, lines of a SIM message.
+    :param fixed_width: bool, slice records using field offsets rather than matching them with regexes.
+    :param time_mode: str, time mode in effect before the first record type 2, when lines start mid-file.
+    :param stats: Stats, records parsing and counts skipped and unmatched lines, see ssim.stats.
+    :param time_format: "minutes" to give scheduled times as int minutes, see _as_minutes.
+
+    Returns
+    -------
+    flight_leg_records: generator of dicts describing flight leg records.
+    """
+
+    parsers = sim_fixed_width_parsers if fixed_width else sim_regex_parsers
+    parse_record_2 = stats.timed("regex_matching", parsers["2"])
+    parse_record_3 = stats.timed("regex_matching", parsers["3"])
+
+    for line in lines:
+        record_type = line[:1]
+        if record_type == "3":
+            flight_leg_record = parse_record_3(line)
+            if flight_leg_record:
+                yield _apply_time_mode(flight_leg_record, time_mode, time_format)
+            else:
+                stats.count("unmatched_lines")
+        elif record_type == "2":
+            record_2 = parse_record_2(line)
+            if record_2:
+                time_mode = record_2["time_mode"]
+            else:
+                stats.count("unmatched_lines")
+        else:
+            stats.count("skipped_lines")
+
+
+def _parse_sim(text, fixed_width=False):
+    """
+    Parses a SIM message and returns it as a list of dicts describing flight leg records.
+
+    Parameters
+    ----------.
+    :type text: string
+    :param fixed_width: bool, slice records using field offsets rather than matching them with regexes.
+
+    Returns
+    -------
+    flight_leg_records: list of dicts describing flight leg records.
+    """
+
+    return list(_iter_parse_sim(text.split("\n"), fixed_width=fixed_width))
 
 
 def _attach_year_sir(record, year, season, from_key="period_of_operation_from", to_key="period_of_operation_to"):
@@ -300,50 +590,91 @@ def _attach_year_sir(record, year, season, from_key="period_of_operation_from",
     if record[to_key] is None:
         record[to_key] = record[from_key]
 
-    from_month = record[from_key][2:]
-    to_month = record[to_key][2:]
-    record[from_key] = record[from_key] + str(year + year_adjustment[season][from_month])
-    record[to_key] = record[to_key] + str(year + year_adjustment[season][to_month])
+    record[from_key] = attach_year(record[from_key], year, season)
+    record[to_key] = attach_year(record[to_key], year, season)
 
     return record
 
 
-def _parse_sir(text):
+def _sir_line_type(text, start):
+    """
+    Tells from its first characters whether a line of a SIR message describes an arrival, a departure or both.
+
+    A departure has a space after the action code, an arrival a date after its flight designator and a
+    turnaround a second flight designator.
+
+    Parameters
+    ----------.
+    :param text: string, SIR message.
+    :param start: int, position of the first character of the line.
+    :return line_type: string, "arr", "dep" or "arrdep".
+    """
+
+    if text.startswith(" ", start + 1):
+        # departure, unless the flight designator is missing and a date follows the action code
+        return "arr" if _starts_with_digits(text, start + 2) else "dep"
+
+    return "arr" if _starts_with_digits(text, text.find(" ", start) + 1) else "arrdep"
+
+
+def _starts_with_digits(text, start):
+    end = start + 2
+    return text[start:end].isdigit()
+
+
+def _parse_sir(text, stats=no_stats):
     """
     Parses a SIR message and returns it as a list of dicts describing flight leg records.
 
+    The message is walked line by line once, each line is only matched against the pattern its first
+    characters point to.
+
     Parameters
     ----------.
     :type text: string
+    :param stats: Stats, counts skipped and unmatched lines, see ssim.stats.
 
     Returns
     -------
-    flight_leg_records: list of dicts describing flight leg records.
+    flight_leg_records: list of dicts describing flight leg records, in order of the message.
     """
 
-    arr = regexes["sir"]["arr"].finditer(text)
-    dep = regexes["sir"]["dep"].finditer(text)
-    arrdep = regexes["sir"]["arrdep"].finditer(text)
-
-    header = regexes["sir"]["header"].search(text).groupdict()
+    header_match = regexes["sir"]["header"].search(text)
+    header = header_match.groupdict()
     season = header["season"][0]
     year = int(header["season"][1:])
 
-    flight_leg_records = list(arr) + list(dep) + list(arrdep)
-    flight_leg_records = list(map(lambda x: x.groupdict(), flight_leg_records))
+    patterns = {line_type: regexes["sir"][line_type] for line_type in ("arr", "dep", "arrdep")}
+    flight_leg_records = []
+
+    # position of the newline preceding each line, patterns start with it
+    position = header_match.end() - 1
+    while position != -1:
+        match = None
+        if position + 1 < len(text) and text[position + 1].isupper():
+            match = patterns[_sir_line_type(text, position + 1)].match(text, position)
+            if match is None:
+                stats.count("unmatched_lines")
+        else:
+            stats.count("skipped_lines")
 
-    flight_leg_records = [_attach_year_sir(x, year, season) for x in flight_leg_records]
+        if match:
+            flight_leg_records.append(_attach_year_sir(match.groupdict(), year, season))
+            position = text.find("\n", match.end())
+        else:
+            position = text.find("\n", position + 1)
 
     return flight_leg_records
 
 
-def _uniformize_sim_as_sir(slot, iata_airport):
-    # type: (dict, str) -> list
+def _uniformize_sim_as_sir(slot, seats=None, iata_airport=None):
+    # type: (dict, dict, str) -> list
     """
     Processes a SIM from the perspective of an airport.
 
     Parameters
     ----------.
+    :param seats: dict, exploded aircraft configuration string of the slot, exploded here if not given.
     :param iata_airport: str, three letters, indicating name of airport.
     :return row: dict, describing aircraft configuration.
     """
@@ -352,14 +683,10 @@ def _uniformize_sim_as_sir(slot, iata_airport):
     assert iata_airport.upper() == iata_airport, "iata_airport is all capital letters: %r" % iata_airport
     uniform_slots = []
 
-    # it's very hard to see if a flight is overnight. In case time of dep is
-    # higher than time of arr, it is likely to arrive overnight
-    overnight_indicator_arrival = False
-    if slot["arrival_station"] and slot["departure_station"]:
-        if slot["scheduled_time_of_aircraft_arrival"] < slot["scheduled_time_of_aircraft_departure"]:
-            overnight_indicator_arrival = True
+    overnight_indicator_arrival = _overnight(slot["raw"])
 
-    seats = _explode_aircraft_configuration_string(slot["aircraft_configuration_version"], slot["raw"])
+    if seats is None:
+        seats = _explode_aircraft_configuration_string(slot["aircraft_configuration_version"], slot["raw"])
     if slot["arrival_station"] == iata_airport:
         uniform_slots.append(
             {
@@ -463,7 +790,7 @@ def _uniformize_sir(slot):
     return uniform_slots
 
 
-def _uniformize_sim(s):
+def _uniformize_sim(s, seats=None):
     uniform_slots = []
 
     if s["scheduled_time_of_aircraft_departure"]:
@@ -578,169 +905,572 @@ def _uniformize_sim(s):
             }
         )
 
+    if seats is None:
+        seats = _explode_aircraft_configuration_string(s["aircraft_configuration_version"], s["raw"])
     for i in range(0, len(uniform_slots)):
-        seats = _explode_aircraft_configuration_string(uniform_slots[i]["aircraft_configuration_version"], s["raw"])
         # uniform_slots[i] = {**seats,**uniform_slots[i]}
         uniform_slots[i] = _merge_two_dicts(seats, uniform_slots[i])
 
     return uniform_slots
 
 
-def read(file, iata_airport=None):
+def _iter_uniformize_sim(flight_leg_records, iata_airport=None, compact=False, stats=no_stats):
+    """
+    Uniformizes flight leg records of a SIM, from the perspective of an airport if one is given.
+
+    Parameters
+    ----------.
+    :param flight_leg_records: iterable of dicts describing flight leg records.
+    :param iata_airport: str, three letters, indicating name of airport.
+    :param compact: bool, return compact slots sharing their flight leg record, see ssim.records.
+    :param stats: Stats, records uniformization and explosion of aircraft configuration strings, see ssim.stats.
+    :return slots: generator of slot dicts.
+    """
+
+    explode = stats.timed(
+        "acv_explosion", _aircraft_configuration_items if compact else _explode_aircraft_configuration_string
+    )
+    if compact:
+        uniformize = sim_as_sir_slots if iata_airport else sim_slots
+    else:
+        uniformize = _uniformize_sim_as_sir if iata_airport else _uniformize_sim
+    uniformize = stats.timed("uniformization", uniformize)
+
+    for flight_leg_record in flight_leg_records:
+        acv = explode(flight_leg_record["aircraft_configuration_version"], flight_leg_record["raw"])
+        if iata_airport:
+            slots = uniformize(flight_leg_record, acv, iata_airport)
+        else:
+            slots = uniformize(flight_leg_record, acv)
+
+        for slot in slots:
+            yield slot
+
+
+def _bytes_regex(regex):
+    return re.compile(regex.pattern.encode("ascii"), regex.flags & ~re.UNICODE)
+
+
+file_type_regexes = _LazyMapping(
+    lambda file_type: _bytes_regex(regexes[file_type]["record_1" if file_type == "sim" else "header"]), ("sim", "sir")
+)
+
+
+# magic bytes of compressed files, read is given the decompressed contents
+compression_magic = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "xz": b"\xfd7zXZ\x00",
+    "zip": b"PK\x03\x04",
+}
+
+
+def _detect_compression(file):
+    """
+    Detects whether a file is compressed, from its magic bytes.
+
+    Parameters
+    ----------.
+    :param file: path to a file.
+    :return compression: "gzip", "bz2", "xz", "zip" or None.
+    """
+
+    with open(file, "rb") as f:
+        head = f.read(6)
+
+    for compression, magic in compression_magic.items():
+        if head.startswith(magic):
+            return compression
+
+    return None
+
+
+def _iter_decompressed(file, compression):
+    """
+    Opens the decompressed contents of a file as text, streaming rather than decompressing it up front. Every
+    file in a zip archive is a member of its own.
+
+    Parameters
+    ----------.
+    :param file: path to a compressed file.
+    :param compression: str, as returned by _detect_compression.
+    :return members: generator of (name, text file) tuples, one per member.
+    """
+
+    if compression == "zip":
+        import zipfile
+
+        with zipfile.ZipFile(file) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    with io.TextIOWrapper(archive.open(info), encoding=encoding) as f:
+                        yield "%s:%s" % (file, info.filename), f
+        return
+
+    if compression == "gzip":
+        import gzip as module
+    elif compression == "bz2":
+        import bz2 as module
+    else:
+        import lzma as module
+
+    with module.open(file, "rt", encoding=encoding) as f:
+        yield file, f
+
+
+def _detect_file_type(head):
+    """
+    Detects the type of a slotfile from its first bytes: a SIM starts with record type 1, a SIR with its header.
+
+    Parameters
+    ----------.
+    :param head: bytes, start of the file, a few lines are enough.
+    :return file_type: "sim", "sir" or None.
+    """
+
+    for file_type, regex in file_type_regexes.items():
+        if regex.match(head):
+            return file_type
+
+    return None
+
+
+def _iter_read_sir(text, compact=False, stats=no_stats, time_format=None):
+    with stats.stage("regex_matching") as timer:
+        flight_leg_records = _parse_sir(text, stats)
+        timer.nbytes = len(text)
+
+    uniformize = stats.timed("uniformization", sir_slots if compact else _uniformize_sir)
+    for flight_leg_record in flight_leg_records:
+        if time_format == "minutes":
+            # times of SIR messages are in UTC already
+            for key in ("scheduled_time_of_arrival_utc", "scheduled_time_of_departure_utc"):
+                time = flight_leg_record.get(key)
+                if time:
+                    flight_leg_record[key] = int(time[:2]) * 60 + int(time[2:4])
+        for slot in uniformize(flight_leg_record):
+            yield slot
+
+
+def _iter_read_mmap(file, iata_airport=None, compact=False, stats=no_stats, time_format=None):
+    """
+    Memory-mapped counterpart of iter_read, see there. Reading the file is recorded as mapping it, pages are read
+    while parsing.
+    """
+
+    if os.path.getsize(file) == 0:
+        # an empty file cannot be mapped, it is read as a stream like any other
+        with open(file, "r", encoding=encoding) as f:
+            for slot in _iter_read_text(f, file, iata_airport, compact, stats, time_format):
+                yield slot
+        return
+
+    with open(file, "rb") as f:
+        with stats.stage("file_read") as timer:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            timer.nbytes = len(buffer)
+
+        with buffer:
+            with stats.stage("type_detection"):
+                file_type = _detect_file_type(buffer[:4096])
+
+            if file_type == "sim":
+                logger.info("Reading and parsing SIM file: %s." % file)
+                flight_leg_records = _iter_parse_sim_buffer(buffer, stats=stats, time_format=time_format)
+                for slot in _iter_uniformize_sim(flight_leg_records, iata_airport, compact, stats):
+                    yield slot
+                return
+
+            if file_type == "sir":
+                # SIR messages are small and matched as a whole, decoded as when reading in text mode
+                text = io.TextIOWrapper(io.BytesIO(buffer[:]), encoding=encoding).read()
+
+    if file_type == "sir":
+        logger.info("Reading and parsing SIR file: %s." % file)
+        for slot in _iter_read_sir(text, compact, stats, time_format):
+            yield slot
+
+
+def _iter_read_text(f, file, iata_airport=None, compact=False, stats=no_stats, time_format=None):
+    """
+    Reads a slotfile opened as text, see iter_read.
+
+    Parameters
+    ----------.
+    :param f: text file, at its start.
+    :param file: str, name of the file to log.
+    :return slots: generator of slot dicts.
+    """
+
+    lines = stats.timed_lines("file_read", f)
+    first_line = next(lines, "")
+
+    with stats.stage("type_detection"):
+        is_sim = regexes["sim"]["record_1"].match(first_line)
+
+    if is_sim:
+        logger.info("Reading and parsing SIM file: %s." % file)
+        flight_leg_records = _iter_parse_sim(lines, stats=stats, time_format=time_format)
+        for slot in _iter_uniformize_sim(flight_leg_records, iata_airport, compact, stats):
+            yield slot
+        return
+
+    with stats.stage("file_read") as timer:
+        text = first_line + f.read()
+        timer.nbytes = len(text) - len(first_line)
+
+    with stats.stage("type_detection"):
+        is_sir = regexes["sir"]["header"].match(text)
+
+    if is_sir:
+        logger.info("Reading and parsing SIR file: %s." % file)
+        for slot in _iter_read_sir(text, compact, stats, time_format):
+            yield slot
+
+
+def iter_read(file, iata_airport=None, compact=False, use_mmap=False, stats=None, time_format=None):
+    """
+    Reads, detects filetype, parses and processes a valid flight records file one slot at a time.
+
+    SIM files are read line by line, so memory use does not grow with the size of the file. Files compressed with
+    gzip, bz2, xz or zip are detected by their magic bytes and decompressed while they are read. Every file in a
+    zip archive is read as a slotfile of its own, their slots follow each other. To keep the slots of every member
+    apart, and read the others when one fails, see read_archive.
+
+    Parameters
+    ----------.
+    file : path to a slotfile, possibly compressed.
+    airport_iata: 3 letter capital string indicating iata airport. If passed
+    along with SIM file, it will return data from perspective of airport (as
+    SIR)
+    compact: bool, if True, slots are compact read-only mappings sharing
+    their flight leg record (see ssim.records) rather than dicts.
+    use_mmap: bool, if True, the file is memory-mapped and SIM records are
+    parsed on its bytes, decoding only the flight leg records. Files are
+    decoded as latin-1 either way, whatever the locale.
+    Compressed files are read line by line regardless.
+    stats: Stats, if given, time spent per stage and counts of skipped and
+    unmatched lines are added to it, see ssim.stats.
+    time_format: None to give scheduled times as read, "minutes" to give
+    them as int minutes in UTC since the start of the day of operation of
+    the slot, e.g. 1500 for 0100 local time at +0100 the next day. UTC
+    offsets and date variations of SIM records are applied as they are
+    parsed. expand_slots turns these into minutes since the epoch.
+
+    Returns
+    -------
+    slots: generator of dicts, describing exact slots of a slotfile.
+    """
+
+    _check_time_format(time_format)
+    stats = no_stats if stats is None else stats
+
+    compression = _detect_compression(file)
+    if compression is not None:
+        for name, f in _iter_decompressed(file, compression):
+            for slot in _iter_read_text(f, name, iata_airport, compact, stats, time_format):
+                yield slot
+        return
+
+    if use_mmap:
+        for slot in _iter_read_mmap(file, iata_airport, compact, stats, time_format):
+            yield slot
+        return
+
+    with open(file, "r", encoding=encoding) as f:
+        for slot in _iter_read_text(f, file, iata_airport, compact, stats, time_format):
+            yield slot
+
+
+def read(
+    file,
+    iata_airport=None,
+    workers=None,
+    compact=False,
+    cache_dir=None,
+    cache_size=2**30,
+    use_mmap=False,
+    stats=None,
+    time_format=None,
+):
     """
     Reads, detects filetype, parses and processes a valid flight records file.
 
     Parameters
     ----------.
-    file : path to a slotfile.
+    file : path to a slotfile, possibly compressed with gzip, bz2, xz or zip,
+    see iter_read.
     airport_iata: 3 letter capital string indicating iata airport. If passed
-    along with SIM file, it will return data from perspective of airport (as 
+    along with SIM file, it will return data from perspective of airport (as
     SIR)
+    workers: int, if more than 1, a SIM file is split into chunks of whole
+    records that are parsed in as many worker processes. Compressed files
+    are read in the current process.
+    compact: bool, if True, slots are compact read-only mappings sharing
+    their flight leg record (see ssim.records) rather than dicts.
+    cache_dir: path to a directory to cache slots in. Slots of a file read
+    before, with the same contents, options and library version, are loaded
+    from the cache rather than parsed again. Entries are plain data (marshal),
+    see ssim.cache.
+    cache_size: int, size of the cache in bytes. Least recently used entries
+    are removed beyond it.
+    use_mmap: bool, if True, the file is memory-mapped and SIM records are
+    parsed on its bytes, see iter_read.
+    stats: Stats, if given, time spent per stage and counts of skipped and
+    unmatched lines are added to it, see ssim.stats. Files loaded from the
+    cache or parsed by worker processes are not recorded.
+    time_format: None to give scheduled times as read, "minutes" to give
+    them as int minutes in UTC, see iter_read.
 
     Returns
     -------
     slots: list of dicts, describing exact slots of a slotfile.
-    header: dict, describing the header of the slotfile.
-    footer: dict, describing the footer of the slotfile.
     """
 
-    with open(file, "r") as f:
-        text = f.read()
+    _check_time_format(time_format)
 
-    slots = []
+    if cache_dir is not None:
+        from .cache import cached_read
 
-    if regexes["sir"]["header"].match(text):
-        logging.info("Reading and parsing SIR file: %s." % file)
-        slots = _parse_sir(text)
-        slots = _flatten([_uniformize_sir(x) for x in slots])
+        return cached_read(
+            partial(read, workers=workers, stats=stats),
+            file,
+            cache_dir,
+            cache_size,
+            iata_airport=iata_airport,
+            compact=compact,
+            use_mmap=use_mmap,
+            time_format=time_format,
+        )
 
-    elif regexes["sim"]["record_1"].match(text):
-        if iata_airport:
-            logging.info("Reading and parsing SIM file: %s." % file)
-            slots = _parse_sim(text)
-            slots = _flatten([_uniformize_sim_as_sir(x, iata_airport) for x in slots])
+    # compressed files cannot be split into chunks, they are read in the current process
+    if workers is not None and workers > 1 and _detect_compression(file) is None:
+        from .parallel import read_sim_chunked
 
-        else:
-            logging.info("Reading and parsing SIM file: %s." % file)
-            slots = _parse_sim(text)
-            slots = _flatten([_uniformize_sim(x) for x in slots])
+        slots = read_sim_chunked(
+            file, workers, iata_airport=iata_airport, compact=compact, use_mmap=use_mmap, time_format=time_format
+        )
+        if slots is not None:
+            return slots
 
-    return slots
+    return list(
+        iter_read(
+            file, iata_airport=iata_airport, compact=compact, use_mmap=use_mmap, stats=stats, time_format=time_format
+        )
+    )
 
 
-def expand_slots(slots, season=None):
+def expand_slots(slots, season=None, engine=None, columnar=False, stats=None, time_format=None):
     """
     Expands a list of slots into flights.
 
     Parameters
     ----------.
     :param slots: list, a list of slot dicts.
-    :param season: indication of season to import. SSIM files can contain 
+    :param season: indication of season to import. SSIM files can contain
     00XXX00 as date indicators, which means from beginning/until end of season.
     Argument is required and only used when file contains 00XXX00.
+    :param engine: "numpy" to expand all slots at once using numpy, "rrule" to
+    expand slot by slot using dateutil. Defaults to numpy if it is installed.
+    :param columnar: if True, return a FlightTable holding the slots and the
+    slot index and date of every flight, rather than a dict per flight.
+    :param stats: Stats, if given, time spent expanding and the number of
+    flights are added to it, see ssim.stats.
+    :param time_format: "minutes" to give scheduled times of slots read with
+    time_format="minutes" as int minutes in UTC since the epoch (1970-01-01),
+    so flights can be sorted and compared on time. Not with columnar.
 
     Returns
     -------
-    :return: flattened_flights: list, a list of flight dicts.
+    :return: flattened_flights: list, a list of flight dicts, or a FlightTable.
     """
 
-    flights = [_expand(slot, season=season) for slot in slots]
-    flattened_flights = _flatten(flights)
+    _check_time_format(time_format)
+    if columnar and time_format is not None:
+        raise ValueError("time_format is not supported for columnar flights")
+
+    if stats is None:
+        return _expand_slots(slots, season, engine, columnar, time_format)
+
+    with stats.stage("expansion"):
+        flights = _expand_slots(slots, season, engine, columnar, time_format)
+    stats.count("flights", len(flights))
+    return flights
+
+
+def _expand_slots(slots, season=None, engine=None, columnar=False, time_format=None):
+    np = _numpy()
+    if engine is None:
+        engine = "rrule" if np is None else "numpy"
+
+    slots = list(slots)
+    if columnar:
+        from .flights import FlightTable
+
+    if engine == "numpy":
+        if np is None:
+            raise ImportError("The numpy engine requires numpy to be installed.")
+        slot_index, dates = _expand_numpy(slots, season=season)
+        if columnar:
+            flights = FlightTable(slots, slot_index, dates.astype(np.int64) + date(1970, 1, 1).toordinal())
+        elif time_format == "minutes":
+            keys = [_minute_fields(slot) for slot in slots]
+            flights = [
+                _merge_two_dicts(slots[i], dict(_flight_minutes(slots[i], keys[i], day), date=d))
+                for i, day, d in zip(
+                    slot_index.tolist(), dates.astype(np.int64).tolist(), np.datetime_as_string(dates).tolist()
+                )
+            ]
+        else:
+            flights = [
+                _merge_two_dicts(slots[i], {"date": d})
+                for i, d in zip(slot_index.tolist(), np.datetime_as_string(dates).tolist())
+            ]
+    elif engine == "rrule":
+        from dateutil.rrule import rrule, WEEKLY
+
+        if columnar:
+            slot_index, dates = array("l"), array("l")
+            for i, slot in enumerate(slots):
+                first, last, days_of_operation, frequency_rate, overnight = _operating_schedule(slot, season=season)
+                for d in rrule(WEEKLY, interval=frequency_rate, dtstart=first, until=last, byweekday=days_of_operation):
+                    slot_index.append(i)
+                    dates.append(d.toordinal() + overnight)
+            flights = FlightTable(slots, slot_index, dates)
+        else:
+            flights = _flatten([_expand(slot, season=season, time_format=time_format) for slot in slots])
+    else:
+        raise ValueError('engine should be "numpy" or "rrule" rather than %r' % engine)
 
-    logging.info("Expanded %i slots into %i flights." % (len(slots), len(flattened_flights)))
-    return flattened_flights
+    logger.info("Expanded %i slots into %i flights." % (len(slots), len(flights)))
+    return flights
 
 
-def _explode_aircraft_configuration_string(aircraft_configuration_string, raw_line=""):
-    # type: (str, str) -> dict
+def iter_flights(slots, season=None, time_format=None):
     """
-    Explodes a string containing aircraft information to.
+    Expands slots into flights one slot at a time.
 
     Parameters
     ----------.
-    :param aircraft_configuration_string: str, describing aircraft configuartion.
-    :param raw_line: str, optinal for displaying original slot line in case of error
-    :return row: dict, describing aircraft configuration.
+    :param slots: iterable of slot dicts, e.g. as returned by iter_read.
+    :param season: indication of season to import, see expand_slots.
+    :param time_format: "minutes" to give scheduled times as minutes since the epoch, see expand_slots.
+
+    Returns
+    -------
+    :return: flights: generator of flight dicts, in the same order as expand_slots.
     """
 
-    # if none retunr empty dict
-    if aircraft_configuration_string is None:
-        return {}
+    _check_time_format(time_format)
+    for slot in slots:
+        for flight in _expand(slot, season=season, time_format=time_format):
+            yield flight
+
+
+seat_class_designators = [
+    "P",
+    "F",
+    "A",
+    "J",
+    "C",
+    "D",
+    "I",
+    "Z",
+    "W",
+    "S",
+    "Y",
+    "B",
+    "H",
+    "K",
+    "L",
+    "M",
+    "N",
+    "Q",
+    "T",
+    "V",
+    "X",
+    "G",
+    "U",
+    "E",
+    "O",
+    "R",
+]
+
+cargo_designators = ["LL", "PP"]  # unit load devices (containers)  # pallets
+
+# seat designator should be in fixed order according to standard, followed by cargo designators
+designator_order = {
+    designator: (i, designator_type)
+    for i, (designator, designator_type) in enumerate(
+        [(designator, "seats") for designator in seat_class_designators]
+        + [(designator, "cargo") for designator in cargo_designators]
+    )
+}
+
+digits = re.compile(r"\d*")
+
+
+@lru_cache(maxsize=1024)
+def _decode_aircraft_configuration_string(aircraft_configuration_string):
+    # type: (str) -> (tuple, str)
+    """
+    Decodes a string containing aircraft information in a single pass. Cached, since a schedule only holds a
+    few hundred distinct strings.
+
+    Parameters
+    ----------.
+    :param aircraft_configuration_string: str, describing aircraft configuartion.
+    :return acv_items: tuple of (key, value) pairs, describing aircraft configuration.
+    :return remainder: str, part of the string that could not be processed, None if there is none.
+    """
 
     # if input is numeric only, assume that to be the total amount of seats
     if aircraft_configuration_string.isdigit():
-        return {"seats": int(aircraft_configuration_string)}
-
-    string_remainder = aircraft_configuration_string.rstrip()
-
-    seat_class_designators = [
-        "P",
-        "F",
-        "A",
-        "J",
-        "C",
-        "D",
-        "I",
-        "Z",
-        "W",
-        "S",
-        "Y",
-        "B",
-        "H",
-        "K",
-        "L",
-        "M",
-        "N",
-        "Q",
-        "T",
-        "V",
-        "X",
-        "G",
-        "U",
-        "E",
-        "O",
-        "R",
-    ]
-
-    cargo_designators = ["LL", "PP"]  # unit load devices (containers)  # pallets
-
-    integer_designators = {"seats": seat_class_designators, "cargo": cargo_designators}
+        return (("seats", int(aircraft_configuration_string)),), None
+
+    string = aircraft_configuration_string.rstrip()
+    position = 0
+    next_designator = 0
 
     acv_info = {}
 
-    # seat designator should be in fixed order according to standard
-    for designator_type, designators in integer_designators.items():
-        for designator in designators:
-            if string_remainder.startswith(designator) and (  # only continue if string starts with designator and...
-                len(designator) > 1
-                or not (  # either have a multi length designator
-                    (len(string_remainder) > 1 and string_remainder[1] == string_remainder[0])
-                    or string_remainder.startswith("V V")
-                )
-            ):  #
+    while position < len(string):
+        # a double letter can only be a multi length designator, a single letter only a seat class designator
+        if position + 1 < len(string) and string[position] == string[position + 1]:
+            designator = string[position] * 2
+        elif string.startswith("V V", position):
+            break
+        else:
+            designator = string[position]
 
-                acv_info_key = designator_type + "_" + designator
+        if designator not in designator_order or designator_order[designator][0] < next_designator:
+            break
+        next_designator, designator_type = designator_order[designator]
+        next_designator += 1
+        position += len(designator)
 
-                # for next iteration, remove designator from beginning of string
-                string_remainder = string_remainder[len(designator):]
+        acv_info_key = designator_type + "_" + designator
 
-                # standard specifies that there may be an int following. If not return empty string (to later on destinguish from NaN if data gets put in a data frame)
-                acv_info_val = ""
-                acv_regex = re.search(r"^\d*", string_remainder).group()
+        # standard specifies that there may be an int following. If not return empty string (to later on destinguish from NaN if data gets put in a data frame)
+        acv_info_val = ""
+        acv_digits = digits.match(string, position).group()
 
-                # if int found, add it to total and remove it from string to process as well
-                if acv_regex:
-                    acv_info_val = int(acv_regex)
-                    if designator_type == "seats":
-                        if designator_type in acv_info.keys():
-                            acv_info[designator_type] += acv_info_val
-                        else:
-                            acv_info[designator_type] = acv_info_val
+        # if int found, add it to total and remove it from string to process as well
+        if acv_digits:
+            acv_info_val = int(acv_digits)
+            if designator_type == "seats":
+                if designator_type in acv_info.keys():
+                    acv_info[designator_type] += acv_info_val
+                else:
+                    acv_info[designator_type] = acv_info_val
 
-                    string_remainder = string_remainder[len(acv_regex):]
+            position += len(acv_digits)
 
-                # store found information
-                acv_info[acv_info_key] = acv_info_val
+        # store found information
+        acv_info[acv_info_key] = acv_info_val
+
+    string_remainder = string[position:]
+    remainder = None
 
     # remainer are general designators
     if string_remainder.startswith("BB"):
@@ -752,12 +1482,56 @@ def _explode_aircraft_configuration_string(aircraft_configuration_string, raw_li
     elif string_remainder.startswith("V V"):  # aircraft type alt. Assuming it won't appear together with VV.
         acv_info["V V"] = string_remainder[3:]
     elif len(string_remainder.strip()):
+        remainder = string_remainder
+
+    return tuple(acv_info.items()), remainder
+
+
+def _explode_aircraft_configuration_string(aircraft_configuration_string, raw_line=""):
+    # type: (str, str) -> dict
+    """
+    Explodes a string containing aircraft information to.
+
+    Parameters
+    ----------.
+    :param aircraft_configuration_string: str, describing aircraft configuartion.
+    :param raw_line: str, optinal for displaying original slot line in case of error
+    :return row: dict, describing aircraft configuration.
+    """
+
+    # if none retunr empty dict
+    if aircraft_configuration_string is None:
+        return {}
+
+    # decoded strings are cached and shared, every call gets its own dict
+    return dict(_aircraft_configuration_items(aircraft_configuration_string, raw_line))
+
+
+def _aircraft_configuration_items(aircraft_configuration_string, raw_line=""):
+    # type: (str, str) -> tuple
+    """
+    Decodes a string containing aircraft information into a tuple of (key, value) pairs, that is shared between
+    all calls with the same string.
+
+    Parameters
+    ----------.
+    :param aircraft_configuration_string: str, describing aircraft configuartion.
+    :param raw_line: str, optinal for displaying original slot line in case of error
+    :return acv_items: tuple of (key, value) pairs, describing aircraft configuration.
+    """
+
+    if aircraft_configuration_string is None:
+        return ()
+
+    acv_items, string_remainder = _decode_aircraft_configuration_string(aircraft_configuration_string)
+
+    if string_remainder is not None:
         log_text = (
             "After trying to process aircraft configuration string, there should be no remainder. However, the following string remains in this instance: (%s)"
             % string_remainder
         )
         if raw_line:
             log_text += "\n Raw slot line: " + raw_line
-        logging.warning(log_text)
+        logger.warning(log_text)
 
-    return acv_info
+    return acv_items
@@ -0,0 +1,268 @@
+import logging
+from datetime import date
+
+from .ssim import _operating_schedule
+from .seasons import format_date
+
+logger = logging.getLogger(__name__)
+
+# action codes of schedule change messages that add the days of their record, and that remove them. A change
+# (C) record gives the days as they were and is followed by the revised (R) record giving them as they become
+additions = ("N", "R")
+removals = ("D", "C")
+# fields that do not tell apart the flights of two records, segments differing only in these can be merged
+period_fields = (
+    "period_of_operation_from",
+    "period_of_operation_to",
+    "days_of_operation",
+    "frequency_rate",
+    "action_code",
+    "raw",
+    "record_serial_number",
+)
+# highest frequency rate a record can hold, it is a single digit
+max_frequency_rate = 9
+
+
+def _gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def _monday(day):
+    """Ordinal of the Monday of the week of an ordinal, ordinal 1 is a Monday."""
+    return day - (day - 1) % 7
+
+
+def _operates(day, weekdays, frequency_rate, monday):
+    return (day - 1) % 7 in weekdays and (day - monday) // 7 % frequency_rate == 0
+
+
+def _normalized(first, last, weekdays, frequency_rate, monday):
+    """
+    Moves the bounds of a period onto the first and last day it operates on, counting weeks from the new first
+    day so the frequency phase is kept. Returns None if it does not operate at all.
+    """
+
+    if not weekdays:
+        return None
+    stride = 7 * frequency_rate
+    for start in range(first, min(first + stride, last + 1)):
+        if _operates(start, weekdays, frequency_rate, monday):
+            break
+    else:
+        return None
+    for end in range(last, max(last - stride, start - 1), -1):
+        if _operates(end, weekdays, frequency_rate, monday):
+            break
+
+    return start, end, weekdays, frequency_rate, _monday(start)
+
+
+def _schedule(slot, season):
+    """The period of a slot as ordinals of its first and last day, weekdays, frequency rate and phase."""
+
+    first, last, days_of_operation, frequency_rate, overnight = _operating_schedule(slot, season=season)
+    first, last = first.toordinal(), last.toordinal()
+    return first, last, frozenset(days_of_operation or range(7)), frequency_rate, _monday(first)
+
+
+def _content(slot):
+    return tuple(sorted((key, value) for key, value in slot.items() if key not in period_fields))
+
+
+def _subtract(segment, removal):
+    """
+    The pieces left of a segment once the days of a removal are taken out, as normalized (first, last, weekdays,
+    frequency_rate, monday) tuples.
+
+    Outside the period of the removal the segment is kept as it is. Within it, weekdays the removal does not
+    operate on are kept, and on the others the weeks the removal does not operate in. Those recur every least
+    common multiple of both frequency rates, one piece per week they start in.
+    """
+
+    first, last, weekdays, frequency_rate, monday = segment[:5]
+    removal_first, removal_last, removal_weekdays, removal_frequency_rate, removal_monday = removal
+
+    pieces = []
+    if first < removal_first:
+        pieces.append((first, min(last, removal_first - 1), weekdays, frequency_rate, monday))
+    if last > removal_last:
+        pieces.append((max(first, removal_last + 1), last, weekdays, frequency_rate, monday))
+
+    first, last = max(first, removal_first), min(last, removal_last)
+    pieces.append((first, last, weekdays - removal_weekdays, frequency_rate, monday))
+
+    shared = weekdays & removal_weekdays
+    rate = frequency_rate * removal_frequency_rate // _gcd(frequency_rate, removal_frequency_rate)
+    # weeks are counted from the week of ordinal 1
+    week, weeks, removal_weeks = (first - 1) // 7, (monday - 1) // 7, (removal_monday - 1) // 7
+    for start_week in range(week, week + rate):
+        if (start_week - weeks) % frequency_rate or (start_week - removal_weeks) % removal_frequency_rate == 0:
+            continue
+        if rate <= max_frequency_rate:
+            pieces.append((max(first, 7 * start_week + 1), last, shared, rate, 7 * start_week + 1))
+            continue
+        # too rare to be written as a frequency rate, every week is a piece of its own
+        for k in range(start_week, (last - 1) // 7 + 1, rate):
+            pieces.append((max(first, 7 * k + 1), min(last, 7 * k + 7), shared, 1, 7 * k + 1))
+
+    return [piece for piece in (_normalized(*piece) for piece in pieces) if piece is not None]
+
+
+class ScheduleState(object):
+    """
+    State of a schedule that change messages (SCR, SIR) are applied to.
+
+    Slots are kept per airline designator, flight number, operational suffix and arrival/departure, as segments:
+    the period of operation of a slot as an interval of days with its weekdays and frequency rate, sorted by their
+    first day. A change only looks at the segments of its own flight. Removing days splits the segments it
+    overlaps into the pieces left over, each bounded by the first and last day it actually operates on. Once a
+    batch of changes is applied, segments of a flight that are contiguous and otherwise identical are merged.
+
+    Slots should be of a single airport (SIR, or SIM read with iata_airport), as legs of a flight that operate on
+    the same days are not told apart.
+
+    Parameters
+    ----------.
+    :param slots: list of slots, as returned by read. Not changed, slots of changed segments are copies.
+    :param season: indication of season, required if slots or changes contain 00XXX00, see expand_slots.
+    """
+
+    def __init__(self, slots, season=None):
+        self.season = season
+        self.segments = {}
+        for slot in slots:
+            # the last element tells if the segment still is the slot as given
+            self.segments.setdefault(self._key(slot), []).append(list(_schedule(slot, season)) + [slot, True])
+        for segments in self.segments.values():
+            segments.sort(key=lambda segment: segment[:2])
+
+    @staticmethod
+    def _key(slot):
+        return slot["airline_designator"], slot["flight_number"], slot.get("operational_suffix"), slot["ad"]
+
+    def __len__(self):
+        return sum(len(segments) for segments in self.segments.values())
+
+    def apply(self, changes):
+        """
+        Applies change messages in order: new (N) and revised (R) records add their days, delete (D) and change
+        (C) records remove theirs. Records with other action codes (such as H or K) do not change the schedule,
+        they are skipped.
+
+        Parameters
+        ----------.
+        :param changes: iterable of slots with an action_code, e.g. as returned by read for a SIR message.
+
+        Returns
+        -------
+        :return skipped: list of the changes that were skipped, in order.
+        """
+
+        changed = set()
+        skipped = []
+        try:
+            for change in changes:
+                action_code = change["action_code"]
+                if action_code not in additions + removals:
+                    logger.warning("%s record is not applied: %r" % (action_code, change.get("raw")))
+                    skipped.append(change)
+                    continue
+
+                key = self._key(change)
+                schedule = _schedule(change, self.season)
+                if action_code in additions:
+                    self.segments.setdefault(key, []).append(list(schedule) + [change, True])
+                else:
+                    self._remove(key, schedule, change)
+                changed.add(key)
+        finally:
+            # changes applied before one fails stay applied
+            for key in changed:
+                self._merge(key)
+
+        return skipped
+
+    def _remove(self, key, removal, change):
+        removal_first, removal_last, removal_weekdays = removal[:3]
+
+        segments = []
+        removed = False
+        for segment in self.segments.get(key, []):
+            first, last, weekdays = segment[:3]
+            # a period ending before it starts has no days to remove
+            if (
+                removal_first > removal_last
+                or first > removal_last
+                or last < removal_first
+                or not weekdays & removal_weekdays
+            ):
+                segments.append(segment)
+                continue
+            segments.extend(list(piece) + [segment[5], False] for piece in _subtract(segment, removal))
+            removed = True
+
+        if not removed:
+            logger.warning("%s record matches no slot: %r" % (change["action_code"], change.get("raw")))
+        if segments:
+            self.segments[key] = segments
+        else:
+            self.segments.pop(key, None)
+
+    def _merge(self, key):
+        """Merges the segments of a flight that follow on each other, with the same weekdays and frequency rate."""
+
+        if key not in self.segments:
+            return
+
+        groups = {}
+        for segment in sorted(self.segments[key], key=lambda segment: segment[:2]):
+            groups.setdefault((_content(segment[5]), segment[2], segment[3]), []).append(segment)
+
+        segments = []
+        for (content, weekdays, frequency_rate), group in groups.items():
+            merged = group[0]
+            for segment in group[1:]:
+                # the segment starts on the next day the merged one would operate on, in the same phase
+                previous = _normalized(merged[1] + 1, segment[0], weekdays, frequency_rate, merged[4])
+                if previous is not None and previous[0] == segment[0]:
+                    merged = merged[:1] + [max(merged[1], segment[1])] + merged[2:5] + [merged[5], False]
+                else:
+                    segments.append(merged)
+                    merged = segment
+            segments.append(merged)
+
+        segments.sort(key=lambda segment: segment[:2])
+        self.segments[key] = segments
+
+    @staticmethod
+    def _slot(segment):
+        first, last, weekdays, frequency_rate, monday, slot, original = segment
+        if original:
+            return slot
+
+        slot = slot.copy()
+        source_days = slot.get("days_of_operation") or ""
+        blank = "0" if "0" in source_days else " "
+        if frequency_rate != 1 or (slot.get("frequency_rate") or "1").strip() not in ("", "1"):
+            slot["frequency_rate"] = str(frequency_rate)
+        slot["period_of_operation_from"] = format_date(date.fromordinal(first))
+        slot["period_of_operation_to"] = format_date(date.fromordinal(last))
+        slot["days_of_operation"] = "".join(str(weekday + 1) if weekday in weekdays else blank for weekday in range(7))
+
+        return slot
+
+    def slots(self):
+        """
+        Returns the slots of the schedule.
+
+        Returns
+        -------
+        :return slots: list of slots, per flight in the order flights were first seen, ordered by first day. Slots
+        of unchanged segments are those given, others are copies of the record they come from, with their period
+        of operation, days of operation (written the way that record writes them) and frequency rate replaced.
+        """
+
+        return [self._slot(segment) for segments in self.segments.values() for segment in segments]
@@ -0,0 +1,144 @@
+from time import perf_counter
+
+
+class Stats(object):
+    """
+    Wall time, number of calls and bytes per stage of reading and expanding slotfiles, plus counters of lines
+    that were skipped or did not match.
+
+    Pass a Stats object as the stats argument of read, iter_read or expand_slots. Functions are only wrapped
+    with timers when a Stats object is given, so reading without one costs nothing extra. Stages are:
+
+    - file_read: reading the file.
+    - type_detection: telling SIM from SIR.
+    - regex_matching: parsing records, with regexes or field offsets.
+    - uniformization: turning flight leg records into slots.
+    - acv_explosion: decoding aircraft configuration strings.
+    - expansion: expanding slots into flights.
+
+    Parameters
+    ----------.
+    :param callback: function called as callback(stage, seconds, count, nbytes) every time a stage is recorded,
+    e.g. to forward measurements to a metrics system.
+    """
+
+    stages = ("file_read", "type_detection", "regex_matching", "uniformization", "acv_explosion", "expansion")
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.seconds = dict.fromkeys(self.stages, 0.0)
+        self.calls = dict.fromkeys(self.stages, 0)
+        self.bytes = dict.fromkeys(self.stages, 0)
+        self.counts = {"unmatched_lines": 0, "skipped_lines": 0, "flights": 0}
+
+    def add(self, stage, seconds, count=1, nbytes=0):
+        """Records count calls of a stage taking seconds in total and handling nbytes."""
+
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+        self.calls[stage] = self.calls.get(stage, 0) + count
+        self.bytes[stage] = self.bytes.get(stage, 0) + nbytes
+        if self.callback is not None:
+            self.callback(stage, seconds, count, nbytes)
+
+    def count(self, counter, n=1):
+        """Adds n to a counter."""
+        self.counts[counter] = self.counts.get(counter, 0) + n
+
+    def stage(self, stage):
+        """
+        Context manager recording the block it wraps as a call of stage. Set nbytes on the object it returns to
+        record bytes.
+        """
+        return _Timer(self, stage)
+
+    def timed(self, stage, function):
+        """Wraps a function so every call is recorded as a call of stage."""
+
+        def timed_function(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.add(stage, perf_counter() - start)
+
+        return timed_function
+
+    def timed_lines(self, stage, lines):
+        """Wraps an iterable of lines so reading every line is recorded as a call of stage, along with its length."""
+
+        lines = iter(lines)
+        while True:
+            start = perf_counter()
+            try:
+                line = next(lines)
+            except StopIteration:
+                self.add(stage, perf_counter() - start, count=0)
+                return
+            self.add(stage, perf_counter() - start, nbytes=len(line))
+            yield line
+
+    def as_dict(self):
+        """Returns the measurements as a dict of stage to seconds, calls and bytes, and of counters."""
+
+        stages = {
+            stage: {"seconds": self.seconds[stage], "calls": self.calls[stage], "bytes": self.bytes[stage]}
+            for stage in self.seconds
+        }
+        return {"stages": stages, "counts": dict(self.counts)}
+
+    def __repr__(self):
+        stages = ", ".join(
+            "%s=%.3fs" % (stage, seconds) for stage, seconds in self.seconds.items() if self.calls[stage]
+        )
+        counts = ", ".join("%s=%i" % (counter, n) for counter, n in self.counts.items() if n)
+        return "Stats(%s)" % ", ".join(part for part in (stages, counts) if part)
+
+
+class _Timer(object):
+    __slots__ = ("stats", "stage", "nbytes", "start")
+
+    def __init__(self, stats, stage):
+        self.stats = stats
+        self.stage = stage
+        self.nbytes = 0
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stats.add(self.stage, perf_counter() - self.start, nbytes=self.nbytes)
+
+
+class _NullTimer(object):
+    __slots__ = ("nbytes",)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class _NoStats(object):
+    """Stands in for a Stats object when no stats are asked for: functions are returned as they are."""
+
+    _timer = _NullTimer()
+
+    def add(self, stage, seconds, count=1, nbytes=0):
+        pass
+
+    def count(self, counter, n=1):
+        pass
+
+    def stage(self, stage):
+        return self._timer
+
+    def timed(self, stage, function):
+        return function
+
+    def timed_lines(self, stage, lines):
+        return lines
+
+
+no_stats = _NoStats()
@@ -1,3 +1,5 @@
+import random
+
 import pytest
 
 # from glob import glob
@@ -46,9 +48,61 @@ def sim_records():
     return slots
 
 
+def _write(tmp_path, name, records):
+    paths = []
+    for i, record in enumerate(records):
+        path = tmp_path / (name % i)
+        path.write_text(record["raw_data"])
+        paths.append(str(path))
+
+    return paths
+
+
+@pytest.fixture
+def sim_paths(sim_records, tmp_path):
+    # the SIM files of sim_records, in the same order
+    return _write(tmp_path, "sim_%i.txt", sim_records)
+
+
+@pytest.fixture
+def sir_paths(sir_records, tmp_path):
+    # the SIR files of sir_records that have seats for every record, so they can be read
+    readable = [record for record in sir_records if all(x["seats"] is not None for x in record["records"])]
+    return _write(tmp_path, "sir_%i.txt", readable)
+
+
 @pytest.fixture
 def aircraft_configuration_strings():
     with open(path_to_data + "aircraft_configuration_strings.yml") as f:
         aircraft_configuration_strings = yaml.safe_load(f.read())
 
     return aircraft_configuration_strings
+
+
+@pytest.fixture
+def random_slots():
+    rng = random.Random(1)
+    months = ["MAR", "APR", "MAY", "OCT", "NOV", "DEC"]
+    slots = []
+    for i in range(500):
+        days_of_operation = "".join(str(d) if rng.random() < 0.4 else rng.choice("0 ") for d in range(1, 8))
+        slots.append(
+            {
+                "ad": rng.choice("AD"),
+                "airline_designator": rng.choice(["KL", "XZ", "U2"]),
+                "flight_number": str(rng.randint(1, 300)),
+                "station": rng.choice(["AMS", "LHR"]),
+                "period_of_operation_from": rng.choice(
+                    ["00XXX00", "%02d%s17" % (rng.randint(1, 28), rng.choice(months))]
+                ),
+                "period_of_operation_to": rng.choice(
+                    ["00XXX00", "%02d%s17" % (rng.randint(1, 28), rng.choice(months))]
+                ),
+                "days_of_operation": rng.choice([None, days_of_operation]),
+                "frequency_rate": rng.choice([None, " ", "1", "2", "3"]),
+                "overnight_indicator": rng.choice([True, False]),
+                "raw": "%i" % i,
+            }
+        )
+
+    return slots
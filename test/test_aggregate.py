@@ -0,0 +1,96 @@
+from collections import Counter
+from datetime import date, timedelta
+
+import pytest
+
+from ssim.ssim import read, expand_slots
+from ssim.aggregate import histogram
+
+
+def _count(flights, by):
+    movements, seats = Counter(), Counter()
+    for flight in flights:
+        time = flight.get("scheduled_time") or flight.get(
+            "scheduled_time_of_aircraft_departure" if flight["ad"] == "D" else "scheduled_time_of_aircraft_arrival"
+        )
+        key = (flight["date"], int(time[:2]) if by == "hour" else None, flight["ad"])
+        movements[key] += 1
+        seats[key] += int(flight.get("seats") or 0)
+    return movements, seats
+
+
+def _check(slots, by, season=None, **kwargs):
+    rows = histogram(slots, by=by, season=season, **kwargs)
+    flights = expand_slots(slots, season=season)
+    if "first" in kwargs:
+        flights = [flight for flight in flights if kwargs["first"].isoformat() <= flight["date"]]
+        flights = [flight for flight in flights if flight["date"] <= kwargs["last"].isoformat()]
+    movements, seats = _count(flights, by)
+
+    assert {(row["date"], row.get("hour"), row["ad"]): row["movements"] for row in rows} == movements
+    assert {(row["date"], row.get("hour"), row["ad"]): row["seats"] for row in rows} == seats
+    assert rows == sorted(rows, key=lambda row: (row["date"], row.get("hour") or 0, row["ad"]))
+
+
+@pytest.mark.parametrize("by", ["hour", "day"])
+def test_histogram_random(random_slots, by):
+    slots = random_slots
+    for i, slot in enumerate(slots):
+        slot["scheduled_time"] = "%02d%02d" % (i % 24, i % 60)
+        slot["seats"] = i % 200 or None
+
+    _check(slots, by, season="S17")
+    _check(slots, by, season="S17", first=date(2017, 4, 3), last=date(2017, 4, 20))
+
+
+@pytest.mark.parametrize("iata_airport", [None, "AMS"])
+def test_histogram_sim(sim_paths, iata_airport):
+    for path in sim_paths:
+        slots = read(path, iata_airport=iata_airport)
+
+        _check(slots, "hour")
+        _check(slots, "day")
+
+
+def _check_minutes(slots, season=None):
+    """Counts of flights expanded with time_format="minutes", by the UTC date and hour they operate at."""
+
+    movements, seats, days = Counter(), Counter(), Counter()
+    for flight in expand_slots(slots, season=season, time_format="minutes"):
+        minutes = flight.get("scheduled_time")
+        if minutes is None:
+            minutes = flight[
+                "scheduled_time_of_aircraft_departure" if flight["ad"] == "D" else "scheduled_time_of_aircraft_arrival"
+            ]
+        day = (date(1970, 1, 1) + timedelta(days=minutes // 1440)).isoformat()
+        movements[(day, minutes // 60 % 24, flight["ad"])] += 1
+        seats[(day, minutes // 60 % 24, flight["ad"])] += int(flight.get("seats") or 0)
+        days[(day, None, flight["ad"])] += 1
+
+    rows = histogram(slots, season=season)
+    assert {(row["date"], row["hour"], row["ad"]): row["movements"] for row in rows} == movements
+    assert {(row["date"], row["hour"], row["ad"]): row["seats"] for row in rows} == seats
+    rows = histogram(slots, by="day", season=season)
+    assert {(row["date"], row.get("hour"), row["ad"]): row["movements"] for row in rows} == days
+
+
+def test_histogram_minutes_random(random_slots):
+    slots = random_slots
+    for i, slot in enumerate(slots):
+        # UTC minutes since the start of the day of operation, of the day before or after it too
+        slot["scheduled_time"] = i * 37 % 3000 - 500
+        slot["seats"] = i % 200 or None
+
+    _check_minutes(slots, season="S17")
+
+
+@pytest.mark.parametrize("iata_airport", [None, "AMS"])
+def test_histogram_minutes_sim(sim_paths, iata_airport):
+    for path in sim_paths:
+        _check_minutes(read(path, iata_airport=iata_airport, time_format="minutes"))
+
+
+def test_histogram_empty():
+    assert histogram([]) == []
+    with pytest.raises(ValueError):
+        histogram([], by="week")
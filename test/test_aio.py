@@ -0,0 +1,84 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import ssim.aio
+from ssim.ssim import read
+
+
+def _run(coroutine):
+    """Runs a coroutine in a new event loop, asyncio.run needs Python 3.7."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+def test_aio_read(sim_paths, tmp_path):
+    path = sim_paths[0]
+
+    async def main():
+        slots = await ssim.aio.read(path)
+        assert slots == read(path)
+        assert await ssim.aio.read(path, iata_airport="AMS", executor="process") == read(path, iata_airport="AMS")
+        with ThreadPoolExecutor(1) as executor:
+            assert await ssim.aio.read(path, executor=executor, compact=True) == read(path, compact=True)
+        assert await ssim.aio.read(path, executor=None) == slots
+
+        with pytest.raises(FileNotFoundError):
+            await ssim.aio.read(str(tmp_path / "missing.SIM"))
+        with pytest.raises(ValueError):
+            await ssim.aio.read(path, executor="fibers")
+
+    _run(main())
+
+
+def test_aio_read_dir(sim_paths, tmp_path):
+    paths = sim_paths
+    # gzip magic bytes followed by an unknown compression method
+    (tmp_path / "broken.txt").write_bytes(b"\x1f\x8b\x07 not a slotfile")
+    (tmp_path / "notes.md").write_text("")
+    (tmp_path / "subdirectory").mkdir()
+
+    async def collect(**options):
+        return {result.path: result async for result in ssim.aio.read_dir(str(tmp_path), **options)}
+
+    for executor in ("thread", "process"):
+        results = _run(collect(pattern="*.txt", executor=executor, concurrency=2))
+        assert sorted(results) == sorted(paths + [str(tmp_path / "broken.txt")])
+        for path in paths:
+            assert results[path].error is None
+            assert results[path].records == read(path)
+        assert results[str(tmp_path / "broken.txt")].records is None
+        assert isinstance(results[str(tmp_path / "broken.txt")].error, OSError)
+
+    results = _run(collect(concurrency=1, expand=True))
+    assert len(results) == len(paths) + 2
+    assert results[str(tmp_path / "notes.md")].records == []
+
+
+def test_aio_read_dir_cancel(sim_paths, tmp_path):
+
+    async def main():
+        results = ssim.aio.read_dir(str(tmp_path), concurrency=2)
+        first = await results.__anext__()
+        await results.aclose()
+        return first
+
+    assert _run(main()).error is None
+
+    async def consume():
+        async for result in ssim.aio.read_dir(str(tmp_path), concurrency=2):
+            await asyncio.sleep(1)
+
+    async def cancel():
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    _run(cancel())
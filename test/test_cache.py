@@ -0,0 +1,97 @@
+import os
+import pickle
+import shutil
+
+import pytest
+
+from ssim.ssim import read
+from ssim import cache
+
+
+def test_read_cached(sim_paths, tmp_path, monkeypatch):
+    path = sim_paths[-1]
+    cache_dir = str(tmp_path / "cache")
+
+    slots = read(path, cache_dir=cache_dir)
+    assert slots == read(path)
+    assert len(os.listdir(cache_dir)) == 1
+
+    # a second read loads the slots rather than parsing the file
+    monkeypatch.setattr("ssim.ssim.iter_read", None)
+    assert read(path, cache_dir=cache_dir) == slots
+    monkeypatch.undo()
+
+    # options and contents are part of the key
+    assert read(path, iata_airport="AMS", cache_dir=cache_dir) == read(path, iata_airport="AMS")
+    shutil.copyfile(sim_paths[0], path)
+    assert read(path, cache_dir=cache_dir) == read(path)
+    assert len(os.listdir(cache_dir)) == 3
+
+
+def test_read_cached_damaged_entry(sim_paths, tmp_path):
+    path = sim_paths[-1]
+    cache_dir = str(tmp_path / "cache")
+
+    slots = read(path, cache_dir=cache_dir)
+    entry = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+    with open(entry, "wb") as f:
+        f.write(b"damaged")
+
+    assert read(path, cache_dir=cache_dir) == slots
+    assert read(path, cache_dir=cache_dir) == slots
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_read_cached_slots(sim_paths, sir_paths, tmp_path, compact):
+    cache_dir = str(tmp_path / "cache")
+    for path in sim_paths + sir_paths:
+        for options in ({}, {"iata_airport": "AMS"}, {"time_format": "minutes"}):
+            slots = read(path, compact=compact, **options)
+            read(path, compact=compact, cache_dir=cache_dir, **options)
+            cached = read(path, compact=compact, cache_dir=cache_dir, **options)
+
+            assert cached == slots
+            assert [type(slot) for slot in cached] == [type(slot) for slot in slots]
+            assert [list(slot) for slot in cached] == [list(slot) for slot in slots]
+            if compact:
+                # the arrival and departure slot of a leg share it again
+                assert len({id(slot.leg) for slot in cached}) == len({id(slot.leg) for slot in slots})
+
+    # reading with or without mapping the file are cached apart
+    assert cache.cache_key(sim_paths[0], use_mmap=True) != cache.cache_key(sim_paths[0], use_mmap=False)
+
+
+class _Forged(object):
+    def __reduce__(self):
+        return os.remove, (self.path,)
+
+
+def test_read_cached_forged_entry(sim_paths, tmp_path):
+    path = sim_paths[-1]
+    cache_dir = str(tmp_path / "cache")
+    slots = read(path, cache_dir=cache_dir)
+
+    # an entry that would remove a file when unpickled is a damaged entry rather than run
+    forged = _Forged()
+    forged.path = sim_paths[0]
+    entry = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+    with open(entry, "wb") as f:
+        pickle.dump(forged, f)
+
+    assert read(path, cache_dir=cache_dir) == slots
+    assert os.path.exists(sim_paths[0])
+
+
+def test_evict(tmp_path):
+    cache_dir = str(tmp_path)
+    for i in range(5):
+        cache.store(cache_dir, "key_%i" % i, [{"raw": "x" * 1000}])
+        os.utime(os.path.join(cache_dir, "key_%i" % i + cache.cache_suffix), (i, i))
+
+    # a hit makes an entry the most recently used
+    assert cache.load(cache_dir, "key_0") == [{"raw": "x" * 1000}]
+    size = os.path.getsize(os.path.join(cache_dir, "key_0" + cache.cache_suffix))
+    cache.evict(cache_dir, 2 * size)
+
+    assert sorted(os.listdir(cache_dir)) == ["key_0" + cache.cache_suffix, "key_4" + cache.cache_suffix]
+    assert cache.load(cache_dir, "key_1") is None
@@ -0,0 +1,49 @@
+import csv
+import gzip
+import subprocess
+import sys
+
+from ssim.ssim import expand_slots, iter_flights, read
+
+
+def run_cli(input_file, output_file, *args):
+    subprocess.check_call([sys.executable, "-m", "ssim", "-i", str(input_file), "-o", str(output_file)] + list(args))
+
+    with open(str(output_file), newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_iter_flights(expanding_slots):
+    slots = [slot["slot"] for slot in expanding_slots]
+
+    assert list(iter_flights(iter(slots))) == expand_slots(slots, engine="rrule")
+
+
+def test_cli(sir_records, tmp_path):
+    input_file = tmp_path / "slots.SIR"
+    input_file.write_text(sir_records[0]["raw_data"])
+
+    rows = run_cli(input_file, tmp_path / "flights.csv", "--chunk-size", "2")
+    flights = expand_slots(read(str(input_file)))
+
+    assert len(rows) == len(flights)
+    assert [row["date"] for row in rows] == [flight["date"] for flight in flights]
+
+
+def test_cli_empty_file(tmp_path):
+    input_file = tmp_path / "empty.SIR"
+    input_file.write_text("")
+    output_file = tmp_path / "flights.csv"
+
+    assert run_cli(input_file, output_file) == []
+    assert output_file.read_text().strip() == "date"
+
+
+def test_cli_compressed(sir_records, tmp_path):
+    input_file = tmp_path / "slots.SIR.gz"
+    input_file.write_bytes(gzip.compress(sir_records[0]["raw_data"].encode()))
+
+    rows = run_cli(input_file, tmp_path / "flights.csv")
+
+    assert len(rows) == len(expand_slots(read(str(input_file))))
+    assert len(rows) > 0
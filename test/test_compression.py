@@ -0,0 +1,72 @@
+import bz2
+import gzip
+import lzma
+import zipfile
+
+from ssim.ssim import read, iter_read, expand_slots, _detect_compression
+from ssim.parallel import read_archive, FileResult
+
+
+def test_read_compressed(sim_records, sim_paths, tmp_path):
+    text = sim_records[0]["raw_data"]
+    plain = sim_paths[0]
+    slots = read(plain)
+
+    assert _detect_compression(plain) is None
+
+    for compression, compress in (("gzip", gzip.compress), ("bz2", bz2.compress), ("xz", lzma.compress)):
+        path = tmp_path / ("schedule.SIM." + compression)
+        path.write_bytes(compress(text.encode()))
+
+        assert _detect_compression(str(path)) == compression
+        assert read(str(path)) == slots
+        assert read(str(path), iata_airport="AMS", compact=True) == read(plain, iata_airport="AMS", compact=True)
+        # memory-mapped and parallel reads fall back to reading the decompressed stream
+        assert read(str(path), use_mmap=True) == slots
+        assert read(str(path), workers=2) == slots
+        assert read(str(path), cache_dir=str(tmp_path / "cache")) == slots
+        assert read(str(path), cache_dir=str(tmp_path / "cache")) == slots
+
+
+def test_read_zip(sim_paths, sir_paths, tmp_path):
+    members = [("schedule.SIM", sim_paths[0]), ("folder/", None), ("folder/slots.SIR", sir_paths[0])]
+
+    path = tmp_path / "schedules.zip"
+    expected = []
+    with zipfile.ZipFile(str(path), "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, member in members:
+            if member is None:
+                archive.writestr(name, "")
+                continue
+            archive.write(member, name)
+            expected += read(member)
+
+    assert _detect_compression(str(path)) == "zip"
+    assert list(iter_read(str(path))) == expected
+    assert {slot["raw"][:1] for slot in expected} > {"3"}
+
+
+def test_read_archive(sim_records, sim_paths, tmp_path):
+    # a period of operation in a month that does not exist, it fails to expand
+    lines = sim_records[0]["raw_data"].split("\n")
+    broken = "\n".join(line[:14] + "01XYZ18" + line[21:] if line[:1] == "3" else line for line in lines)
+
+    path = tmp_path / "schedules.zip"
+    with zipfile.ZipFile(str(path), "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.write(sim_paths[0], "first.SIM")
+        archive.writestr("broken.SIM", broken)
+        archive.write(sim_paths[-1], "last.SIM")
+
+    results = read_archive(str(path), expand=True)
+    assert [result.path for result in results] == [
+        "%s:%s" % (path, name) for name in ("first.SIM", "broken.SIM", "last.SIM")
+    ]
+    assert isinstance(results[1].error, ValueError)
+    assert results[1].records is None
+
+    for result, member in zip((results[0], results[2]), (sim_paths[0], sim_paths[-1])):
+        assert result.error is None
+        assert result.records == expand_slots(read(member))
+
+    # any other file is a single result
+    assert read_archive(member) == [FileResult(member, read(member), None)]
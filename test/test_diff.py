@@ -0,0 +1,85 @@
+from collections import Counter
+
+import pytest
+
+import ssim
+from ssim.ssim import read, expand_slots
+from ssim.diff import iter_diff
+
+
+def _renumbered(lines, serial_shift=0):
+    return "\n".join(
+        line[:194] + "%06i" % (i + serial_shift) if len(line) >= 200 else line for i, line in enumerate(lines)
+    )
+
+
+def _flights(flights):
+    return Counter(
+        repr(sorted((key, value) for key, value in flight.items() if key not in ("raw", "record_serial_number")))
+        for flight in flights
+    )
+
+
+@pytest.mark.parametrize("iata_airport", [None, "AMS"])
+def test_diff(sim_records, tmp_path, iata_airport):
+    # legs with an operational suffix follow those without, as in SIM files
+    lines = sim_records[-1]["raw_data"].split("\n")
+    legs = [i for i, line in enumerate(lines) if line[:1] == "3"]
+    old_path, new_path = tmp_path / "old.SIM", tmp_path / "new.SIM"
+    old_path.write_text(_renumbered(lines))
+
+    # shorten the period of one leg, move another, drop one and add one, serial numbers shift
+    new_lines = list(lines)
+    new_lines[legs[0]] = lines[legs[0]][:21] + "15NOV17" + lines[legs[0]][28:]
+    new_lines[legs[1]] = lines[legs[1]][:43] + "0505" + lines[legs[1]][47:]
+    del new_lines[legs[2]]
+    new_lines.insert(legs[1], lines[legs[0]][:5] + "9999" + lines[legs[0]][9:])
+    new_path.write_text(_renumbered(new_lines, serial_shift=1))
+
+    old, new = read(str(old_path), iata_airport=iata_airport), read(str(new_path), iata_airport=iata_airport)
+    changes = ssim.diff(str(old_path), new_path, iata_airport=iata_airport, flights=True)
+    assert changes == list(iter_diff(old, new, iata_airport=iata_airport, flights=True))
+    assert ssim.diff(old_path, old_path, iata_airport=iata_airport) == []
+
+    kinds = Counter(change.kind for change in changes)
+    assert kinds == Counter(
+        {"modified": 2, "added": 1, "removed": 1} if iata_airport else {"modified": 4, "added": 2, "removed": 2}
+    )
+    assert {change.old["flight_number"] for change in changes if change.kind == "removed"} == {"123"}
+    assert {change.new["flight_number"] for change in changes if change.kind == "added"} == {"9999"}
+
+    # applying the flights of the changes to the old flights gives the new flights
+    removed = _flights(flight for change in changes for flight in change.removed_flights)
+    added = _flights(flight for change in changes for flight in change.added_flights)
+    assert _flights(expand_slots(old)) - removed + added == _flights(expand_slots(new))
+
+    # a shortened period only removes flights
+    shortened = next(change for change in changes if change.kind == "modified" and change.old["raw"][5:9] == "  12")
+    assert shortened.added_flights == []
+    assert len(shortened.removed_flights) == len(expand_slots([shortened.old])) - len(expand_slots([shortened.new]))
+
+
+def test_diff_same(sim_paths):
+    for path in sim_paths:
+        for iata_airport in (None, "AMS"):
+            assert ssim.diff(path, path, iata_airport=iata_airport) == []
+
+
+def test_diff_order(sim_paths):
+    slots = read(sim_paths[-1])
+    # airlines in blocks of their own, not sorted by airline designator
+    shuffled = slots[8:] + slots[:8]
+
+    for sort in (False, True):
+        assert ssim.diff(slots, shuffled, sort=sort) == []
+        changes = ssim.diff(slots, shuffled[2:], sort=sort)
+        assert [(change.kind, change.old["airline_designator"], change.old["flight_number"]) for change in changes] == [
+            ("removed", "XY", "1234")
+        ] * 2
+
+    # the suffix tells flights apart
+    suffixed = [dict(slot, operational_suffix="B") if i < 2 else slot for i, slot in enumerate(slots)]
+    assert Counter(change.kind for change in ssim.diff(slots, suffixed)) == Counter({"removed": 2, "added": 2})
+
+    blank = [dict(slot, flight_number=None) for slot in slots[:2]]
+    assert [change.kind for change in ssim.diff(blank, blank[:1])] == ["removed"]
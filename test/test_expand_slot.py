@@ -1,6 +1,36 @@
-from ssim.ssim import _expand
+import pytest
+
+from ssim.ssim import _expand, _flatten, expand_slots
 
 
 def test_expand_slot(expanding_slots):
     for slot in expanding_slots:
         assert _expand(slot["slot"]) == slot["flights"]
+
+
+def test_expand_slots_numpy(expanding_slots):
+    pytest.importorskip("numpy")
+
+    slots = [slot["slot"] for slot in expanding_slots]
+    assert expand_slots(slots, engine="numpy") == expand_slots(slots, engine="rrule")
+
+
+def test_expand_slots_numpy_random(random_slots):
+    pytest.importorskip("numpy")
+
+    slots = random_slots
+    assert expand_slots(slots, season="S17", engine="numpy") == expand_slots(slots, season="S17", engine="rrule")
+
+
+@pytest.mark.parametrize("engine", ["numpy", "rrule"])
+def test_expand_slots_columnar(expanding_slots, engine):
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+
+    slots = [slot["slot"] for slot in expanding_slots]
+    flights = expand_slots(slots, engine=engine, columnar=True)
+
+    assert len(flights) == sum(len(slot["flights"]) for slot in expanding_slots)
+    assert [flight.copy() for flight in flights] == _flatten([slot["flights"] for slot in expanding_slots])
+    assert flights[0] == expanding_slots[0]["flights"][0]
+    assert flights.fieldnames()[-1] == "date"
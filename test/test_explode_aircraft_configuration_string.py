@@ -5,7 +5,7 @@ Created on Mon Mar 12 16:09:38 2018
 @author: ramon
 """
 
-from ssim.ssim import _explode_aircraft_configuration_string
+from ssim.ssim import _explode_aircraft_configuration_string, _decode_aircraft_configuration_string
 
 
 def test_explode_aircraft_configuration_string(aircraft_configuration_strings):
@@ -14,3 +14,13 @@ def test_explode_aircraft_configuration_string(aircraft_configuration_strings):
             _explode_aircraft_configuration_string(aircraft_configuration_string["string"])
             == aircraft_configuration_string["aircraft_configuration"]
         )
+
+
+def test_explode_aircraft_configuration_string_cached(aircraft_configuration_strings):
+    string = aircraft_configuration_strings[0]["string"]
+
+    aircraft_configuration = _explode_aircraft_configuration_string(string)
+    aircraft_configuration["seats"] = -1
+
+    assert _explode_aircraft_configuration_string(string) == aircraft_configuration_strings[0]["aircraft_configuration"]
+    assert _decode_aircraft_configuration_string.cache_info().hits > 0
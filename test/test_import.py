@@ -0,0 +1,73 @@
+import json
+import subprocess
+import sys
+
+from ssim.regexes import regexes, patterns, field_offsets
+from ssim.ssim import sim_fixed_width_parsers, sim_bytes_parsers
+
+# importing the package should neither pull in heavy dependencies nor configure anything globally
+startup_script = """
+import json, logging, sys
+import ssim
+import ssim.__main__
+json.dump(
+    {
+        "modules": [name for name in ("dateutil", "numpy", "argparse", "concurrent.futures") if name in sys.modules],
+        "compiled": [name for name in ssim.regexes.regexes["sim"].values_],
+        "handlers": len(logging.getLogger().handlers),
+        "path": [path for path in sys.path if path.rstrip("/").endswith("ssim")],
+    },
+    sys.stdout,
+)
+"""
+
+
+def test_import_is_lazy():
+    # argparse is imported by __main__, but the arguments are only parsed by main()
+    output = subprocess.check_output([sys.executable, "-c", startup_script], universal_newlines=True)
+    assert json.loads(output) == {"modules": ["argparse"], "compiled": [], "handlers": 0, "path": []}
+
+    script = startup_script.replace("import ssim.__main__\n", "")
+    output = subprocess.check_output([sys.executable, "-c", script], universal_newlines=True)
+    assert json.loads(output)["modules"] == []
+
+
+# only read, iter_read, expand_slots and iter_flights are imported with the package, the rest on first use
+lazy_script = """
+import json, sys
+import ssim
+modules = ["ssim." + name for name in ("flights", "parallel", "incremental", "index", "aggregate", "rotations")]
+modules += ["ssim." + name for name in ("state", "diff", "cache", "aio")] + ["hashlib", "concurrent.futures"]
+loaded = [name for name in modules if name in sys.modules]
+import ssim.diff, ssim.rotations
+json.dump(
+    {
+        "loaded": loaded,
+        "eager": [callable(getattr(ssim, name)) for name in ("read", "iter_read", "expand_slots", "iter_flights")],
+        "lazy": [ssim.diff.__module__, ssim.rotations.__module__, ssim.read_many.__module__, ssim.Stats.__name__],
+        "dir": "ScheduleIndex" in dir(ssim),
+    },
+    sys.stdout,
+)
+"""
+
+
+def test_import_submodules_lazily():
+    output = subprocess.check_output([sys.executable, "-c", lazy_script], universal_newlines=True)
+    assert json.loads(output) == {
+        "loaded": [],
+        "eager": [True] * 4,
+        "lazy": ["ssim.diff", "ssim.rotations", "ssim.parallel", "Stats"],
+        "dir": True,
+    }
+
+
+def test_lazy_regexes(sim_records):
+    assert set(regexes["sim"]) == set(patterns["sim"])
+    assert "record_3" in regexes["sim"] and "record_6" not in regexes["sim"]
+    assert regexes["sim"]["record_3"] is regexes["sim"]["record_3"]
+    assert regexes["sim"]["record_3"].pattern == patterns["sim"]["record_3"]
+    assert len(field_offsets["sim"]["record_3"]) == len(regexes["sim"]["record_3"].groupindex) - 1
+
+    line = next(line for line in sim_records[0]["raw_data"].split("\n") if line.startswith("3"))
+    assert sim_fixed_width_parsers["3"](line) == sim_bytes_parsers["3"](line.encode(), 0, len(line))
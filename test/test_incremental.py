@@ -0,0 +1,55 @@
+import pytest
+
+from ssim.ssim import read, expand_slots
+from ssim.incremental import read_incremental
+
+
+def _revised(lines, serial_shift=0):
+    """Renumbers record serial numbers, as a carrier does when resending a file."""
+    return "\n".join(
+        line[:194] + "%06i" % (i + serial_shift) if len(line) >= 200 else line for i, line in enumerate(lines)
+    )
+
+
+@pytest.mark.parametrize("iata_airport", [None, "AMS"])
+def test_read_incremental(sim_records, tmp_path, iata_airport):
+    lines = sim_records[-1]["raw_data"].split("\n")
+    legs = [i for i, line in enumerate(lines) if line[:1] == "3"]
+    path = tmp_path / "sim.txt"
+    path.write_text(_revised(lines))
+
+    first = read_incremental(str(path), iata_airport=iata_airport, expand=True)
+    assert first.slots == read(str(path), iata_airport=iata_airport)
+    assert first.flights == expand_slots(first.slots)
+    assert first.added == first.slots
+    assert first.removed == []
+
+    # replace a leg and change another one, serial numbers shift as a short line is added
+    changed = lines[legs[1]][:14] + "01" + lines[legs[1]][16:]
+    inserted = lines[legs[2]][:5] + "9999" + lines[legs[2]][9:]
+    new_lines = list(lines)
+    new_lines[legs[1]] = changed
+    new_lines[legs[0]] = inserted
+    new_lines.insert(legs[3], lines[legs[2]][:199])
+    path.write_text(_revised(new_lines, serial_shift=1))
+
+    second = read_incremental(str(path), previous=first, iata_airport=iata_airport, expand=True)
+    assert second.slots == read(str(path), iata_airport=iata_airport)
+    assert second.flights == expand_slots(second.slots)
+    assert {slot["raw"][:194] for slot in second.added} == {changed[:194], inserted[:194]}
+    assert {slot["raw"][:194] for slot in second.removed} == {lines[legs[0]][:194], lines[legs[1]][:194]}
+
+    with pytest.raises(ValueError):
+        read_incremental(str(path), previous=first, iata_airport="LHR", expand=True)
+
+
+def test_read_incremental_sir(sir_records, tmp_path):
+    path = tmp_path / "sir.txt"
+    path.write_text(sir_records[0]["raw_data"])
+
+    with pytest.raises(ValueError):
+        read_incremental(str(path))
+
+    path.write_text("")
+    with pytest.raises(ValueError, match="only supported for SIM files"):
+        read_incremental(str(path))
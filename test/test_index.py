@@ -0,0 +1,42 @@
+from datetime import date, timedelta
+
+from ssim.ssim import read, expand_slots
+from ssim.index import ScheduleIndex
+
+
+def test_query_random(random_slots):
+    slots = random_slots
+    index = ScheduleIndex(slots, season="S17")
+    flights = expand_slots(slots, season="S17")
+
+    for first, days in ((date(2017, 3, 26), 0), (date(2017, 4, 30), 0), (date(2017, 5, 1), 6), (date(2017, 3, 1), 60)):
+        last = first + timedelta(days=days)
+        expected = [flight for flight in flights if first.isoformat() <= flight["date"] <= last.isoformat()]
+        found = index.query(first, last)
+        assert sorted(found, key=lambda f: (f["date"], f["raw"])) == sorted(
+            expected, key=lambda f: (f["date"], f["raw"])
+        )
+
+        for kwargs in ({"airline": "KL"}, {"flight_number": "12"}, {"station": "AMS", "ad": "A"}, {"airline": "XX"}):
+            selected = [
+                flight for flight in expected if all(flight[_key(key)] == value for key, value in kwargs.items())
+            ]
+            assert sorted(
+                index.query(first.isoformat(), last, **kwargs), key=lambda f: (f["date"], f["raw"])
+            ) == sorted(selected, key=lambda f: (f["date"], f["raw"]))
+
+
+def _key(field):
+    return {"airline": "airline_designator"}.get(field, field)
+
+
+def test_query_sim(sim_paths):
+    slots = read(sim_paths[-1])
+    index = ScheduleIndex(slots)
+
+    flights = [flight for flight in expand_slots(slots) if flight["departure_station"] == "AMS" and flight["ad"] == "D"]
+    day = flights[0]["date"]
+    found = index.query(day, station="AMS", ad="D")
+
+    assert len(found) > 0
+    assert sorted(f["raw"] for f in found) == sorted(f["raw"] for f in flights if f["date"] == day)
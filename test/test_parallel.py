@@ -0,0 +1,44 @@
+import pytest
+
+from ssim.ssim import read
+from ssim.parallel import read_many
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_read_many(sim_paths, tmp_path, workers):
+    paths = sim_paths + [str(tmp_path / "missing.txt")]
+
+    results = read_many(paths, workers=workers)
+
+    assert [result.path for result in results] == paths
+    for result in results[:-1]:
+        assert result.error is None
+        assert result.records == read(result.path)
+    assert isinstance(results[-1].error, FileNotFoundError)
+
+    records, errors = read_many(paths, workers=workers, merge=True)
+
+    assert len(records) == sum(len(result.records) for result in results[:-1])
+    assert records[-1]["source_file"] == paths[-2]
+    assert list(errors) == paths[-1:]
+
+
+def test_read_chunked(sim_records, tmp_path):
+    lines = sim_records[-1]["raw_data"].split("\n")
+    header = [line for line in lines if line[:1] in ("1", "0")]
+    record_2 = [line for line in lines if line[:1] == "2"][0]
+    legs = [line for line in lines if line[:1] == "3"]
+
+    # two airlines, one in UTC and one in local time
+    text = "\n".join(
+        header + [record_2] + legs * 50 + [record_2[:1] + "L" + record_2[2:]] + legs * 50 + [record_2] + legs * 50
+    )
+    path = tmp_path / "sim.txt"
+    path.write_text(text)
+
+    slots = read(str(path), workers=4)
+
+    assert len(slots) > 300
+    assert slots == read(str(path))
+    assert read(str(path), iata_airport="AMS", workers=3) == read(str(path), iata_airport="AMS")
+    assert read(str(path), workers=3, use_mmap=True) == read(str(path))
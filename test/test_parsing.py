@@ -1,4 +1,6 @@
-from ssim.ssim import _parse_sir, _parse_sim
+import pytest
+
+from ssim.ssim import _parse_sir, _parse_sim, sim_fixed_width_parsers, sim_regex_parsers
 
 
 def test_sir_parsing(sir_records):
@@ -7,7 +9,25 @@ def test_sir_parsing(sir_records):
         assert _parse_sir(record["raw_data"]) == record["records"]
 
 
-def test_sim_parsing(sim_records):
+@pytest.mark.parametrize("fixed_width", [False, True])
+def test_sim_parsing(sim_records, fixed_width):
+
+    for record in sim_records:
+        assert _parse_sim(record["raw_data"], fixed_width=fixed_width) == record["records"]
+
+
+def test_sim_fixed_width_parsers(sim_records):
 
     for record in sim_records:
-        assert _parse_sim(record["raw_data"]) == record["records"]
+        for line in record["raw_data"].split("\n"):
+            record_type = line[:1]
+            if record_type in sim_fixed_width_parsers:
+                assert sim_fixed_width_parsers[record_type](line) == sim_regex_parsers[record_type](line)
+
+
+def test_sir_parsing_file_order(sir_records):
+    header = "SIR\n/\nW17\n03JUN\nAMS\nREYT/\n"
+    start = len(header)
+    text = header + "".join(record["raw_data"][start:] for record in sir_records)
+
+    assert _parse_sir(text) == [x for record in sir_records for x in record["records"]]
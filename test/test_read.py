@@ -0,0 +1,59 @@
+import types
+
+from ssim.ssim import (
+    read,
+    iter_read,
+    _detect_file_type,
+    _flatten,
+    _parse_sim,
+    _parse_sir,
+    _uniformize_sim,
+    _uniformize_sir,
+)
+
+
+def test_iter_read_sim(sim_records, sim_paths):
+    for record, path in zip(sim_records, sim_paths):
+        slots = iter_read(path)
+        assert isinstance(slots, types.GeneratorType)
+        assert list(slots) == _flatten([_uniformize_sim(x) for x in _parse_sim(record["raw_data"])])
+        assert read(path) == list(iter_read(path))
+
+
+def test_iter_read_sir(sir_paths):
+    for path in sir_paths:
+        with open(path) as f:
+            text = f.read()
+
+        assert list(iter_read(path)) == _flatten([_uniformize_sir(x) for x in _parse_sir(text)])
+
+
+def test_read_mmap(sim_paths, sir_paths, tmp_path):
+    for file_type, paths in (("sim", sim_paths), ("sir", sir_paths)):
+        for path in paths:
+            with open(path, "rb") as f:
+                assert _detect_file_type(f.read(4096)) == file_type
+            assert read(path, use_mmap=True) == read(path)
+            if file_type == "sim":
+                assert read(path, iata_airport="AMS", use_mmap=True) == read(path, iata_airport="AMS")
+
+    path = tmp_path / "empty.txt"
+    path.write_text("")
+    assert read(str(path), use_mmap=True) == []
+    assert read(str(path), workers=2, use_mmap=True) == []
+    assert list(iter_read(str(path), use_mmap=True)) == []
+    assert _detect_file_type(b"") is None
+
+
+def test_read_encoding(sim_records, tmp_path):
+    lines = sim_records[-1]["raw_data"].split("\n")
+    leg = next(i for i, line in enumerate(lines) if line.startswith("3"))
+    # a meal service note with a non-ASCII character, one byte in latin-1
+    lines[leg] = lines[leg][:100] + "\xe9" + lines[leg][101:]
+    path = tmp_path / "sim.txt"
+    path.write_bytes("\n".join(lines).encode("latin-1"))
+
+    slots = read(str(path))
+    assert slots[0]["raw"][100] == "\xe9"
+    for options in ({"use_mmap": True}, {"workers": 2}, {"workers": 2, "use_mmap": True}, {"compact": True}):
+        assert [dict(slot) for slot in read(str(path), **options)] == slots
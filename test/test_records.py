@@ -0,0 +1,41 @@
+import pickle
+
+import pytest
+
+from ssim.ssim import read, expand_slots
+from ssim.records import Slot
+
+
+@pytest.mark.parametrize("iata_airport", [None, "AMS"])
+def test_compact_sim(sim_paths, iata_airport):
+    for path in sim_paths:
+        slots = read(path, iata_airport=iata_airport)
+        compact_slots = read(path, iata_airport=iata_airport, compact=True)
+
+        assert all(isinstance(slot, Slot) for slot in compact_slots)
+        assert [slot.to_dict() for slot in compact_slots] == slots
+        assert [list(slot.to_dict()) for slot in compact_slots] == [list(slot) for slot in slots]
+        assert [dict(slot) for slot in compact_slots] == slots
+        assert expand_slots(compact_slots) == expand_slots(slots)
+
+
+def test_compact_sim_shared_leg(sim_paths):
+    slots = read(sim_paths[-1], compact=True)
+    legs = {}
+    for slot in slots:
+        legs.setdefault(slot["raw"], []).append(slot)
+
+    assert any(len(pair) == 2 for pair in legs.values())
+    for pair in legs.values():
+        assert len({id(slot.leg) for slot in pair}) == 1
+
+    assert pickle.loads(pickle.dumps(slots)) == slots
+
+
+def test_compact_sir(sir_paths):
+    for path in sir_paths:
+        slots = read(path)
+        compact_slots = read(path, compact=True)
+
+        assert [slot.to_dict() for slot in compact_slots] == slots
+        assert pickle.loads(pickle.dumps(compact_slots)) == compact_slots
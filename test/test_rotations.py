@@ -0,0 +1,114 @@
+import pytest
+
+from ssim.ssim import read, expand_slots, _format_record
+from ssim.rotations import link_legs, rotations, turnarounds
+
+
+def _leg(flight_number, departure_station, departure, arrival_station, arrival, onward="", **values):
+    values.update(
+        record_type="3",
+        airline_designator="XX",
+        flight_number=flight_number.rjust(4),
+        itinerary_variation_identifier="01",
+        leg_sequence_number="01",
+        service_type="J",
+        period_of_operation_from="01JUN18",
+        period_of_operation_to="07JUN18",
+        days_of_operation="1234567",
+        departure_station=departure_station,
+        scheduled_time_of_passenger_departure=departure,
+        scheduled_time_of_aircraft_departure=departure,
+        utc_local_time_variation_departure="+0200",
+        arrival_station=arrival_station,
+        scheduled_time_of_aircraft_arrival=arrival,
+        scheduled_time_of_passenger_arrival=arrival,
+        utc_local_time_variation_arrival="+0100",
+        aircraft_type="738",
+        aircraft_configuration_version="Y189",
+    )
+    if onward:
+        values.update(airline_designator_="XX", flight_number_=onward.rjust(4))
+    return values
+
+
+@pytest.fixture
+def rotation_sim(tmp_path):
+    records = [
+        ("record_1", {"record_type": "1", "title_of_contents": "AIRLINE STANDARD SCHEDULE DATA SET"}),
+        ("record_2", {"record_type": "2", "time_mode": "U", "airline_designator": "XX", "season": "S18"}),
+        ("record_3", _leg("1", "AMS", "0800", "LHR", "0900", onward="2")),
+        ("record_3", _leg("2", "LHR", "1000", "AMS", "1100", onward="3")),
+        # arrives the next day, the aircraft stays a day before flying on
+        (
+            "record_3",
+            _leg("3", "AMS", "2300", "JFK", "0100", onward="4", date_variation=" 1", aircraft_rotation_layover="1"),
+        ),
+        ("record_3", _leg("4", "JFK", "1200", "AMS", "2330")),
+        ("record_3", _leg("5", "AMS", "0600", "CDG", "0700", onward="9")),
+    ]
+    path = tmp_path / "rotations.SIM"
+    path.write_text(
+        "\n".join(_format_record(record, values, i + 1) for i, (record, values) in enumerate(records)) + "\n"
+    )
+    return str(path)
+
+
+def test_rotations(rotation_sim):
+    chains = rotations(read(rotation_sim))
+
+    def describe(chain):
+        return [(leg["flight_number"], leg["date"]) for leg in chain]
+
+    assert sum(len(chain) for chain in chains) == 5 * 7
+    for day in range(1, 8):
+        date = "2018-06-%02d" % day
+        chain = next(chain for chain in chains if describe(chain)[0] == ("1", date))
+        expected = [("1", date), ("2", date), ("3", date)]
+        if day <= 5:
+            expected.append(("4", "2018-06-%02d" % (day + 2)))
+        assert describe(chain) == expected
+        assert [("5", date)] in [describe(chain) for chain in chains]
+
+    assert [describe(chain) for chain in chains if describe(chain)[0][0] == "4"] == [
+        [("4", "2018-06-01")],
+        [("4", "2018-06-02")],
+    ]
+
+    legs, onward = link_legs(expand_slots(read(rotation_sim)))
+    assert len(legs) == 5 * 7
+    assert sum(j is not None for j in onward) == 3 * 7 - 2
+
+
+def _describe(turnarounds):
+    return sorted(
+        (t["arrival"]["date"], t["arrival"]["flight_number"], t["departure"]["flight_number"], t["ground_time"])
+        for t in turnarounds
+    )
+
+
+def test_turnarounds(rotation_sim):
+    for read_format, time_format in ((None, None), ("minutes", None), ("minutes", "minutes")):
+        slots = read(rotation_sim, time_format=read_format)
+        flights = expand_slots(slots, time_format=time_format)
+
+        at_ams = turnarounds(slots, "AMS", time_format=time_format)
+        assert _describe(turnarounds(flights, "AMS", time_format=time_format)) == _describe(at_ams)
+        assert [(t["arrival"]["flight_number"], t["departure"]["flight_number"]) for t in at_ams] == [("2", "3")] * 7
+        assert [t["arrival"]["date"] for t in at_ams] == [t["departure"]["date"] for t in at_ams]
+        assert {t["ground_time"] for t in at_ams} == {12 * 60}
+
+        at_jfk = turnarounds(slots, "JFK", time_format=time_format)
+        assert len(at_jfk) == 5
+        # arrives at 0100 the day after departing, flies on at 1200 the day after that
+        assert {t["ground_time"] for t in at_jfk} == {35 * 60}
+
+        assert {t["ground_time"] for t in turnarounds(flights, "LHR", time_format=time_format)} == {60}
+
+    with pytest.raises(ValueError):
+        turnarounds(read(rotation_sim), "AMS", time_format="seconds")
+
+
+def test_rotations_need_sim(sir_paths):
+    with pytest.raises(ValueError):
+        rotations(read(sir_paths[0]))
+    assert rotations([]) == []
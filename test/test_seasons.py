@@ -0,0 +1,32 @@
+from datetime import date, datetime
+
+from ssim.seasons import season_bounds, parse_date, format_date, attach_year
+from ssim.ssim import find_season_dates, _expand
+
+
+def test_season_bounds():
+    assert season_bounds("S18") == (date(2018, 3, 25), date(2018, 10, 27))
+    assert season_bounds("W17") == (date(2017, 10, 29), date(2018, 3, 24))
+    assert find_season_dates("W17") == season_bounds("W17")
+
+
+def test_attach_year():
+    assert attach_year("02NOV", 17, "W") == "02NOV17"
+    assert attach_year("02FEB", 17, "W") == "02FEB18"
+
+
+def test_format_date():
+    assert format_date(date(2017, 5, 1)) == "01MAY17"
+    assert format_date(datetime(2009, 12, 31)) == "31DEC09"
+    for month in range(1, 13):
+        assert parse_date(format_date(date(2018, month, 15))) == datetime(2018, month, 15)
+
+
+def test_parse_date_cached(expanding_slots):
+    assert parse_date("01JUN18") == datetime(2018, 6, 1)
+    assert parse_date("01JUN18") is parse_date("01JUN18")
+
+    parse_date.cache_clear()
+    expanded = [_expand(slot["slot"]) for slot in expanding_slots]
+    # expanding again with every date cached gives the same flights
+    assert [_expand(slot["slot"]) for slot in expanding_slots] == expanded
@@ -0,0 +1,157 @@
+import locale
+import random
+from collections import Counter
+
+import pytest
+
+from ssim.ssim import expand_slots
+from ssim.state import ScheduleState
+
+
+def _slot(
+    action_code, flight_number="1", first="01MAY17", last="31MAY17", days="1234567", frequency_rate=None, **fields
+):
+    slot = {
+        "ad": "A",
+        "action_code": action_code,
+        "airline_designator": "KL",
+        "flight_number": flight_number,
+        "operational_suffix": None,
+        "station": "AMS",
+        "period_of_operation_from": first,
+        "period_of_operation_to": last,
+        "days_of_operation": days,
+        "frequency_rate": frequency_rate,
+        "scheduled_time": "1000",
+        "raw": "%s %s %s %s" % (action_code, flight_number, first, last),
+    }
+    slot.update(fields)
+    return slot
+
+
+def _flights(slots):
+    return Counter(
+        (flight["flight_number"], flight["ad"], flight["date"], flight["scheduled_time"])
+        for flight in expand_slots(slots, season="S17")
+    )
+
+
+def test_state_split_and_merge():
+    state = ScheduleState([_slot("H", days="1000000"), _slot("H", flight_number="2")])
+
+    # cancel the Monday in the middle of May, and change the time of the last week
+    state.apply(
+        [
+            _slot("D", first="15MAY17", last="15MAY17"),
+            _slot("C", flight_number="2", first="25MAY17", last="31MAY17"),
+            _slot("R", flight_number="2", first="25MAY17", last="31MAY17", scheduled_time="1100"),
+        ]
+    )
+    slots = state.slots()
+    assert [(s["flight_number"], s["period_of_operation_from"], s["period_of_operation_to"]) for s in slots] == [
+        ("1", "01MAY17", "08MAY17"),
+        ("1", "22MAY17", "29MAY17"),
+        ("2", "01MAY17", "24MAY17"),
+        ("2", "25MAY17", "31MAY17"),
+    ]
+    assert slots[0]["days_of_operation"] == "1000000"
+    assert slots[3]["scheduled_time"] == "1100"
+
+    # putting the Monday back joins the periods again
+    state.apply([_slot("N", first="15MAY17", last="15MAY17", days="1000000")])
+    assert [(s["period_of_operation_from"], s["period_of_operation_to"]) for s in state.slots()[:1]] == [
+        ("01MAY17", "29MAY17")
+    ]
+    assert len(state) == 3
+
+
+def test_state_days_and_frequency():
+    state = ScheduleState([_slot("H", days="1 3 5  ", frequency_rate="2")])
+    state.apply([_slot("D", days="  3    ", first="01MAY17", last="15MAY17")])
+
+    slots = state.slots()
+    assert [(s["period_of_operation_from"], s["days_of_operation"], s["frequency_rate"]) for s in slots] == [
+        ("01MAY17", "1   5  ", "2"),
+        ("17MAY17", "1 3 5  ", "2"),
+    ]
+    assert _flights(slots) == _flights([_slot("H", days="1 3 5  ", frequency_rate="2")]) - _flights(
+        [_slot("H", days="  3    ", first="01MAY17", last="15MAY17")]
+    )
+
+
+def test_state_mixed_action_codes():
+    state = ScheduleState([_slot("H"), _slot("H", flight_number="2")])
+    held, acknowledged = _slot("H", flight_number="3"), _slot("K", flight_number="1", last="15MAY17")
+    skipped = state.apply(
+        [
+            _slot("D", first="15MAY17", last="15MAY17"),
+            held,
+            _slot("N", flight_number="4"),
+            acknowledged,
+            _slot("C", flight_number="2", first="25MAY17", last="31MAY17"),
+        ]
+    )
+
+    # the held and acknowledged records are skipped, the changes around them are applied
+    assert skipped == [held, acknowledged]
+    assert _flights(state.slots()) == _flights(
+        [
+            _slot("H", last="14MAY17"),
+            _slot("H", first="16MAY17"),
+            _slot("H", flight_number="2", last="24MAY17"),
+            _slot("N", flight_number="4"),
+        ]
+    )
+    assert state.apply([]) == []
+
+
+def test_state_locale():
+    try:
+        previous = locale.setlocale(locale.LC_TIME)
+        locale.setlocale(locale.LC_TIME, "de_DE.UTF-8")
+    except locale.Error:
+        pytest.skip("no German locale")
+
+    try:
+        state = ScheduleState([_slot("H", first="01MAR17", last="31MAY17")])
+        state.apply([_slot("D", first="01APR17", last="30APR17")])
+        periods = [(s["period_of_operation_from"], s["period_of_operation_to"]) for s in state.slots()]
+    finally:
+        locale.setlocale(locale.LC_TIME, previous)
+
+    # month names are written in English, as parse_date reads them
+    assert periods == [("01MAR17", "31MAR17"), ("01MAY17", "31MAY17")]
+
+
+def _random_slot(rng, action_code):
+    months = ["MAR", "APR", "MAY", "OCT"]
+    return _slot(
+        action_code,
+        flight_number=str(rng.randint(1, 20)),
+        ad=rng.choice("AD"),
+        first=rng.choice(["00XXX00", "%02d%s17" % (rng.randint(1, 28), rng.choice(months))]),
+        last=rng.choice(["00XXX00", "%02d%s17" % (rng.randint(1, 28), rng.choice(months))]),
+        days="".join(str(d) if rng.random() < 0.5 else rng.choice("0 ") for d in range(1, 8)),
+        frequency_rate=rng.choice([None, "1", "2", "3"]),
+        scheduled_time=rng.choice(["1000", "1100"]),
+    )
+
+
+def test_state_random():
+    rng = random.Random(2)
+    baseline = [_random_slot(rng, "H") for i in range(300)]
+    state = ScheduleState(baseline, season="S17")
+    expected = _flights(baseline)
+
+    for batch in range(20):
+        changes = [_random_slot(rng, rng.choice("NDCR")) for i in range(50)]
+        state.apply(changes)
+        for change in changes:
+            flights = _flights([change])
+            if change["action_code"] in "NR":
+                expected += flights
+            else:
+                dates = set((number, ad, day) for number, ad, day, time in flights)
+                expected = Counter({flight: n for flight, n in expected.items() if flight[:3] not in dates})
+
+        assert _flights(state.slots()) == expected
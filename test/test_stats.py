@@ -0,0 +1,72 @@
+import logging
+import subprocess
+import sys
+
+from ssim import Stats
+from ssim.ssim import read, expand_slots, _parse_sir
+
+
+def test_stats_read_sim(sim_records, sim_paths):
+    for record, path in zip(sim_records, sim_paths):
+        for use_mmap in (False, True):
+            for compact in (False, True):
+                stats = Stats()
+                slots = read(path, compact=compact, use_mmap=use_mmap, stats=stats)
+                assert slots == read(path, compact=compact, use_mmap=use_mmap)
+
+                legs = len(slots) // 2
+                assert stats.bytes["file_read"] == len(record["raw_data"].encode())
+                assert stats.calls["type_detection"] == 1
+                assert stats.calls["acv_explosion"] == legs
+                assert stats.calls["uniformization"] == legs
+                assert stats.calls["regex_matching"] >= legs
+                assert stats.calls["expansion"] == 0
+                # record types 1, 4, 5 and zero padding are skipped
+                assert stats.counts["skipped_lines"] > 0
+                assert stats.counts["unmatched_lines"] == 0
+
+
+def test_stats_read_sir(sir_paths):
+    for path in sir_paths:
+        with open(path) as f:
+            text = f.read()
+
+        stats = Stats()
+        assert read(path, stats=stats) == read(path)
+        assert stats.calls["regex_matching"] == 1
+        assert stats.calls["uniformization"] == len(_parse_sir(text))
+        assert stats.bytes["regex_matching"] == len(text)
+
+
+def test_stats_counters(sim_records, tmp_path):
+    lines = sim_records[0]["raw_data"].split("\n")
+    leg = next(i for i, line in enumerate(lines) if line.startswith("3"))
+    lines.insert(leg + 1, "3 too short to be a flight leg record")
+    path = tmp_path / "sim.txt"
+    path.write_text("\n".join(lines))
+
+    for use_mmap in (False, True):
+        stats = Stats()
+        read(str(path), use_mmap=use_mmap, stats=stats)
+        assert stats.counts["unmatched_lines"] == 1
+
+
+def test_stats_expand_slots(sim_paths):
+    slots = read(sim_paths[0])
+
+    recorded = []
+    stats = Stats(callback=lambda *args: recorded.append(args))
+    flights = expand_slots(slots, stats=stats)
+    assert flights == expand_slots(slots)
+
+    assert stats.calls["expansion"] == 1
+    assert stats.counts["flights"] == len(flights)
+    assert [stage for stage, seconds, count, nbytes in recorded] == ["expansion"]
+    assert stats.as_dict()["counts"]["flights"] == len(flights)
+    assert "expansion=" in repr(stats)
+
+
+def test_import_leaves_logging_alone():
+    code = "import logging, ssim; print(len(logging.getLogger().handlers), logging.getLogger().level)"
+    output = subprocess.check_output([sys.executable, "-c", code], universal_newlines=True)
+    assert output.split() == ["0", str(logging.WARNING)]
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from ssim.ssim import read, expand_slots, iter_flights, time_fields
+
+epoch = datetime(1970, 1, 1)
+
+
+def _utc_minutes(time, day_variation):
+    """Minutes in UTC since the start of the day, from a time read as a string such as "1230+0100"."""
+
+    local = datetime.strptime(time[:4], "%H%M") - datetime(1900, 1, 1)
+    offset = timedelta(hours=int(time[4:7] or 0), minutes=int(time[4] + time[7:9]) if time[4:] else 0)
+    days = {"": 0, "A": -1}.get(day_variation, None)
+    days = int(day_variation) if days is None else days
+    return int((local - offset + timedelta(days=days)).total_seconds() // 60)
+
+
+def test_read_minutes(sim_paths):
+    for path in sim_paths:
+        for slot, minutes_slot in zip(read(path), read(path, time_format="minutes")):
+            date_variation = slot["raw"][192:194]
+            for key in time_fields:
+                if slot.get(key) is None:
+                    assert minutes_slot.get(key) is None
+                    continue
+                day_variation = date_variation[1 if "arrival" in key else 0].strip()
+                assert minutes_slot[key] == _utc_minutes(slot[key], day_variation)
+
+        slots = read(path, time_format="minutes")
+        assert read(path, time_format="minutes", use_mmap=True) == slots
+        assert read(path, time_format="minutes", workers=2) == slots
+
+
+def test_read_minutes_date_variation(sim_records, tmp_path):
+    lines = sim_records[0]["raw_data"].split("\n")
+    leg = next(i for i, line in enumerate(lines) if line.startswith("3"))
+    line = lines[leg]
+
+    for date_variation, departure_days, arrival_days in (("  ", 0, 0), (" 1", 0, 1), ("A1", -1, 1), ("12", 1, 2)):
+        lines[leg] = line[:192] + date_variation + line[194:]
+        path = tmp_path / "sim.txt"
+        path.write_text("\n".join(lines))
+
+        departure, arrival = read(str(path), time_format="minutes")[:2]
+        assert departure["ad"] == "D" and arrival["ad"] == "A"
+        strings = read(str(path))
+        assert (
+            departure["scheduled_time_of_aircraft_departure"]
+            == _utc_minutes(strings[0]["scheduled_time_of_aircraft_departure"], "") + 1440 * departure_days
+        )
+        assert (
+            arrival["scheduled_time_of_aircraft_arrival"]
+            == _utc_minutes(strings[1]["scheduled_time_of_aircraft_arrival"], "") + 1440 * arrival_days
+        )
+
+
+def test_read_minutes_sir(sir_paths):
+    for path in sir_paths:
+        for slot, minutes_slot in zip(read(path), read(path, time_format="minutes")):
+            time = slot["scheduled_time"]
+            assert minutes_slot["scheduled_time"] == (None if time is None else int(time[:2]) * 60 + int(time[2:]))
+
+
+@pytest.mark.parametrize("engine", ["numpy", "rrule"])
+def test_expand_slots_minutes(sim_paths, engine):
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+
+    path = sim_paths[0]
+    slots = read(path, time_format="minutes")
+
+    flights = expand_slots(slots, engine=engine, time_format="minutes")
+    assert list(iter_flights(slots, time_format="minutes")) == flights
+    assert [flight["date"] for flight in flights] == [flight["date"] for flight in expand_slots(slots, engine=engine)]
+
+    for flight, slot in zip(flights, (slot for slot in slots for flight in expand_slots([slot], engine=engine))):
+        day = datetime.strptime(flight["date"], "%Y-%m-%d")
+        for key in time_fields:
+            if slot.get(key) is not None:
+                assert epoch + timedelta(minutes=flight[key]) == day + timedelta(minutes=slot[key])
+
+    with pytest.raises(ValueError):
+        expand_slots(slots, engine=engine, time_format="minutes", columnar=True)
+    with pytest.raises(ValueError):
+        read(path, time_format="seconds")
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_minutes_overnight(sim_records, tmp_path, compact):
+    lines = sim_records[0]["raw_data"].split("\n")
+    leg = next(i for i, line in enumerate(lines) if line.startswith("3"))
+    line = lines[leg]
+    station = line[54:57]
+
+    # overnight as written in local times, whatever the date variation and UTC times say
+    for departure, arrival, date_variation, overnight in (
+        ("2300+0200", "0100+0200", " 1", True),
+        ("0100-0500", "0300+0400", "  ", False),
+    ):
+        lines[leg] = (
+            line[:39]
+            + departure[:4]
+            + departure
+            + line[52:57]
+            + arrival[:4]
+            + arrival
+            + line[70:192]
+            + date_variation
+            + line[194:]
+        )
+        path = tmp_path / "sim.txt"
+        path.write_text("\n".join(lines))
+
+        slots = read(str(path), iata_airport=station, compact=compact)
+        minutes_slots = read(str(path), iata_airport=station, compact=compact, time_format="minutes")
+        flights = expand_slots(slots)
+        minutes_flights = expand_slots(minutes_slots, time_format="minutes")
+
+        assert [slot["overnight_indicator"] for slot in minutes_slots] == [
+            slot["overnight_indicator"] for slot in slots
+        ]
+        assert [(flight["date"], flight["overnight_indicator"]) for flight in minutes_flights] == [
+            (flight["date"], flight["overnight_indicator"]) for flight in flights
+        ]
+        assert any(slot["overnight_indicator"] == overnight for slot in slots if slot["ad"] == "A")